@@ -8,7 +8,10 @@ import echo.constants as ec
 import echo.core as core
 import echo.gutenberg as gutenberg
 from echo.audio.assemble import FORMATS
-from echo.audio.engines import EngineUnavailable, available_engines, engine_names
+from echo.audio.cache import SynthesisCache
+from echo.audio.engines import EngineUnavailable, available_engines, engine_names, shutdown_engines
+from echo.audio.quota import POLICIES as QUOTA_POLICIES
+from echo.audio.quota import QuotaExceeded
 from echo.extractors import SUPPORTED_SUFFIXES
 from echo.normalize import NORMALIZER_NAMES, NormalizerUnavailable
 from echo.research import AGENTS, ResearchError, research
@@ -155,6 +158,45 @@ def build_parser() -> argparse.ArgumentParser:
     parser.add_argument("--save", action="store_true", help="Also write the narrated text to a .txt file.")
     parser.add_argument("--transcript", action="store_true", help="Also write an .srt transcript, if the engine reports timings.")
     parser.add_argument("--no-resume", action="store_true", help="Ignore chunks left by an interrupted run.")
+    parser.add_argument(
+        "--fast-start",
+        action="store_true",
+        default=None,
+        help="Open with short chunks that grow to full size, so the first audio arrives quickly.",
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true", help="Don't reuse (or add to) the cross-run synthesis cache."
+    )
+    parser.add_argument("--cache-stats", action="store_true", help="Report on the synthesis cache and exit.")
+    parser.add_argument(
+        "--engine-stats",
+        action="store_true",
+        help="Summarise how each engine and voice has performed in earlier runs and exit.",
+    )
+    parser.add_argument(
+        "--tune-chunking",
+        action="store_true",
+        help="Time a sample passage at several chunk sizes on --engine/--voice, store the best "
+        "for later conversions, and exit.",
+    )
+    sharing = parser.add_mutually_exclusive_group()
+    sharing.add_argument(
+        "--shared",
+        action="store_true",
+        help="Let --worker processes help with this book; this one assembles it when every chunk is done.",
+    )
+    sharing.add_argument(
+        "--worker",
+        action="store_true",
+        help="Help a --shared run of the same book and options by synthesizing some of its chunks, then exit.",
+    )
+    parser.add_argument(
+        "--over-budget",
+        choices=QUOTA_POLICIES,
+        default=None,
+        help=f"When a book would overrun the engine's monthly free characters: refuse, warn, or route "
+        f"it to {ec.QUOTA_FALLBACK_ENGINE}. (Default: {ec.QUOTA_POLICY})",
+    )
     parser.add_argument("--list-voices", action="store_true", help="List the chosen engine's voices and exit.")
     parser.add_argument("--list-engines", action="store_true", help="Show which engines are ready to use and exit.")
     parser.add_argument("--debug", action="store_true", help="Verbose logging.")
@@ -162,6 +204,15 @@ def build_parser() -> argparse.ArgumentParser:
 
 
 def main(argv: list[str] = None) -> int:
+    # The ``echo-audio`` console script calls this directly, so engines are shut
+    # down here rather than under ``__main__``.
+    try:
+        return _main(argv)
+    finally:
+        shutdown_engines()
+
+
+def _main(argv: list[str] = None) -> int:
     args = build_parser().parse_args(argv)
 
     logging.basicConfig(
@@ -181,6 +232,22 @@ def main(argv: list[str] = None) -> int:
         core.print_voices(args.engine)
         return 0
 
+    if args.cache_stats:
+        print(SynthesisCache().stats())
+        return 0
+
+    if args.engine_stats:
+        print(core.engine_stats())
+        return 0
+
+    if args.tune_chunking:
+        try:
+            print(core.tune_chunking(args.engine, args.voice, args.speed))
+        except EngineUnavailable as ex:
+            log.error(str(ex))
+            return 1
+        return 0
+
     if args.list_matches:
         if not (args.gutenberg or args.author):
             build_parser().error("--list-matches needs --gutenberg TITLE (and optionally --author)")
@@ -258,6 +325,26 @@ def main(argv: list[str] = None) -> int:
         f"Metadata: {args.mp3_meta}\n--------------------"
     )
 
+    if args.worker:
+        try:
+            done = core.synthesize_share(
+                args.file_path,
+                output_path=args.output,
+                voice=args.voice,
+                speed=args.speed,
+                engine=args.engine,
+                fmt=args.fmt,
+                normalizer=args.normalizer,
+                parser_configs=parser_configs,
+                cache=not args.no_cache,
+                fast_start=args.fast_start,
+            )
+        except (NormalizerUnavailable, EngineUnavailable) as ex:
+            log.error(str(ex))
+            return 1
+        log.info(f"Worker finished: {done} chunk(s) of this book are done; the --shared run assembles it")
+        return 0
+
     try:
         output_path = core.file_to_audio(
             args.file_path,
@@ -272,8 +359,12 @@ def main(argv: list[str] = None) -> int:
             write_transcript=args.transcript,
             parser_configs=parser_configs,
             resume=not args.no_resume,
+            cache=not args.no_cache,
+            over_budget=args.over_budget,
+            fast_start=args.fast_start,
+            shared=args.shared,
         )
-    except (NormalizerUnavailable, EngineUnavailable) as ex:
+    except (NormalizerUnavailable, EngineUnavailable, QuotaExceeded) as ex:
         # A missing model server or API key is a setup problem, not a crash.
         log.error(str(ex))
         return 1
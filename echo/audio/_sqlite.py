@@ -0,0 +1,41 @@
+"""The SQLite file behind each of echo's bookkeeping stores.
+
+The synthesis cache index, the quota ledger, the engine history and the chunk
+tuning table all keep a small SQLite database under ``CACHE_DIR``. They are
+bookkeeping rather than dependencies: each store logs a database error and
+carries on as if it had no record, never raising it into a conversion. This
+module holds what they share, opening the file and creating its directory and
+schema the first time.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+
+
+class SqliteFile:
+    """One store's database at ``path``, created with ``schema`` on first use.
+
+    Connections are opened per call and closed by the caller (``closing``), so a
+    store can be used from worker threads as well as the event loop.
+    """
+
+    def __init__(self, path: Path, schema: str):
+        self.path = Path(path)
+        self.schema = schema
+        self._ready = False
+
+    def connect(self) -> sqlite3.Connection:
+        if not self._ready:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30)
+        if not self._ready:
+            # Idempotent, so two threads racing to be first is harmless.
+            conn.executescript(self.schema)
+            self._ready = True
+        return conn
+
+    def forget(self) -> None:
+        """Create the directory and schema again on next use, after the file was removed."""
+        self._ready = False
@@ -24,7 +24,10 @@ from dataclasses import dataclass
 from pathlib import Path
 
 import echo.constants as ec
-from echo.audio.mp3_utils import configure_ffmpeg
+from echo.audio.mp3_utils import configure_ffmpeg, mp3_frames
+from echo.audio.wav import join_wavs
+from echo.cancel import Cancelled, CancelToken
+from echo.cancel import current as current_cancel
 
 log = logging.getLogger(__name__)
 
@@ -158,11 +161,27 @@ def _escape_meta(value: str) -> str:
     return value.replace("\n", " ")
 
 
-def _run(cmd: list[str]) -> None:
+def _run(cmd: list[str], cancel: CancelToken = None) -> None:
+    """Run ffmpeg to completion, or kill it when ``cancel`` (or the run's token) fires."""
+    cancel = cancel or current_cancel()
     log.debug("Running: %s", " ".join(cmd))
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    if result.returncode != 0:
-        tail = (result.stderr or "").strip().splitlines()[-12:]
+    if cancel is None:
+        result = subprocess.run(cmd, capture_output=True, text=True)
+        returncode, stderr = result.returncode, result.stderr
+    else:
+        cancel.raise_if_cancelled()
+        proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+        unregister = cancel.on_cancel(proc.kill)
+        try:
+            _, stderr = proc.communicate()
+        finally:
+            unregister()
+        returncode = proc.returncode
+        if cancel.cancelled:
+            Path(cmd[-1]).unlink(missing_ok=True)  # a half-written output file
+            raise Cancelled("Stopped while ffmpeg was running")
+    if returncode != 0:
+        tail = (stderr or "").strip().splitlines()[-12:]
         raise AssemblyError("ffmpeg failed:\n" + "\n".join(tail))
 
 
@@ -180,6 +199,7 @@ def assemble(
     author: str = None,
     speed: float = None,
     bitrate: str = None,
+    cancel: CancelToken = None,
 ) -> Path:
     """Join ``segments`` into ``output_path``.
 
@@ -189,6 +209,7 @@ def assemble(
         chapters: chapter marks, written only for M4B.
         speed: applied here (atempo) when the engine could not apply it itself.
         bitrate: AAC/MP3 bitrate when re-encoding.
+        cancel: kills ffmpeg and raises :class:`~echo.cancel.Cancelled` when cancelled.
     """
     if not segments:
         raise AssemblyError("There are no audio segments to join")
@@ -235,7 +256,7 @@ def assemble(
             cmd += ["-f", "mp4"]
 
         cmd.append(str(output_path))
-        _run(cmd)
+        _run(cmd, cancel)
 
     duration = audio_duration_ms(output_path) / 1000
     log.info(
@@ -245,6 +266,32 @@ def assemble(
     return output_path
 
 
+def join_chunks(parts: list[Path], output_path: Path) -> Path:
+    """Join pieces of one chunk into a single chunk file of the same container.
+
+    Used when a failing utterance was split and synthesized in pieces. WAV and MP3
+    — what the engines write — are joined in-process; ffmpeg is only needed for
+    anything else.
+    """
+    parts = [Path(p) for p in parts]
+    output_path = Path(output_path)
+    suffix = output_path.suffix.lower()
+    if suffix == ".wav":
+        join_wavs(parts, output_path)
+    elif suffix == ".mp3":
+        with open(output_path, "wb") as fp:
+            for part in parts:
+                fp.write(mp3_frames(part.read_bytes()))
+    else:
+        with tempfile.TemporaryDirectory(prefix="echo-join-") as tmp:
+            listing = _concat_list(parts, Path(tmp))
+            _run(
+                [_ffmpeg(), "-hide_banner", "-nostdin", "-y", "-f", "concat", "-safe", "0", "-i", str(listing)]
+                + ["-c", "copy", str(output_path)]
+            )
+    return output_path
+
+
 def chapter_marks(chapter_titles: list[str], durations_by_chapter: list[list[int]]) -> list[ChapterMark]:
     """Build chapter marks from per-chapter segment durations."""
     marks: list[ChapterMark] = []
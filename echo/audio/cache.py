@@ -0,0 +1,220 @@
+"""A content-addressed cache of synthesized utterances, shared across runs and books.
+
+Chunk directories belong to one output file and are removed once it is assembled,
+so without this a re-render in another format — or a second edition that shares
+most of its text — pays for every utterance again. Entries are keyed by everything
+that decides the audio: engine, model, voice, the speed the engine applied, and
+the text itself.
+
+Audio lives under ``<CACHE_DIR>/synthesis/<ab>/<key><suffix>``. A small SQLite
+index records each entry's size, duration, timings and last use, which is what
+eviction (least-recently-used, down to the size cap) and ``--cache-stats`` read.
+
+The cache is an optimisation, never a dependency: any error reading or writing it
+is logged and the utterance is synthesized as if it had missed.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import sqlite3
+import time
+from contextlib import closing
+from dataclasses import dataclass
+from pathlib import Path
+
+import echo.constants as ec
+from echo.audio._sqlite import SqliteFile
+from echo.document import Timing
+
+log = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    suffix TEXT NOT NULL,
+    size_bytes INTEGER NOT NULL,
+    duration_ms INTEGER NOT NULL,
+    timings TEXT NOT NULL DEFAULT '[]',
+    created REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+
+def engine_model(engine) -> str:
+    """The model behind an engine, for engines that have more than one."""
+    return getattr(engine, "model", None) or getattr(engine, "model_id", None) or ""
+
+
+def synthesis_key(engine, voice: str, speed: float, text: str) -> str:
+    """Hash of everything that determines an utterance's audio."""
+    payload = "\x1f".join((engine.name, engine_model(engine), voice, f"{speed:.3f}", text))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass(slots=True)
+class CachedAudio:
+    """A cache hit, copied out to where the caller asked for it."""
+
+    path: Path
+    duration_ms: int
+    timings: list[Timing]
+
+
+@dataclass(slots=True)
+class CacheStats:
+    directory: Path
+    entries: int
+    size_bytes: int
+    max_bytes: int
+    hits: int
+    misses: int
+
+    @property
+    def hit_rate(self) -> float:
+        looked_up = self.hits + self.misses
+        return self.hits / looked_up if looked_up else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"Synthesis cache: {self.directory}\n"
+            f"  {self.entries} utterance(s), {self.size_bytes / 2**20:.1f} MB "
+            f"of {self.max_bytes / 2**20:.0f} MB\n"
+            f"  {self.hits} hit(s), {self.misses} miss(es) — {self.hit_rate:.0%} hit rate"
+        )
+
+
+class SynthesisCache:
+    """Synthesized audio keyed by :func:`synthesis_key`, with an LRU size cap."""
+
+    def __init__(self, directory: Path = None, max_bytes: int = None):
+        self.directory = Path(directory) if directory else Path(ec.CACHE_DIR) / "synthesis"
+        self.max_bytes = ec.SYNTH_CACHE_MAX_MB * 2**20 if max_bytes is None else max_bytes
+        #: This process's lookups, for a run summary; the persistent totals are in stats().
+        self.hits = 0
+        self.misses = 0
+        self._db = SqliteFile(self.directory / "index.sqlite", _SCHEMA)
+
+    # ── storage ─────────────────────────────────────────────────────────────
+    def _path(self, key: str, suffix: str) -> Path:
+        return self.directory / key[:2] / f"{key}{suffix}"
+
+    def _count(self, conn: sqlite3.Connection, name: str) -> None:
+        conn.execute(
+            "INSERT INTO counters (name, value) VALUES (?, 1) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + 1",
+            (name,),
+        )
+
+    # ── lookups ─────────────────────────────────────────────────────────────
+    def get(self, key: str, out_path: Path) -> CachedAudio | None:
+        """Copy a cached utterance to ``out_path``, or return None on a miss.
+
+        Copied rather than hard-linked: engines open chunk paths for writing, and
+        truncating a shared inode would corrupt the cached copy.
+        """
+        out_path = Path(out_path)
+        try:
+            with closing(self._db.connect()) as conn, conn:
+                row = conn.execute(
+                    "SELECT suffix, duration_ms, timings FROM entries WHERE key = ?", (key,)
+                ).fetchone()
+                source = self._path(key, row[0]) if row else None
+                if row is None or row[0] != out_path.suffix or not source.exists():
+                    if row is not None:
+                        conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                    self._count(conn, "misses")
+                    self.misses += 1
+                    return None
+                shutil.copyfile(source, out_path)
+                conn.execute("UPDATE entries SET last_used = ? WHERE key = ?", (time.time(), key))
+                self._count(conn, "hits")
+                self.hits += 1
+                timings = [Timing(start, end, text) for start, end, text in json.loads(row[2])]
+                return CachedAudio(path=out_path, duration_ms=row[1], timings=timings)
+        except (sqlite3.Error, OSError, ValueError) as ex:
+            log.warning(f"Synthesis cache lookup failed ({ex}); synthesizing instead")
+            return None
+
+    def put(self, key: str, path: Path, duration_ms: int, timings: list[Timing] = ()) -> None:
+        """Store a freshly synthesized utterance, then evict down to the cap."""
+        path = Path(path)
+        target = self._path(key, path.suffix)
+        try:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            # Copy beside the target and rename, so a concurrent reader never sees
+            # half a file.
+            staging = target.with_name(f"{target.name}.{os.getpid()}.part")
+            shutil.copyfile(path, staging)
+            os.replace(staging, target)
+            now = time.time()
+            with closing(self._db.connect()) as conn, conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO entries "
+                    "(key, suffix, size_bytes, duration_ms, timings, created, last_used) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        key,
+                        path.suffix,
+                        target.stat().st_size,
+                        duration_ms,
+                        json.dumps([(t.start_ms, t.end_ms, t.text) for t in timings]),
+                        now,
+                        now,
+                    ),
+                )
+            self.evict()
+        except (sqlite3.Error, OSError) as ex:
+            log.warning(f"Could not add to the synthesis cache: {ex}")
+
+    # ── housekeeping ────────────────────────────────────────────────────────
+    def evict(self) -> int:
+        """Drop least-recently-used entries until the cache fits its cap."""
+        removed = 0
+        with closing(self._db.connect()) as conn, conn:
+            (total,) = conn.execute("SELECT COALESCE(SUM(size_bytes), 0) FROM entries").fetchone()
+            if total <= self.max_bytes:
+                return 0
+            for key, suffix, size in conn.execute(
+                "SELECT key, suffix, size_bytes FROM entries ORDER BY last_used"
+            ).fetchall():
+                if total <= self.max_bytes:
+                    break
+                self._path(key, suffix).unlink(missing_ok=True)
+                conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                total -= size
+                removed += 1
+        if removed:
+            log.debug(f"Evicted {removed} utterance(s) from the synthesis cache")
+        return removed
+
+    def stats(self) -> CacheStats:
+        with closing(self._db.connect()) as conn:
+            entries, size = conn.execute("SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM entries").fetchone()
+            counters = dict(conn.execute("SELECT name, value FROM counters").fetchall())
+        return CacheStats(
+            directory=self.directory,
+            entries=entries,
+            size_bytes=size,
+            max_bytes=self.max_bytes,
+            hits=counters.get("hits", 0),
+            misses=counters.get("misses", 0),
+        )
+
+    def clear(self) -> None:
+        shutil.rmtree(self.directory, ignore_errors=True)
+        self._db.forget()
+
+
+def default_cache() -> SynthesisCache | None:
+    """The shared cache, or None when ``SYNTH_CACHE`` turns it off."""
+    return SynthesisCache() if ec.SYNTH_CACHE else None
@@ -9,29 +9,48 @@ Google SDKs) or touches the network.
 from __future__ import annotations
 
 import logging
+import threading
+import weakref
 from typing import Callable
 
 import echo.constants as ec
 from echo.audio.engines.base import (
     BaseEngine,
+    EngineThrottled,
+    EngineTimeout,
     EngineUnavailable,
+    ErrorClass,
+    ErrorKind,
     SpeechEngine,
     SynthOutput,
     VoiceInfo,
+    classify_error,
 )
+from echo.audio.engines.budget import BudgetShare, EngineBudget
 
 log = logging.getLogger(__name__)
 
 __all__ = [
     "BaseEngine",
+    "BudgetShare",
+    "EngineBudget",
+    "EngineThrottled",
+    "EngineTimeout",
     "EngineUnavailable",
+    "ErrorClass",
+    "ErrorKind",
     "SpeechEngine",
     "SynthOutput",
     "VoiceInfo",
+    "classify_error",
     "get_engine",
     "engine_names",
     "available_engines",
     "all_voices",
+    "shutdown_engines",
+    "engine_budget",
+    "open_connections",
+    "close_connections",
 ]
 
 
@@ -78,6 +97,9 @@ _ALIASES = {
 }
 
 _cache: dict[str, SpeechEngine] = {}
+#: Keyed by instance: get_engine makes one of each, and an engine built by hand gets its own.
+_budgets: weakref.WeakKeyDictionary[SpeechEngine, EngineBudget] = weakref.WeakKeyDictionary()
+_budgets_lock = threading.Lock()
 
 
 def engine_names() -> list[str]:
@@ -95,6 +117,44 @@ def get_engine(name: str = None) -> SpeechEngine:
     return _cache[key]
 
 
+def engine_budget(engine: SpeechEngine) -> EngineBudget:
+    """The in-flight budget every run on ``engine`` in this process shares."""
+    with _budgets_lock:
+        if engine not in _budgets:
+            _budgets[engine] = EngineBudget.for_engine(engine)
+        return _budgets[engine]
+
+
+def shutdown_engines() -> None:
+    """Stop the thread pools of every engine constructed so far; call once done converting."""
+    for engine in _cache.values():
+        shutdown = getattr(engine, "shutdown", None)
+        if shutdown is not None:
+            shutdown()
+
+
+def open_connections(engine: SpeechEngine) -> None:
+    """Count a run on ``engine`` starting on the running loop; pair with :func:`close_connections`."""
+    open_ = getattr(engine, "open_connections", None)
+    if open_ is not None:
+        open_()
+
+
+async def close_connections(engine: SpeechEngine) -> None:
+    """Close what ``engine`` keeps open on the running loop once the last run there has ended.
+
+    Call as a run on it ends. Connections stay open while other runs that
+    called :func:`open_connections` on the same loop are still going.
+    """
+    close = getattr(engine, "close_connections", None)
+    if close is None:
+        return
+    try:
+        await close()
+    except Exception as ex:  # tidying up must not fail a run that succeeded
+        log.debug(f"Could not close {engine.name}'s connections: {ex}")
+
+
 def available_engines() -> list[tuple[SpeechEngine, bool, str]]:
     """Every engine with whether it can run right now, and why not if it can't.
 
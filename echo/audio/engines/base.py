@@ -8,12 +8,22 @@ what you know about timing — and each engine keeps its quirks to itself.
 
 from __future__ import annotations
 
+import asyncio
+import contextvars
+import enum
+import functools
+import re
+import threading
+from collections.abc import AsyncIterator, Callable
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Protocol, runtime_checkable
+from typing import Protocol, TypeVar, runtime_checkable
 
 from echo.document import Timing
 
+T = TypeVar("T")
+
 
 @dataclass(frozen=True, slots=True)
 class VoiceInfo:
@@ -58,6 +68,132 @@ class EngineUnavailable(RuntimeError):
     """
 
 
+class EngineTimeout(TimeoutError):
+    """Raised when a request runs past its deadline or its stream goes quiet.
+
+    A hang has no error of its own to retry on; this turns one into a failure the
+    orchestrator can retry like any other.
+    """
+
+
+class EngineThrottled(RuntimeError):
+    """Raised when the service asks for fewer requests, optionally saying for how long."""
+
+    def __init__(self, message: str, retry_after: float | None = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class ErrorKind(enum.Enum):
+    """How the orchestrator should treat a failed request."""
+
+    #: Nothing will fix this by waiting: bad credentials, a missing package.
+    #: The run stops rather than spending every chunk's retries discovering it.
+    FATAL = "fatal"
+    #: The service is shedding load. Every request pauses, not just this one.
+    THROTTLED = "throttled"
+    #: A dropped connection, a hiccup: retry this request after a backoff.
+    TRANSIENT = "transient"
+
+
+@dataclass(frozen=True, slots=True)
+class ErrorClass:
+    kind: ErrorKind
+    #: Seconds the service asked us to wait, when it said.
+    retry_after: float | None = None
+
+
+def _causes(ex: BaseException):
+    seen = set()
+    while ex is not None and id(ex) not in seen:
+        seen.add(id(ex))
+        yield ex
+        ex = ex.__cause__ or ex.__context__
+
+
+def http_status(ex: BaseException) -> int | None:
+    """The HTTP status behind an error or anything it was raised from, if any.
+
+    aiohttp errors carry ``status``, requests/httpx responses ``status_code`` and
+    the Google SDKs ``code``; anything outside 100-599 is some other kind of code.
+    """
+    for cause in _causes(ex):
+        for attr in ("status", "status_code", "code"):
+            value = getattr(cause, attr, None)
+            if isinstance(value, int) and 100 <= value < 600:
+                return value
+    return None
+
+
+_RETRY_DELAY = re.compile(r"retry[-_ ]?(?:after|delay)['\"]?\s*[:=]\s*['\"]?(\d+(?:\.\d+)?)", re.IGNORECASE)
+
+
+def retry_after(ex: BaseException) -> float | None:
+    """Seconds a throttling error asked us to wait: a ``Retry-After`` header, a
+    ``retry_after`` attribute, or a ``retryDelay`` in the error's text."""
+    for cause in _causes(ex):
+        if isinstance(value := getattr(cause, "retry_after", None), (int, float)):
+            return float(value)
+        headers = getattr(cause, "headers", None) or {}
+        try:
+            header = headers.get("Retry-After")
+            if header is not None:
+                return float(header)
+        except (AttributeError, TypeError, ValueError):
+            pass
+        if match := _RETRY_DELAY.search(str(cause)):
+            return float(match.group(1))
+    return None
+
+
+def classify_error(ex: BaseException) -> ErrorClass:
+    """The generic reading of an error; engines refine it in ``classify_error``."""
+    if isinstance(ex, EngineThrottled):
+        return ErrorClass(ErrorKind.THROTTLED, ex.retry_after)
+    if isinstance(ex, TimeoutError):
+        return ErrorClass(ErrorKind.TRANSIENT)
+    if any(isinstance(cause, ImportError) for cause in _causes(ex)):
+        return ErrorClass(ErrorKind.FATAL)
+    status = http_status(ex)
+    if status in (401, 403):
+        return ErrorClass(ErrorKind.FATAL)
+    if status == 429:
+        return ErrorClass(ErrorKind.THROTTLED, retry_after(ex))
+    return ErrorClass(ErrorKind.TRANSIENT)
+
+
+async def watch_stream(
+    stream: AsyncIterator[T],
+    stall_seconds: float,
+    is_progress: Callable[[T], bool] = lambda _item: True,
+) -> AsyncIterator[T]:
+    """Re-yield ``stream``, raising :class:`EngineTimeout` if it stops making progress.
+
+    Progress is any item ``is_progress`` accepts — for a speech stream, audio
+    rather than metadata — and the clock restarts with each one. A non-positive
+    ``stall_seconds`` disables the watchdog.
+    """
+    loop = asyncio.get_running_loop()
+    last_progress = loop.time()
+    iterator = aiter(stream)
+    try:
+        while True:
+            remaining = last_progress + stall_seconds - loop.time() if stall_seconds > 0 else None
+            try:
+                async with asyncio.timeout(remaining):
+                    item = await anext(iterator)
+            except StopAsyncIteration:
+                return
+            except TimeoutError as ex:
+                raise EngineTimeout(f"no audio for {stall_seconds:.0f}s; the stream looks stalled") from ex
+            if is_progress(item):
+                last_progress = loop.time()
+            yield item
+    finally:
+        if hasattr(iterator, "aclose"):
+            await iterator.aclose()
+
+
 @runtime_checkable
 class SpeechEngine(Protocol):
     #: Registry key, e.g. "edge".
@@ -96,6 +232,18 @@ class BaseEngine:
     label = "Base"
     audio_suffix = ".mp3"
     max_concurrency = 4
+    #: Bounds for the adaptive concurrency controller, which starts a run at
+    #: ``max_concurrency``. A peak of None means "no higher than the start", so an
+    #: engine has to opt in to being probed past its declared limit.
+    min_concurrency = 1
+    peak_concurrency: int | None = None
+    #: Quotas the service enforces per minute, paced by the orchestrator's rate
+    #: limiter. None means the engine has none worth pacing for.
+    requests_per_minute: float | None = None
+    chars_per_minute: float | None = None
+    #: Characters a month the provider gives away, by :meth:`voice_class`; the
+    #: quota ledger checks a book against what is left. None for unmetered engines.
+    monthly_char_budget: dict[str, int] | None = None
     max_chars = 8000
     supports_speed = True
 
@@ -119,5 +267,70 @@ class BaseEngine:
         except Exception as ex:
             return False, str(ex)
 
+    def voice_class(self, voice: str) -> str:
+        """The pricing tier ``voice`` belongs to, for engines that meter by tier."""
+        return ""
+
+    def classify_error(self, ex: BaseException) -> ErrorClass:
+        """Whether a failed request is worth retrying, waiting out, or not at all."""
+        return classify_error(ex)
+
+    # ── threads for blocking SDKs ───────────────────────────────────────────
+    _executor: ThreadPoolExecutor | None = None
+    _executor_lock = threading.Lock()
+
+    def executor_size(self) -> int:
+        """Threads this engine's blocking calls get.
+
+        Twice the most requests the controller will ever have in flight: a hedged
+        request runs two attempts in one slot, and an attempt abandoned at its
+        deadline holds its thread until the SDK call returns. Without the
+        headroom, fresh requests would queue behind abandoned ones.
+        """
+        return 2 * max(self.max_concurrency, self.peak_concurrency or 0, 1)
+
+    def executor(self) -> ThreadPoolExecutor:
+        """This engine's own pool, created on first use.
+
+        The loop's default executor is shared with everything else in the
+        process, and sized by CPU count rather than by what the engine can take.
+        Threads are named after the engine, so a profiler shows which one is busy.
+        """
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.executor_size(), thread_name_prefix=f"echo-{self.name}"
+                )
+            return self._executor
+
+    async def run_blocking(self, fn: Callable[..., T], *args) -> T:
+        """``asyncio.to_thread``, on this engine's pool.
+
+        The context is carried over as ``to_thread`` does, so
+        :func:`echo.cancel.check` still works inside ``fn``.
+        """
+        context = contextvars.copy_context()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor(), functools.partial(context.run, fn, *args))
+
+    def shutdown(self) -> None:
+        """Drop queued calls and let the pool's threads exit; a later call starts a new one."""
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def open_connections(self) -> None:
+        """Note a run starting on the running loop, which may reuse connections others keep warm."""
+        return None
+
+    async def close_connections(self) -> None:
+        """Close connections kept warm for reuse on the running loop once no run opened there needs them."""
+        return None
+
+    def connection_summary(self) -> str:
+        """How the engine's connections have been used, for the run summary; empty if it keeps none."""
+        return ""
+
     async def synthesize(self, text: str, voice: str, speed: float, out_path: Path) -> SynthOutput:
         raise NotImplementedError
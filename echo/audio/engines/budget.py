@@ -0,0 +1,200 @@
+"""One budget of in-flight requests per engine, shared by every run in the process.
+
+Each synthesis run sizes its own window of requests, so two conversions at once
+— two GUI workers, a library caller converting a shelf concurrently — used to
+get the full budget each, and together push Edge past the point where it
+refuses handshakes or spend Gemini's per-minute quota twice over. Every run
+now takes a :class:`BudgetShare` of its engine's :class:`EngineBudget` and
+holds one of its slots for each request. The per-minute quota pacer lives here
+too, so it is spent once per process rather than once per run.
+
+Sharing is fair rather than first-come: a freed slot goes to the waiting run
+that holds the fewest, so a book started second is not starved by one that got
+there first, and a run alone has the whole budget to itself.
+
+Runs often live on different event loops (``run_sync`` gives each conversion
+its own), so the bookkeeping is under a thread lock and waiters are woken with
+``call_soon_threadsafe``.
+
+With ``ENGINE_BUDGET_DIR`` set, the budget also holds across processes: a slot
+is one of ``slots`` lock files there, taken with ``flock``. The kernel drops a
+lock when its process exits, so a crashed run never strands a slot. Across
+processes the total is capped but sharing is first-come.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from pathlib import Path
+
+import echo.constants as ec
+
+try:
+    import fcntl
+except ImportError:  # Windows: the budget covers this process only
+    fcntl = None
+
+log = logging.getLogger(__name__)
+
+
+@dataclass(slots=True, eq=False)
+class _Waiter:
+    share: BudgetShare
+    loop: asyncio.AbstractEventLoop
+    future: asyncio.Future
+    granted: bool = False
+
+
+def _wake(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class BudgetShare:
+    """One run's claim on an :class:`EngineBudget`; close it when the run ends."""
+
+    def __init__(self, budget: EngineBudget):
+        self.budget = budget
+        #: Slots this run holds right now.
+        self.held = 0
+        #: Seconds this run's requests spent waiting for a slot.
+        self.waited = 0.0
+
+    @property
+    def limiter(self):
+        return self.budget.limiter
+
+    def others(self) -> int:
+        """How many other runs in this process are sharing the budget."""
+        return self.budget.runs() - 1
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold one of the engine's request slots for the body of the block."""
+        started = time.monotonic()
+        await self.budget._acquire(self)
+        fd = None
+        try:
+            if self.budget.lock_dir is not None:
+                fd = await self.budget._lock_across_processes()
+            self.waited += time.monotonic() - started
+            yield
+        finally:
+            if fd is not None:
+                os.close(fd)
+            self.budget._release(self)
+
+    def close(self) -> None:
+        self.budget._leave(self)
+
+
+class EngineBudget:
+    """``slots`` requests in flight to one engine, and its quota pacer."""
+
+    def __init__(self, name: str, slots: int, limiter=None, lock_dir: Path = None):
+        self.name = name
+        self.slots = max(1, slots)
+        self.limiter = limiter
+        self.lock_dir = Path(lock_dir) if lock_dir else None
+        if self.lock_dir is not None:
+            self.lock_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._in_use = 0
+        self._waiting: list[_Waiter] = []
+        self._shares: set[BudgetShare] = set()
+
+    @classmethod
+    def for_engine(cls, engine) -> EngineBudget:
+        """As many slots as the engine's adaptive ceiling, and its declared quotas."""
+        from echo.audio.throttle import RateLimiter  # noqa: PLC0415
+
+        lock_dir = ec.ENGINE_BUDGET_DIR or None
+        if lock_dir and fcntl is None:
+            log.warning("Sharing engine budgets between processes needs fcntl; this one only covers itself")
+            lock_dir = None
+        slots = max(engine.max_concurrency, getattr(engine, "peak_concurrency", None) or 0)
+        return cls(engine.name, slots, RateLimiter.for_engine(engine), lock_dir)
+
+    def share(self) -> BudgetShare:
+        share = BudgetShare(self)
+        with self._lock:
+            self._shares.add(share)
+        return share
+
+    def runs(self) -> int:
+        with self._lock:
+            return len(self._shares)
+
+    @property
+    def in_flight(self) -> int:
+        with self._lock:
+            return self._in_use
+
+    def _leave(self, share: BudgetShare) -> None:
+        with self._lock:
+            self._shares.discard(share)
+
+    async def _acquire(self, share: BudgetShare) -> None:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._in_use < self.slots and not self._waiting:
+                self._in_use += 1
+                share.held += 1
+                return
+            waiter = _Waiter(share, loop, loop.create_future())
+            self._waiting.append(waiter)
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            with self._lock:
+                if waiter.granted:
+                    self._give_back(share)
+                else:
+                    self._waiting.remove(waiter)
+            raise
+
+    def _release(self, share: BudgetShare) -> None:
+        with self._lock:
+            self._give_back(share)
+
+    def _give_back(self, share: BudgetShare) -> None:
+        """Free one of ``share``'s slots and hand out what is free; the lock is held."""
+        share.held -= 1
+        self._in_use -= 1
+        while self._in_use < self.slots and self._waiting:
+            # Fewest held first; min() keeps the oldest among equals.
+            waiter = min(self._waiting, key=lambda w: w.share.held)
+            self._waiting.remove(waiter)
+            waiter.granted = True
+            self._in_use += 1
+            waiter.share.held += 1
+            try:
+                waiter.loop.call_soon_threadsafe(_wake, waiter.future)
+            except RuntimeError:  # its loop has closed: the run is gone
+                waiter.granted = False
+                self._in_use -= 1
+                waiter.share.held -= 1
+
+    def _try_lock_file(self) -> int | None:
+        for i in range(self.slots):
+            fd = os.open(self.lock_dir / f"{self.name}.{i}.lock", os.O_CREAT | os.O_RDWR, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                os.close(fd)
+                continue
+            return fd
+        return None
+
+    async def _lock_across_processes(self) -> int:
+        """A lock on one of the slot files, polling until another process frees one."""
+        while (fd := self._try_lock_file()) is None:
+            await asyncio.sleep(ec.ENGINE_BUDGET_POLL_SECONDS)
+        return fd
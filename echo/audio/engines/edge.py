@@ -3,18 +3,34 @@
 Still the default: nothing else needs zero setup, zero credentials and zero
 model downloads. It is an unofficial endpoint though, so transient websocket 403
 handshake failures happen — which is why the orchestrator retries, and why this
-is now one engine among several rather than the only one.
+is now one engine among several rather than the only one. Requests go over
+warm connections (:mod:`echo.audio.engines.edge_session`) rather than a new
+handshake each, which is where most of those 403s happen.
 """
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import weakref
 from pathlib import Path
 
 import edge_tts
 
 import echo.constants as ec
-from echo.audio.engines.base import BaseEngine, EngineUnavailable, SynthOutput, VoiceInfo
+from echo.audio.engines.base import (
+    BaseEngine,
+    EngineUnavailable,
+    ErrorClass,
+    ErrorKind,
+    SynthOutput,
+    VoiceInfo,
+    classify_error,
+    http_status,
+    watch_stream,
+)
+from echo.audio.engines.edge_session import EdgeSessionPool, SessionStats
+from echo.audio.writer import chunk_writer
 from echo.document import Timing
 
 log = logging.getLogger(__name__)
@@ -37,6 +53,43 @@ class EdgeEngine(BaseEngine):
     label = "Edge (Microsoft, free)"
     audio_suffix = ".mp3"
     max_concurrency = ec.MAX_THREADS
+    #: The endpoint answers 403 when pushed too hard, and the point where that
+    #: starts moves around; the adaptive controller finds it at run time.
+    peak_concurrency = max(ec.MAX_THREADS, ec.EDGE_PEAK_THREADS)
+
+    def __init__(self):
+        self.session_stats = SessionStats()
+        #: Warm connections are tied to the loop that opened them, and each
+        #: conversion may run on its own.
+        self._pools: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, EdgeSessionPool] = (
+            weakref.WeakKeyDictionary()
+        )
+        #: Runs using each loop's pool: concurrent conversions on one loop share
+        #: it, and it closes only when the last of them ends.
+        self._users: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, int] = weakref.WeakKeyDictionary()
+
+    def _pool(self) -> EdgeSessionPool:
+        loop = asyncio.get_running_loop()
+        if loop not in self._pools:
+            self._pools[loop] = EdgeSessionPool(self.session_stats)
+        return self._pools[loop]
+
+    def open_connections(self) -> None:
+        loop = asyncio.get_running_loop()
+        self._users[loop] = self._users.get(loop, 0) + 1
+
+    async def close_connections(self) -> None:
+        loop = asyncio.get_running_loop()
+        users = self._users.pop(loop, 0) - 1
+        if users > 0:
+            self._users[loop] = users
+            return
+        pool = self._pools.pop(loop, None)
+        if pool is not None:
+            await pool.close()
+
+    def connection_summary(self) -> str:
+        return str(self.session_stats) if self.session_stats.handshakes else ""
 
     def check_available(self) -> None:
         return None  # no credentials, no local model
@@ -78,14 +131,29 @@ class EdgeEngine(BaseEngine):
     def default_voice(self) -> str:
         return ec.DEFAULT_VOICE
 
+    def classify_error(self, ex: BaseException) -> ErrorClass:
+        # There are no credentials to get wrong: a 403 here is the endpoint
+        # refusing a handshake under load, which clears on its own.
+        if http_status(ex) == 403:
+            return ErrorClass(ErrorKind.TRANSIENT)
+        return classify_error(ex)
+
     async def synthesize(self, text: str, voice: str, speed: float, out_path: Path) -> SynthOutput:
         rate = speed_as_rate(speed)
-        communicate = edge_tts.Communicate(text, voice, rate=rate)
+        if ec.EDGE_POOL_SIZE > 0:
+            source = self._pool().stream(text, voice, rate)
+        else:
+            source = edge_tts.Communicate(text, voice, rate=rate).stream()
 
         timings: list[Timing] = []
         wrote_audio = False
-        with open(out_path, "wb") as fp:
-            async for chunk in communicate.stream():
+        # Frames are buffered and written by a background thread: a blocking write
+        # here would stall every other stream sharing the loop.
+        async with chunk_writer().open(out_path) as fp:
+            # A websocket can go quiet mid-book without closing; the watchdog turns
+            # that into a retryable failure instead of a run that never ends.
+            stream = watch_stream(source, ec.STALL_TIMEOUT_SECONDS, lambda c: c["type"] == "audio")
+            async for chunk in stream:
                 match chunk["type"]:
                     case "audio":
                         fp.write(chunk["data"])
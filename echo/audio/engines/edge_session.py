@@ -0,0 +1,242 @@
+"""Warm websocket connections to Edge's speech endpoint, reused across utterances.
+
+``edge_tts.Communicate`` opens a new TLS connection and websocket for every
+utterance, and again for every 4 KB of one. For a short request the handshake
+is a good share of the latency, and it is also the step where the endpoint
+refuses with 403 when it is busy. The service itself works in turns, though:
+once a connection has sent its ``speech.config``, it can send one SSML request
+after another, and each is answered with audio, metadata and a ``turn.end``.
+
+:class:`EdgeSessionPool` keeps a few such connections open per event loop and
+runs utterance after utterance over them. It speaks the protocol through
+edge-tts's own helpers (SSML, headers, the ``Sec-MS-GEC`` token), which is one
+reason edge-tts is pinned to an exact version. A connection goes back to the
+pool only after a clean ``turn.end``. One that failed or was abandoned mid-turn
+is closed, since its state is unknown. The server drops connections left idle,
+so a warm connection that turns out to be closed costs nothing: the request
+moves to a new one. :class:`SessionStats` counts handshakes, their latency and
+how often a warm connection was used instead.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import time
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from xml.sax.saxutils import escape, unescape
+
+import aiohttp
+from edge_tts.communicate import (
+    _SSL_CTX,
+    connect_id,
+    date_to_string,
+    mkssml,
+    remove_incompatible_characters,
+    split_text_by_byte_length,
+    ssml_headers_plus_data,
+)
+from edge_tts.constants import MP3_BITRATE_BPS, SEC_MS_GEC_VERSION, TICKS_PER_SECOND, WSS_HEADERS, WSS_URL
+from edge_tts.data_classes import TTSConfig
+from edge_tts.drm import DRM
+from edge_tts.exceptions import UnexpectedResponse, WebSocketError
+
+import echo.constants as ec
+
+log = logging.getLogger(__name__)
+
+#: Sent once per connection: MP3 out, sentence boundaries in the metadata.
+_SPEECH_CONFIG = (
+    "Content-Type:application/json; charset=utf-8\r\n"
+    "Path:speech.config\r\n\r\n"
+    '{"context":{"synthesis":{"audio":{"metadataoptions":{'
+    '"sentenceBoundaryEnabled":"true","wordBoundaryEnabled":"false"},'
+    '"outputFormat":"audio-24khz-48kbitrate-mono-mp3"}}}}\r\n'
+)
+
+
+@dataclass(slots=True)
+class SessionStats:
+    """Handshakes against requests, across every pool of one engine."""
+
+    requests: int = 0
+    handshakes: int = 0
+    handshake_seconds: float = 0.0
+    handshake_failures: int = 0
+    #: Requests sent over a connection an earlier request had opened.
+    reused: int = 0
+    #: Warm connections found closed by the server when a request tried them.
+    dropped: int = 0
+
+    @property
+    def mean_handshake_ms(self) -> float | None:
+        return self.handshake_seconds / self.handshakes * 1000 if self.handshakes else None
+
+    def __str__(self) -> str:
+        text = f"{self.requests} request(s) over {self.handshakes} connection(s), {self.reused} on a warm one"
+        if self.mean_handshake_ms is not None:
+            text += f"; {self.mean_handshake_ms:.0f} ms per handshake"
+        if self.handshake_failures:
+            text += f", {self.handshake_failures} refused"
+        return text
+
+
+def _headers(block: bytes) -> dict[bytes, bytes]:
+    return dict(line.split(b":", 1) for line in block.split(b"\r\n") if b":" in line)
+
+
+class _Connection:
+    def __init__(self, websocket: aiohttp.ClientWebSocketResponse):
+        self.websocket = websocket
+        self.turns = 0
+        self.idle_since = time.monotonic()
+
+    async def close(self) -> None:
+        if not self.websocket.closed:
+            await self.websocket.close()
+
+
+class EdgeSessionPool:
+    """Connections to Edge kept warm on one event loop, up to ``size`` idle at once."""
+
+    def __init__(self, stats: SessionStats, size: int = None, idle_seconds: float = None, url: str = None):
+        self.stats = stats
+        self.size = ec.EDGE_POOL_SIZE if size is None else size
+        self.idle_seconds = ec.EDGE_POOL_IDLE_SECONDS if idle_seconds is None else idle_seconds
+        self.url = url or WSS_URL
+        self._session: aiohttp.ClientSession | None = None
+        self._idle: list[_Connection] = []
+        self._in_use = 0
+        self._closing = False
+
+    async def _connect(self) -> _Connection:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                trust_env=True,
+                timeout=aiohttp.ClientTimeout(total=None, connect=None, sock_connect=10, sock_read=60),
+            )
+        for first in (True, False):
+            started = time.perf_counter()
+            try:
+                websocket = await self._session.ws_connect(
+                    f"{self.url}&ConnectionId={connect_id()}"
+                    f"&Sec-MS-GEC={DRM.generate_sec_ms_gec()}&Sec-MS-GEC-Version={SEC_MS_GEC_VERSION}",
+                    compress=15,
+                    headers=DRM.headers_with_muid(WSS_HEADERS),
+                    ssl=_SSL_CTX,
+                )
+            except aiohttp.ClientResponseError as ex:
+                self.stats.handshake_failures += 1
+                if ex.status != 403 or not first:
+                    raise
+                # Usually a clock out of step with the token's; edge-tts corrects
+                # for the skew from the response's Date, then one more try.
+                DRM.handle_client_response_error(ex)
+                continue
+            self.stats.handshakes += 1
+            self.stats.handshake_seconds += time.perf_counter() - started
+            await websocket.send_str(f"X-Timestamp:{date_to_string()}\r\n{_SPEECH_CONFIG}")
+            return _Connection(websocket)
+        raise AssertionError("unreachable")
+
+    async def _acquire(self, fresh: bool) -> _Connection:
+        while self._idle and not fresh:
+            connection = self._idle.pop()  # the most recently used is the likeliest to be open
+            if not connection.websocket.closed and time.monotonic() - connection.idle_since < self.idle_seconds:
+                break
+            await connection.close()
+        else:
+            connection = await self._connect()
+        self._in_use += 1
+        return connection
+
+    async def _release(self, connection: _Connection, reusable: bool) -> None:
+        self._in_use -= 1
+        if reusable and not self._closing and len(self._idle) < self.size and not connection.websocket.closed:
+            connection.idle_since = time.monotonic()
+            self._idle.append(connection)
+        else:
+            await connection.close()
+        if self._closing and not self._in_use:
+            await self.close()
+
+    async def close(self) -> None:
+        """Close idle connections now, and the rest as they come back."""
+        self._closing = bool(self._in_use)
+        idle, self._idle = self._idle, []
+        for connection in idle:
+            await connection.close()
+        if not self._in_use and self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def stream(self, text: str, voice: str, rate: str) -> AsyncIterator[dict]:
+        """Audio and boundary chunks for ``text``, in the shape ``Communicate.stream`` yields."""
+        config = TTSConfig(voice, rate, "+0%", "+0Hz", "SentenceBoundary")
+        audio_bytes = 0
+        for piece in split_text_by_byte_length(escape(remove_incompatible_characters(text)), 4096):
+            # Offsets restart with each request; shift them by the audio before
+            # it, exactly, since the stream is constant-bitrate.
+            offset = audio_bytes * 8 * TICKS_PER_SECOND // MP3_BITRATE_BPS
+            async for chunk in self._turn(config, piece, offset):
+                if chunk["type"] == "audio":
+                    audio_bytes += len(chunk["data"])
+                yield chunk
+
+    async def _turn(self, config: TTSConfig, piece: str, offset: int) -> AsyncIterator[dict]:
+        for fresh in (False, True):
+            connection = await self._acquire(fresh)
+            warm = connection.turns > 0
+            done = heard = False
+            try:
+                try:
+                    await connection.websocket.send_str(
+                        ssml_headers_plus_data(connect_id(), date_to_string(), mkssml(config, piece))
+                    )
+                except (aiohttp.ClientError, ConnectionError):
+                    if not warm:
+                        raise
+                else:
+                    async for message in connection.websocket:
+                        heard = True
+                        if message.type == aiohttp.WSMsgType.TEXT:
+                            head, _, body = message.data.encode("utf-8").partition(b"\r\n\r\n")
+                            path = _headers(head).get(b"Path")
+                            if path == b"turn.end":
+                                done = True
+                                break
+                            if path == b"audio.metadata":
+                                for item in json.loads(body)["Metadata"]:
+                                    if item["Type"] in ("WordBoundary", "SentenceBoundary"):
+                                        yield {
+                                            "type": item["Type"],
+                                            "offset": item["Data"]["Offset"] + offset,
+                                            "duration": item["Data"]["Duration"],
+                                            "text": unescape(item["Data"]["text"]["Text"]),
+                                        }
+                        elif message.type == aiohttp.WSMsgType.BINARY:
+                            if len(message.data) < 2:
+                                raise UnexpectedResponse("A binary message was too short to carry its headers")
+                            length = int.from_bytes(message.data[:2], "big")
+                            head, data = message.data[2 : 2 + length], message.data[2 + length :]
+                            if _headers(head).get(b"Path") != b"audio":
+                                raise UnexpectedResponse("A binary message was not audio")
+                            if data:
+                                yield {"type": "audio", "data": data}
+                        elif message.type == aiohttp.WSMsgType.ERROR:
+                            raise WebSocketError(message.data or "Unknown error")
+                if done:
+                    self.stats.requests += 1
+                    self.stats.reused += warm
+                    connection.turns += 1
+                    return
+                if not warm or heard:
+                    raise WebSocketError("Edge closed the connection in the middle of an utterance")
+                # Closed by the server while it sat idle: try again on a new one.
+                self.stats.dropped += 1
+                log.debug("A warm Edge connection had been closed; reconnecting")
+            finally:
+                await self._release(connection, done)
+        raise AssertionError("unreachable")
+
@@ -14,12 +14,20 @@
 
 from __future__ import annotations
 
-import asyncio
 import logging
 from pathlib import Path
 
 import echo.constants as ec
-from echo.audio.engines.base import BaseEngine, EngineUnavailable, SynthOutput, VoiceInfo
+from echo.audio.engines.base import (
+    BaseEngine,
+    EngineUnavailable,
+    ErrorClass,
+    ErrorKind,
+    SynthOutput,
+    VoiceInfo,
+    classify_error,
+    http_status,
+)
 from echo.audio.wav import write_pcm16_wav
 
 log = logging.getLogger(__name__)
@@ -68,6 +76,8 @@ class GeminiEngine(BaseEngine):
     label = "Gemini TTS (API key)"
     audio_suffix = ".wav"
     max_concurrency = 2  # free-tier request rates are modest
+    requests_per_minute = ec.GEMINI_RPM or None
+    chars_per_minute = ec.GEMINI_CPM or None
     max_chars = 6000
     #: The TTS models take no rate parameter, so speed is applied downstream by
     #: ffmpeg rather than pretended at here.
@@ -108,6 +118,12 @@ class GeminiEngine(BaseEngine):
     def default_voice(self) -> str:
         return "Kore"
 
+    def classify_error(self, ex: BaseException) -> ErrorClass:
+        # A bad key comes back as 400 INVALID_ARGUMENT, not 401.
+        if http_status(ex) == 400 and "API key" in str(ex):
+            return ErrorClass(ErrorKind.FATAL)
+        return classify_error(ex)
+
     def _synthesize_blocking(self, text: str, voice: str, out_path: Path) -> None:
         from google.genai import types  # noqa: PLC0415
 
@@ -133,7 +149,7 @@ class GeminiEngine(BaseEngine):
         write_pcm16_wav(pcm, out_path, rate=_PCM_RATE)
 
     async def synthesize(self, text: str, voice: str, speed: float, out_path: Path) -> SynthOutput:
-        await asyncio.to_thread(self._synthesize_blocking, text, voice, out_path)
+        await self.run_blocking(self._synthesize_blocking, text, voice, out_path)
         return SynthOutput(path=out_path)
 
 
@@ -142,6 +158,15 @@ class GoogleCloudEngine(BaseEngine):
     label = "Google Cloud TTS (free tier)"
     audio_suffix = ".mp3"
     max_concurrency = 4
+    peak_concurrency = 8
+    requests_per_minute = ec.GOOGLE_CLOUD_RPM or None
+    chars_per_minute = ec.GOOGLE_CLOUD_CPM or None
+    #: The free tier, per month. Each voice family is metered separately.
+    monthly_char_budget = {
+        "Standard": ec.GOOGLE_CLOUD_FREE_STANDARD_CHARS,
+        "WaveNet": ec.GOOGLE_CLOUD_FREE_WAVENET_CHARS,
+        "Neural2": ec.GOOGLE_CLOUD_FREE_WAVENET_CHARS,
+    }
     #: Cloud TTS rejects requests over 5,000 bytes; stay clear of the limit since
     #: non-ASCII characters cost more than one byte.
     max_chars = 4000
@@ -203,6 +228,11 @@ class GoogleCloudEngine(BaseEngine):
     def default_voice(self) -> str:
         return self._voice
 
+    def voice_class(self, voice: str) -> str:
+        # "en-GB-Neural2-C" -> "Neural2", "en-US-Wavenet-D" -> "WaveNet"
+        family = voice.split("-")[2] if voice.count("-") >= 3 else ""
+        return {"Wavenet": "WaveNet"}.get(family, family)
+
     def _synthesize_blocking(self, text: str, voice: str, speed: float, out_path: Path) -> None:
         from google.cloud import texttospeech as gtts  # noqa: PLC0415
 
@@ -221,5 +251,5 @@ class GoogleCloudEngine(BaseEngine):
         out_path.write_bytes(response.audio_content)
 
     async def synthesize(self, text: str, voice: str, speed: float, out_path: Path) -> SynthOutput:
-        await asyncio.to_thread(self._synthesize_blocking, text, voice, speed, out_path)
+        await self.run_blocking(self._synthesize_blocking, text, voice, speed, out_path)
         return SynthOutput(path=out_path)
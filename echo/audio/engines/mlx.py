@@ -13,11 +13,11 @@ than letting the ImportError surface raw.
 
 from __future__ import annotations
 
-import asyncio
 import logging
 import platform
 from pathlib import Path
 
+import echo.cancel as cancel
 import echo.constants as ec
 from echo.audio.engines.base import BaseEngine, EngineUnavailable, SynthOutput, VoiceInfo
 from echo.audio.wav import write_float_wav
@@ -197,7 +197,11 @@ class MlxEngine(BaseEngine):
             kwargs["voice"] = voice
             kwargs["lang_code"] = self.lang_code_for(voice)
 
-        segments = list(model.generate(**kwargs))
+        segments = []
+        for segment in model.generate(**kwargs):
+            # A long passage renders for a while; stop between segments if asked.
+            cancel.check()
+            segments.append(segment)
         if not segments:
             raise EngineUnavailable(f"{self.model_id} produced no audio for this passage")
 
@@ -206,5 +210,5 @@ class MlxEngine(BaseEngine):
         write_float_wav(audio, out_path, rate=rate)
 
     async def synthesize(self, text: str, voice: str, speed: float, out_path: Path) -> SynthOutput:
-        await asyncio.to_thread(self._synthesize_blocking, text, voice, speed, out_path)
+        await self.run_blocking(self._synthesize_blocking, text, voice, speed, out_path)
         return SynthOutput(path=out_path)
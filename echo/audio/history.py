@@ -0,0 +1,254 @@
+"""What each engine has done before, so a run need not start from nothing.
+
+Every run used to begin from constants: the engine's declared concurrency, no
+idea of its latency, and no ETA until chunks had finished. Yet how fast Edge
+was yesterday, at what concurrency it started refusing, and how Kokoro's speed
+varies by voice are all things earlier runs saw. Each engine request is now
+recorded here — engine, voice, characters, latency, audio length, attempt,
+error and the concurrency it ran at — and :meth:`EngineHistory.prior` turns the
+recent record into starting points:
+
+* the adaptive controller starts at the highest concurrency that has stayed
+  nearly error-free, with its latency baseline at the historical median;
+* hedging knows its latency percentile from the first request;
+* the ETA has a throughput to go on before the first chunk is back.
+
+``create_audio.py --engine-stats`` summarises the record. Rows are buffered in
+memory and written in one transaction every few hundred requests and at the
+end of a run. A run reads its prior and writes those batches on a worker
+thread, as it does with the synthesis cache, so SQLite never holds up the event
+loop the run's streams share. Like the quota ledger this is bookkeeping: a
+database error is logged, never raised into a conversion.
+"""
+
+from __future__ import annotations
+
+import logging
+import sqlite3
+import statistics
+import threading
+import time
+import uuid
+from contextlib import closing
+from dataclasses import dataclass
+from pathlib import Path
+
+import echo.constants as ec
+from echo.audio._sqlite import SqliteFile
+
+log = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS requests (
+    run TEXT NOT NULL,
+    engine TEXT NOT NULL,
+    voice TEXT NOT NULL,
+    chars INTEGER NOT NULL,
+    latency REAL,
+    audio_ms INTEGER,
+    attempt INTEGER NOT NULL,
+    error TEXT,
+    concurrency INTEGER NOT NULL,
+    recorded REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS requests_by_engine ON requests (engine, voice, recorded);
+"""
+
+#: Requests shorter than this are mostly fixed overhead; their latency per
+#: character says little (the same cut-off the adaptive controller uses).
+_MIN_CHARS = 200
+
+
+def _percentile(ordered: list[float], q: float) -> float:
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+@dataclass(frozen=True, slots=True)
+class Prior:
+    """Starting points for a run, from an engine's recent history."""
+
+    #: Median seconds of latency per character.
+    seconds_per_char: float
+    #: Recent per-character latencies, for the hedger's percentile.
+    samples: list[float]
+    #: The highest concurrency whose error rate stayed under HISTORY_MAX_ERROR_RATE.
+    concurrency: int | None
+    #: Characters per second a run could expect: requests in flight over latency.
+    chars_per_second: float
+
+
+@dataclass(frozen=True, slots=True)
+class EngineStats:
+    engine: str
+    voice: str
+    requests: int
+    failures: int
+    runs: int
+    ms_per_char_p50: float | None
+    ms_per_char_p90: float | None
+    #: Seconds of audio per second of waiting, per request.
+    realtime_factor: float | None
+    concurrency: int | None
+
+    def __str__(self) -> str:
+        bits = [f"{self.engine:14} {self.voice:28} {self.requests:>7,} request(s) in {self.runs} run(s)"]
+        bits.append(f"{self.failures / self.requests:.1%} failed" if self.requests else "")
+        if self.ms_per_char_p50 is not None:
+            bits.append(f"{self.ms_per_char_p50:.2f}/{self.ms_per_char_p90:.2f} ms/char p50/p90")
+        if self.realtime_factor is not None:
+            bits.append(f"{self.realtime_factor:.1f}x real time")
+        if self.concurrency is not None:
+            bits.append(f"clean up to {self.concurrency} in flight")
+        return ", ".join(b for b in bits if b)
+
+
+class EngineHistory:
+    """Per-request records of every engine, in SQLite beside the synthesis cache."""
+
+    #: Buffered rows after which :attr:`due` asks for a write mid-run.
+    FLUSH_EVERY = 200
+
+    def __init__(self, path: Path = None):
+        self.path = Path(path) if path else Path(ec.CACHE_DIR) / "history.sqlite"
+        self.run = uuid.uuid4().hex
+        self._db = SqliteFile(self.path, _SCHEMA)
+        self._pending: list[tuple] = []
+        #: :meth:`flush` may run on a worker thread while the loop records more.
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        engine: str,
+        voice: str,
+        chars: int,
+        latency: float | None,
+        audio_ms: int | None,
+        attempt: int,
+        error: str | None,
+        concurrency: int,
+    ) -> None:
+        """Note one request; ``latency`` and ``audio_ms`` are None when it failed.
+
+        Only buffered: call :meth:`flush` once :attr:`due`, and at the end.
+        """
+        row = (self.run, engine, voice, chars, latency, audio_ms, attempt, error, concurrency, time.time())
+        with self._lock:
+            self._pending.append(row)
+
+    @property
+    def due(self) -> bool:
+        """Whether enough rows are buffered to be worth a write."""
+        return len(self._pending) >= self.FLUSH_EVERY
+
+    def flush(self) -> None:
+        """Write the buffered rows; safe to run on a worker thread."""
+        with self._lock:
+            rows, self._pending = self._pending, []
+        if not rows:
+            return
+        try:
+            with closing(self._db.connect()) as conn, conn:
+                conn.executemany("INSERT INTO requests VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+                # Keep the table bounded: only recent behaviour is worth learning from.
+                conn.execute(
+                    "DELETE FROM requests WHERE rowid <= (SELECT MAX(rowid) FROM requests) - ?",
+                    (ec.HISTORY_MAX_ROWS,),
+                )
+        except sqlite3.Error as ex:
+            log.warning(f"Could not update the engine history: {ex}")
+
+    def _recent(self, engine: str, voice: str | None) -> list[tuple]:
+        if not self.path.exists():
+            return []
+        query = "SELECT chars, latency, audio_ms, error, concurrency, run FROM requests WHERE engine = ?"
+        params: tuple = (engine,)
+        if voice is not None:
+            query += " AND voice = ?"
+            params += (voice,)
+        try:
+            with closing(self._db.connect()) as conn:
+                return conn.execute(
+                    query + " ORDER BY recorded DESC LIMIT ?", params + (ec.HISTORY_WINDOW,)
+                ).fetchall()
+        except sqlite3.Error as ex:
+            log.warning(f"Could not read the engine history: {ex}")
+            return []
+
+    @staticmethod
+    def _clean_concurrency(rows: list[tuple]) -> int | None:
+        by_level: dict[int, list[bool]] = {}
+        for _chars, _latency, _audio, error, concurrency, _run in rows:
+            by_level.setdefault(concurrency, []).append(error is not None)
+        clean = [
+            level
+            for level, failed in by_level.items()
+            if len(failed) >= 10 and sum(failed) / len(failed) <= ec.HISTORY_MAX_ERROR_RATE
+        ]
+        return max(clean) if clean else None
+
+    def prior(self, engine: str, voice: str) -> Prior | None:
+        """Starting points for ``engine`` and ``voice``, if there is enough history.
+
+        The voice's own record is used when it has enough requests, and the
+        engine's across all voices otherwise.
+        """
+        for rows in (self._recent(engine, voice), self._recent(engine, None)):
+            per_char = [latency / chars for chars, latency, *_ in rows if latency and chars >= _MIN_CHARS]
+            if len(per_char) >= ec.HISTORY_MIN_SAMPLES:
+                break
+        else:
+            return None
+        concurrency = self._clean_concurrency(rows)
+        typical = concurrency or statistics.median(row[4] for row in rows)
+        median = statistics.median(per_char)
+        return Prior(
+            seconds_per_char=median,
+            samples=per_char[:500],
+            concurrency=concurrency,
+            chars_per_second=typical / median if median > 0 else 0.0,
+        )
+
+    def stats(self) -> list[EngineStats]:
+        """One summary per engine and voice, busiest first."""
+        if not self.path.exists():
+            return []
+        try:
+            with closing(self._db.connect()) as conn:
+                pairs = conn.execute(
+                    "SELECT engine, voice FROM requests GROUP BY engine, voice ORDER BY COUNT(*) DESC"
+                ).fetchall()
+        except sqlite3.Error as ex:
+            log.warning(f"Could not read the engine history: {ex}")
+            return []
+        out = []
+        for engine, voice in pairs:
+            rows = self._recent(engine, voice)
+            per_char = sorted(latency / chars for chars, latency, *_ in rows if latency and chars >= _MIN_CHARS)
+            realtime = [audio / 1000 / latency for _c, latency, audio, *_ in rows if latency and audio]
+            out.append(
+                EngineStats(
+                    engine=engine,
+                    voice=voice,
+                    requests=len(rows),
+                    failures=sum(row[3] is not None for row in rows),
+                    runs=len({row[5] for row in rows}),
+                    ms_per_char_p50=_percentile(per_char, 0.5) * 1000 if per_char else None,
+                    ms_per_char_p90=_percentile(per_char, 0.9) * 1000 if per_char else None,
+                    realtime_factor=statistics.median(realtime) if realtime else None,
+                    concurrency=self._clean_concurrency(rows),
+                )
+            )
+        return out
+
+    def report(self) -> str:
+        stats = self.stats()
+        if not stats:
+            return f"No engine history yet in {self.path}"
+        lines = [f"Engine history: {self.path} (the latest {ec.HISTORY_WINDOW:,} requests per voice)"]
+        lines += [f"  {s}" for s in stats]
+        return "\n".join(lines)
+
+
+def default_history() -> EngineHistory | None:
+    """A history to record into and learn from, or None when ``ENGINE_HISTORY`` is off."""
+    return EngineHistory() if ec.ENGINE_HISTORY else None
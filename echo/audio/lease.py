@@ -0,0 +1,135 @@
+"""Claims on chunks, so several processes can synthesize one book together.
+
+One process is capped by its engine's concurrency (``mlx`` runs one request at
+a time) and by its own event loop. To put more cores or machines on one long
+book, every process points at the same chunks directory and claims chunks
+before synthesizing them: a claim is a ``chunk_00012.lease`` file created with
+``O_EXCL``, so exactly one process wins it. A holder refreshes its leases while
+it works; a lease left untouched for ``LEASE_SECONDS`` belongs to a process
+that died, and may be taken over.
+
+The worst a race can do — two processes judging the same lease stale at once —
+is synthesize one chunk twice. Chunk files are only ever replaced whole, and
+the manifest keeps the last line for an index, so nothing is corrupted.
+
+Across machines the directory has to be on a shared filesystem that honours
+``O_EXCL`` (any local disk, NFSv3 or later, SMB).
+
+Sharing only works if every process builds the same script: a helper with
+another chunk size, voice or normalizer would write its own audio under the
+coordinator's chunk numbers. The coordinator therefore leaves a fingerprint of
+its script (:func:`script_fingerprint`) in the directory, and a helper compares
+its own against it before claiming anything.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import socket
+import time
+import uuid
+from pathlib import Path
+
+import echo.constants as ec
+
+log = logging.getLogger(__name__)
+
+
+def lease_path(chunks_dir: Path, index: int) -> Path:
+    return Path(chunks_dir) / f"chunk_{index:05d}.lease"
+
+
+def script_path(chunks_dir: Path) -> Path:
+    return Path(chunks_dir) / "script.fingerprint"
+
+
+def script_fingerprint(keys: list[str]) -> str:
+    """One hash of every chunk's synthesis key, in order."""
+    digest = hashlib.sha256()
+    for key in keys:
+        digest.update(key.encode("utf-8") + b"\n")
+    return digest.hexdigest()
+
+
+class ChunkLeases:
+    """This process's leases in one chunks directory."""
+
+    def __init__(self, chunks_dir: Path, owner: str = None, stale_after: float = None):
+        self.chunks_dir = Path(chunks_dir)
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.stale_after = ec.LEASE_SECONDS if stale_after is None else stale_after
+        self.held: set[int] = set()
+
+    def _stale(self, path: Path) -> bool:
+        try:
+            return time.time() - path.stat().st_mtime > self.stale_after
+        except FileNotFoundError:
+            return True
+
+    def claim(self, index: int) -> bool:
+        """Take ``index`` if no live process holds it."""
+        if index in self.held:
+            return True
+        path = lease_path(self.chunks_dir, index)
+        for _ in range(2):
+            try:
+                fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+            except FileExistsError:
+                if not self._stale(path):
+                    return False
+                log.info(f"Taking over chunk {index} from {self._holder(path) or 'a process'} that stopped")
+                path.unlink(missing_ok=True)
+                continue
+            with os.fdopen(fd, "w", encoding="utf-8") as fp:
+                json.dump({"owner": self.owner, "claimed": time.time()}, fp)
+            self.held.add(index)
+            return True
+        return False
+
+    def publish_script(self, fingerprint: str) -> None:
+        """Record the script this directory's chunks belong to (the coordinator's)."""
+        path = script_path(self.chunks_dir)
+        part = path.with_name(f"{path.name}.{self.owner.replace(':', '-')}")
+        part.write_text(fingerprint, encoding="utf-8")
+        os.replace(part, path)
+
+    def published_script(self) -> str | None:
+        """The coordinator's script fingerprint, or None if none has been recorded."""
+        try:
+            return script_path(self.chunks_dir).read_text(encoding="utf-8").strip() or None
+        except FileNotFoundError:
+            return None
+
+    def is_live(self, index: int) -> bool:
+        """Whether some process (this one included) holds ``index`` and is still at it."""
+        return not self._stale(lease_path(self.chunks_dir, index))
+
+    def refresh(self) -> None:
+        """Mark every held lease as still being worked on."""
+        for index in list(self.held):
+            try:
+                os.utime(lease_path(self.chunks_dir, index))
+            except FileNotFoundError:
+                # Judged stale and taken over; whoever has it now will finish it.
+                self.held.discard(index)
+
+    def release(self, index: int) -> None:
+        if index in self.held:
+            self.held.discard(index)
+            path = lease_path(self.chunks_dir, index)
+            if self._holder(path) == self.owner:
+                path.unlink(missing_ok=True)
+
+    def release_all(self) -> None:
+        for index in list(self.held):
+            self.release(index)
+
+    @staticmethod
+    def _holder(path: Path) -> str | None:
+        try:
+            return json.loads(path.read_text(encoding="utf-8")).get("owner")
+        except (OSError, ValueError, AttributeError):
+            return None
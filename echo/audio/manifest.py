@@ -0,0 +1,122 @@
+"""The resume manifest: what each file in a chunks directory holds.
+
+Resume used to open every chunk (mutagen, or the WAV header) one at a time before
+any new work started, and trusted a chunk by its index alone — so a chunk whose
+text had changed since the last run was reused anyway. The manifest records, per
+index, the :func:`~echo.audio.cache.synthesis_key` of what was synthesized, its
+duration, byte size and timings. Resuming is a dict lookup and a ``stat`` per
+chunk, and an utterance whose text, voice or speed changed simply misses.
+
+JSON lines, appended as each chunk lands: a crash loses at most the line being
+written, and a later line for an index supersedes an earlier one. Each line goes
+out in a single append, so processes sharing a chunks directory
+(:mod:`echo.audio.lease`) can write to one manifest, and :meth:`ChunkManifest.refresh`
+picks up what the others have added.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from echo.document import Timing
+
+log = logging.getLogger(__name__)
+
+FILENAME = "manifest.jsonl"
+
+
+@dataclass(slots=True)
+class ManifestEntry:
+    index: int
+    key: str
+    duration_ms: int
+    size_bytes: int
+    timings: list[Timing] = field(default_factory=list)
+
+
+class ChunkManifest:
+    """Append-only record of the chunks written into one chunks directory."""
+
+    def __init__(self, chunks_dir: Path):
+        self.path = Path(chunks_dir) / FILENAME
+        self.entries: dict[int, ManifestEntry] = {}
+        self._read_to = 0  # bytes of the file already parsed
+
+    @property
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def load(self) -> dict[int, ManifestEntry]:
+        self.entries = {}
+        self._read_to = 0
+        return self.refresh()
+
+    def refresh(self) -> dict[int, ManifestEntry]:
+        """Read lines appended since the last load or refresh, by any process."""
+        try:
+            with open(self.path, "rb") as fp:
+                fp.seek(self._read_to)
+                data = fp.read()
+        except FileNotFoundError:
+            return self.entries
+        # A line still being written has no newline yet; leave it for next time.
+        complete = data[: data.rfind(b"\n") + 1]
+        self._read_to += len(complete)
+        for line in complete.decode("utf-8", errors="replace").splitlines():
+            try:
+                raw = json.loads(line)
+                entry = ManifestEntry(
+                    index=raw["index"],
+                    key=raw["key"],
+                    duration_ms=raw["duration_ms"],
+                    size_bytes=raw["size_bytes"],
+                    timings=[Timing(*t) for t in raw.get("timings", [])],
+                )
+            except (ValueError, KeyError, TypeError):
+                # A torn last line from a killed run; everything before it stands.
+                log.debug(f"Skipping an unreadable line in {self.path}")
+                continue
+            self.entries[entry.index] = entry
+        return self.entries
+
+    def lookup(self, index: int, key: str, path: Path) -> ManifestEntry | None:
+        """The entry for ``index`` if it still describes ``path`` and ``key``."""
+        entry = self.entries.get(index)
+        if entry is None or entry.key != key:
+            return None
+        try:
+            if Path(path).stat().st_size != entry.size_bytes:
+                return None
+        except OSError:
+            return None
+        return entry
+
+    def record(self, index: int, key: str, path: Path, duration_ms: int, timings: list[Timing] = ()) -> None:
+        entry = ManifestEntry(
+            index=index,
+            key=key,
+            duration_ms=duration_ms,
+            size_bytes=Path(path).stat().st_size,
+            timings=list(timings),
+        )
+        line = json.dumps(
+            {
+                "index": entry.index,
+                "key": entry.key,
+                "duration_ms": entry.duration_ms,
+                "size_bytes": entry.size_bytes,
+                "timings": [(t.start_ms, t.end_ms, t.text) for t in entry.timings],
+            }
+        )
+        # One write on an O_APPEND descriptor: lines from processes sharing the
+        # directory cannot interleave.
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, (line + "\n").encode("utf-8"))
+        finally:
+            os.close(fd)
+        self.entries[index] = entry
@@ -39,6 +39,22 @@ def configure_ffmpeg() -> str | None:
     return shutil.which("ffmpeg")
 
 
+def mp3_frames(data: bytes) -> bytes:
+    """An MP3 file's audio frames, without ID3v2 header or ID3v1 trailer.
+
+    What makes byte-level concatenation safe: frames are self-contained, tags
+    are not, and a tag in the middle of a stream is noise to most decoders.
+    """
+    if data[:3] == b"ID3" and len(data) >= 10:
+        # Syncsafe size: 7 bits per byte, plus the 10-byte header (and a footer if flagged).
+        size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+        footer = 10 if data[5] & 0x10 else 0
+        data = data[10 + size + footer :]
+    if len(data) >= 128 and data[-128:-125] == b"TAG":
+        data = data[:-128]
+    return data
+
+
 def _add_mp3_meta(path: Path, title: str | None, author: str | None, image_path: Path | None) -> None:
     if title or author:
         try:
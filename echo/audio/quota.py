@@ -0,0 +1,170 @@
+"""A ledger of characters sent to metered engines, and the monthly budget check.
+
+Google Cloud's free tier — 4M Standard and 1M WaveNet characters a month — is
+the reason to use that engine, and going over it used to show up first on the
+bill. Every request that reaches an engine is now recorded here by engine,
+voice class (the unit a provider prices by) and calendar month, and
+:func:`check_budget` compares a book against what is left before synthesis
+starts.
+
+Characters served from the cache or resumed from disk are not sent, so are not
+counted. Like the synthesis cache, the ledger is bookkeeping rather than a
+dependency: a database error is logged, never raised into a conversion.
+Requests are totted up in memory and written in one transaction every so many
+and at the end of a run, on a worker thread as the engine history is, so a busy
+database never holds up the event loop.
+"""
+
+from __future__ import annotations
+
+import logging
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from dataclasses import dataclass
+from pathlib import Path
+
+import echo.constants as ec
+from echo.audio._sqlite import SqliteFile
+
+log = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS usage (
+    engine TEXT NOT NULL,
+    voice_class TEXT NOT NULL,
+    month TEXT NOT NULL,
+    chars INTEGER NOT NULL DEFAULT 0,
+    requests INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (engine, voice_class, month)
+);
+"""
+
+#: What :func:`check_budget` may do about a book that does not fit.
+POLICIES = ("refuse", "warn", "route")
+
+
+class QuotaExceeded(RuntimeError):
+    """Raised before synthesis when a book would overrun a monthly budget."""
+
+
+def current_month() -> str:
+    return time.strftime("%Y-%m", time.gmtime())
+
+
+@dataclass(slots=True)
+class Budget:
+    """One engine and voice class's allowance for the month, and its use so far."""
+
+    engine: str
+    voice_class: str
+    limit: int
+    used: int
+
+    @property
+    def remaining(self) -> int:
+        return max(0, self.limit - self.used)
+
+    def __str__(self) -> str:
+        label = f"{self.engine} {self.voice_class}".strip()
+        return f"{label}: {self.used:,} of {self.limit:,} characters used this month"
+
+
+class QuotaLedger:
+    """Characters and requests sent, per engine, voice class and month."""
+
+    #: Buffered requests after which :attr:`due` asks for a write mid-run.
+    FLUSH_EVERY = 100
+
+    def __init__(self, path: Path = None):
+        self.path = Path(path) if path else Path(ec.CACHE_DIR) / "quota.sqlite"
+        self._db = SqliteFile(self.path, _SCHEMA)
+        #: Characters and requests not yet written, by (engine, voice class, month).
+        self._pending: dict[tuple[str, str, str], list[int]] = {}
+        self._buffered = 0
+        #: :meth:`flush` may run on a worker thread while the loop records more.
+        self._lock = threading.Lock()
+
+    def record(self, engine: str, voice_class: str, chars: int, month: str = None) -> None:
+        """Add one request of ``chars`` characters; call :meth:`flush` once :attr:`due`, and at the end."""
+        with self._lock:
+            totals = self._pending.setdefault((engine, voice_class, month or current_month()), [0, 0])
+            totals[0] += chars
+            totals[1] += 1
+            self._buffered += 1
+
+    @property
+    def due(self) -> bool:
+        """Whether enough requests are buffered to be worth a write."""
+        return self._buffered >= self.FLUSH_EVERY
+
+    def flush(self) -> None:
+        """Write what :meth:`record` has buffered; safe to run on a worker thread."""
+        with self._lock:
+            pending, self._pending, self._buffered = self._pending, {}, 0
+        if not pending:
+            return
+        try:
+            with closing(self._db.connect()) as conn, conn:
+                conn.executemany(
+                    "INSERT INTO usage (engine, voice_class, month, chars, requests) VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT(engine, voice_class, month) DO UPDATE SET "
+                    "chars = chars + excluded.chars, requests = requests + excluded.requests",
+                    [(*key, chars, requests) for key, (chars, requests) in pending.items()],
+                )
+        except sqlite3.Error as ex:
+            log.warning(f"Could not update the quota ledger: {ex}")
+
+    def used(self, engine: str, voice_class: str, month: str = None) -> int:
+        """Characters sent this month, counting those not yet written."""
+        month = month or current_month()
+        with self._lock:
+            buffered = self._pending.get((engine, voice_class, month), [0, 0])[0]
+        try:
+            with closing(self._db.connect()) as conn:
+                row = conn.execute(
+                    "SELECT chars FROM usage WHERE engine = ? AND voice_class = ? AND month = ?",
+                    (engine, voice_class, month),
+                ).fetchone()
+        except sqlite3.Error as ex:
+            log.warning(f"Could not read the quota ledger: {ex}")
+            return buffered
+        return (row[0] if row else 0) + buffered
+
+    def budget(self, engine, voice: str) -> Budget | None:
+        """This month's budget for ``voice`` on ``engine``, if the engine has one."""
+        voice_class = engine.voice_class(voice)
+        limit = (getattr(engine, "monthly_char_budget", None) or {}).get(voice_class)
+        if not limit:
+            return None
+        return Budget(engine.name, voice_class, limit, self.used(engine.name, voice_class))
+
+
+def check_budget(ledger: QuotaLedger, engine, voice: str, chars: int, policy: str = None) -> bool:
+    """Whether a book of ``chars`` characters should go ahead on ``engine``.
+
+    ``policy`` (default ``QUOTA_POLICY``) decides what happens when it would not
+    fit: ``refuse`` raises :class:`QuotaExceeded`, ``warn`` logs and goes ahead,
+    and ``route`` returns False so the caller can switch engines.
+    """
+    policy = (policy or ec.QUOTA_POLICY).lower()
+    if policy not in POLICIES:
+        raise ValueError(f"Unknown quota policy '{policy}'. Choose from: {', '.join(POLICIES)}")
+    budget = ledger.budget(engine, voice)
+    if budget is None or chars <= budget.remaining:
+        if budget is not None:
+            log.info(f"Quota: {budget}; this book needs up to {chars:,}")
+        return True
+
+    message = (
+        f"This book needs up to {chars:,} characters but only {budget.remaining:,} are left "
+        f"in this month's budget ({budget})."
+    )
+    if policy == "refuse":
+        raise QuotaExceeded(f"{message} Use another engine, or set QUOTA_POLICY=warn to go ahead anyway.")
+    if policy == "warn":
+        log.warning(f"{message} Going ahead; characters past the budget may be billed.")
+        return True
+    log.warning(f"{message} Switching to the {ec.QUOTA_FALLBACK_ENGINE} engine.")
+    return False
@@ -0,0 +1,396 @@
+"""Flow control for synthesis: how hard a run pushes its engine.
+
+A fixed ``max_concurrency`` is wrong in both directions. Edge's unofficial
+endpoint starts refusing websocket handshakes when pushed, at a point that moves
+from day to day, and leaves headroom unused when it isn't being pushed.
+:class:`AimdController` finds the limit at run time the way TCP finds a window:
+additive increase while requests succeed quickly, multiplicative decrease on an
+error or a latency spike. :class:`Hedger` deals with the other tail: the odd
+request that stalls while everything around it is fine. :class:`CircuitBreaker`
+is for when nothing is fine: bad credentials, or a service that is down, should
+stop or pause the whole run once, not be rediscovered by every chunk in turn.
+:class:`RateLimiter` keeps a run inside quotas stated per minute, which no
+concurrency limit can express.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import threading
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from typing import TypeVar
+
+import echo.constants as ec
+from echo.audio.engines.base import ErrorClass, ErrorKind
+from echo.audio.history import Prior
+
+log = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class AimdController:
+    """An in-flight limit that adapts to errors and per-character latency.
+
+    The limit grows by one for each window of successes (``1/limit`` per success)
+    and halves on a congestion signal. Only one cut is taken per window: requests
+    already in flight when the limit was cut saw the old conditions, and their
+    failures say nothing new.
+    """
+
+    #: Utterances shorter than this are dominated by fixed request overhead, so
+    #: their latency per character says nothing about congestion.
+    LATENCY_MIN_CHARS = 200
+    #: Samples needed before latency is trusted as a signal at all.
+    LATENCY_WARMUP = 4
+
+    def __init__(
+        self,
+        start: int,
+        floor: int = 1,
+        ceiling: int = None,
+        decrease: float = 0.5,
+        latency_factor: float = 2.5,
+        baseline: float = None,
+    ):
+        self.floor = max(1, floor)
+        self.ceiling = max(self.floor, ceiling if ceiling is not None else start)
+        self._limit = float(min(max(start, self.floor), self.ceiling))
+        self._decrease = decrease
+        self._latency_factor = latency_factor
+        # Best seconds per character seen; a run with history starts from its median.
+        self._baseline: float | None = baseline
+        self._samples = 0
+        self._since_cut = math.inf
+        self.peak = self.limit
+        self.cuts = 0
+
+    @classmethod
+    def for_engine(cls, engine, prior: Prior = None) -> AimdController:
+        """A controller within the engine's declared bounds.
+
+        With a :class:`~echo.audio.history.Prior`, it starts at the highest
+        concurrency that has recently stayed clean, and measures latency against
+        the engine's usual rather than against the first few requests.
+        """
+        start = max(1, engine.max_concurrency)
+        if not ec.ADAPTIVE_CONCURRENCY:
+            return cls(start, floor=start, ceiling=start)
+        peak = getattr(engine, "peak_concurrency", None)
+        if prior is not None and prior.concurrency is not None:
+            start = prior.concurrency
+        return cls(
+            start,
+            floor=getattr(engine, "min_concurrency", 1),
+            ceiling=peak or max(1, engine.max_concurrency),
+            baseline=prior.seconds_per_char if prior is not None else None,
+        )
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def adaptive(self) -> bool:
+        return self.floor != self.ceiling
+
+    def on_success(self, latency: float, chars: int) -> None:
+        self._since_cut += 1
+        if chars >= self.LATENCY_MIN_CHARS and latency > 0:
+            per_char = latency / chars
+            self._samples += 1
+            if self._baseline is None or per_char < self._baseline:
+                self._baseline = per_char
+            elif self._samples > self.LATENCY_WARMUP and per_char > self._baseline * self._latency_factor:
+                self._cut(f"latency {per_char * 1000:.1f} ms/char against a best of {self._baseline * 1000:.1f}")
+                return
+        self._limit = min(self.ceiling, self._limit + 1 / self._limit)
+        self.peak = max(self.peak, self.limit)
+
+    def on_error(self) -> None:
+        self._since_cut += 1
+        self._cut("an error")
+
+    def _cut(self, reason: str) -> None:
+        if self._since_cut < self._limit or self._limit <= self.floor:
+            return
+        before = self.limit
+        self._limit = max(self.floor, self._limit * self._decrease)
+        self._since_cut = 0
+        self.cuts += 1
+        if self.limit != before:
+            log.debug(f"Concurrency {before} -> {self.limit} after {reason}")
+
+    def summary(self) -> str:
+        if not self.adaptive:
+            return f"concurrency fixed at {self.limit}"
+        return (
+            f"concurrency settled at {self.limit} "
+            f"(peak {self.peak}, {self.cuts} cut(s), bounds {self.floor}-{self.ceiling})"
+        )
+
+
+class Hedger:
+    """Duplicates a request that has run far longer than this run's norm.
+
+    The last few percent of a long run is often stuck behind one or two requests
+    whose streams stalled. Once a request has taken longer than the chosen
+    percentile of this run's latency (per character, scaled to its own length), a
+    second copy is started; whichever finishes first is kept and the other is
+    cancelled. A hedge is an extra request outside the concurrency window, which is
+    why this is opt-in. The clock starts when the request is sent, not while it
+    queues for a budget slot or quota: a request that has not reached the engine
+    is not a straggler, and hedging it would add the very load the queue holds
+    back.
+    """
+
+    #: Latencies needed before a percentile means anything.
+    MIN_SAMPLES = 10
+
+    def __init__(self, percentile: float = None, min_delay: float = None, window: int = 500):
+        self.percentile = ec.HEDGE_PERCENTILE if percentile is None else percentile
+        self.min_delay = ec.HEDGE_MIN_SECONDS if min_delay is None else min_delay
+        self._per_char: deque[float] = deque(maxlen=window)
+
+    def on_success(self, latency: float, chars: int) -> None:
+        self._per_char.append(latency / max(1, chars))
+
+    def seed(self, per_char: list[float]) -> None:
+        """Start from earlier runs' latencies; this run's own push them out of the window."""
+        self._per_char.extend(reversed(per_char[: self._per_char.maxlen]))
+
+    def delay_for(self, chars: int) -> float | None:
+        """How long a request of ``chars`` may run before it is hedged, if known yet."""
+        if len(self._per_char) < self.MIN_SAMPLES:
+            return None
+        ordered = sorted(self._per_char)
+        rank = min(len(ordered) - 1, int(self.percentile * len(ordered)))
+        return max(self.min_delay, ordered[rank] * max(1, chars))
+
+    async def race(self, attempt: Callable[[str, asyncio.Event], Awaitable[T]], chars: int) -> tuple[T, bool]:
+        """Run ``attempt("part", sent)``, hedged with ``attempt("hedge", ...)`` if it straggles.
+
+        ``attempt`` is called with a tag so the two copies write to different files,
+        and an event it sets once its request is on its way to the engine.
+        Returns the first success and whether a hedge was launched; raises only if
+        every copy failed.
+        """
+        sent = asyncio.Event()
+        primary = asyncio.ensure_future(attempt("part", sent))
+        delay = self.delay_for(chars)
+        if delay is None:
+            return await primary, False
+        on_its_way = asyncio.ensure_future(sent.wait())
+        try:
+            await asyncio.wait({primary, on_its_way}, return_when=asyncio.FIRST_COMPLETED)
+            done, _ = await asyncio.wait({primary}, timeout=None if primary.done() else delay)
+        except asyncio.CancelledError:
+            primary.cancel()
+            raise
+        finally:
+            on_its_way.cancel()
+        if done:
+            return primary.result(), False
+
+        log.debug(f"Hedging a {chars}-character request still running after {delay:.1f}s")
+        hedge = asyncio.ensure_future(attempt("hedge", asyncio.Event()))
+        pending = {primary, hedge}
+        error: BaseException | None = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result(), True
+                    error = task.exception()
+            raise error
+        finally:
+            for task in (primary, hedge):
+                task.cancel()
+            await asyncio.gather(primary, hedge, return_exceptions=True)
+
+
+class CircuitBreaker:
+    """Run-wide failure handling: pause everything, or stop.
+
+    * A **fatal** error stops the run at once.
+    * A **throttled** one pauses every request for as long as the service asked
+      (or the retry backoff, if it didn't say).
+    * When the share of failures among recent requests crosses ``threshold``,
+      the breaker opens: nothing is sent for ``cooldown`` seconds, then a single
+      probe request goes out. Its success closes the breaker; its failure opens it
+      again for twice as long. After ``max_trips`` openings in a row the run stops.
+
+    The scheduler asks :meth:`hold` before launching anything and clamps its
+    window with :meth:`limit`. Each opening starts a new :attr:`generation`;
+    callers pass the one a request started under, and outcomes of requests
+    from before the latest opening are ignored, so only the probe decides
+    whether the engine has recovered.
+    """
+
+    #: Requests seen before a failure rate is trusted.
+    MIN_SAMPLES = 10
+
+    def __init__(
+        self,
+        threshold: float = None,
+        window: int = None,
+        cooldown: float = None,
+        max_trips: int = None,
+    ):
+        self.threshold = ec.BREAKER_FAILURE_RATE if threshold is None else threshold
+        self.cooldown = ec.BREAKER_COOLDOWN_SECONDS if cooldown is None else cooldown
+        self.max_trips = ec.BREAKER_MAX_TRIPS if max_trips is None else max_trips
+        self._outcomes: deque[bool] = deque(maxlen=max(self.MIN_SAMPLES, window or ec.BREAKER_WINDOW))
+        self._paused_until = 0.0
+        self._state = "closed"  # or "open", or "probing"
+        self.trips = 0
+        #: Bumped each time the breaker opens.
+        self.generation = 0
+        #: Why the run should stop, once it should.
+        self.abort_reason: str | None = None
+
+    @property
+    def state(self) -> str:
+        return self._state
+
+    def hold(self) -> float:
+        """Seconds until new requests may start; 0 means go."""
+        remaining = self._paused_until - time.monotonic()
+        if remaining > 0:
+            return remaining
+        if self._state == "open":
+            self._state = "probing"
+            log.info("Sending one request to see whether the engine has recovered")
+        return 0.0
+
+    def limit(self, limit: int) -> int:
+        return 1 if self._state == "probing" else limit
+
+    def _stale(self, generation: int | None) -> bool:
+        return generation is not None and generation < self.generation
+
+    def on_success(self, generation: int = None) -> None:
+        if self._state == "open" or self._stale(generation):
+            return  # launched before the breaker opened; says nothing new
+        if self._state == "probing":
+            log.info("The engine is answering again; resuming")
+            self._state = "closed"
+            self.trips = 0
+            self._outcomes.clear()
+        self._outcomes.append(True)
+
+    def on_failure(self, verdict: ErrorClass, error: BaseException, backoff: float, generation: int = None) -> None:
+        if verdict.kind is ErrorKind.FATAL:
+            self.abort_reason = f"{type(error).__name__}: {error}"
+            return
+        if self._state == "open" or self._stale(generation):
+            return
+        if verdict.kind is ErrorKind.THROTTLED:
+            delay = verdict.retry_after if verdict.retry_after is not None else backoff
+            if time.monotonic() + delay > self._paused_until:
+                log.warning(f"The engine is throttling requests; pausing all of them for {delay:.1f}s")
+                self._paused_until = time.monotonic() + delay
+        self._outcomes.append(False)
+        failed = self._outcomes.count(False)
+        if self._state == "probing":
+            self._trip("the probe request failed too")
+        elif len(self._outcomes) >= self.MIN_SAMPLES and failed / len(self._outcomes) >= self.threshold:
+            self._trip(f"{failed} of the last {len(self._outcomes)} requests failed")
+
+    def _trip(self, reason: str) -> None:
+        self.trips += 1
+        self._outcomes.clear()
+        if self.trips > self.max_trips:
+            self.abort_reason = f"{reason}, and the engine has not recovered after {self.max_trips} pause(s)"
+            return
+        pause = self.cooldown * 2 ** (self.trips - 1)
+        log.warning(f"{reason}; pausing all requests for {pause:.0f}s")
+        self._state = "open"
+        self.generation += 1
+        self._paused_until = max(self._paused_until, time.monotonic() + pause)
+
+
+class TokenBucket:
+    """``rate_per_minute`` tokens a minute, paced rather than spent in bursts.
+
+    The bucket holds about a second's worth, so a run spreads its requests
+    evenly instead of spending a minute's quota at once and being throttled. A
+    take larger than the bucket (a long utterance against a characters-per-minute
+    quota) is allowed once the bucket is full and leaves it in debt, which the
+    next takes wait out — the average stays at the rate either way.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: float = None):
+        self.rate = rate_per_minute / 60.0  # tokens per second
+        self.capacity = max(1.0, capacity if capacity is not None else self.rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def delay_for(self, amount: float) -> float:
+        """Seconds until ``amount`` may be taken; 0 if it may be taken now."""
+        self._refill()
+        shortfall = min(amount, self.capacity) - self._tokens
+        return max(0.0, shortfall / self.rate)
+
+    def take(self, amount: float) -> None:
+        self._refill()
+        self._tokens -= amount
+
+
+class RateLimiter:
+    """Paces requests to an engine's requests- and characters-per-minute quotas.
+
+    Engines declare ``requests_per_minute`` and ``chars_per_minute`` (None or 0
+    for no quota). Waiters are served in arrival order, so pacing never reorders
+    the book. Each caller reserves its tokens up front and then sleeps off the
+    debt, so one limiter can pace runs on several event loops at once (the
+    engine's shared budget holds it).
+    """
+
+    def __init__(self, requests_per_minute: float = None, chars_per_minute: float = None):
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.chars = TokenBucket(chars_per_minute) if chars_per_minute else None
+        self._lock = threading.Lock()
+        #: Total seconds spent waiting for quota.
+        self.waited = 0.0
+
+    @classmethod
+    def for_engine(cls, engine) -> RateLimiter | None:
+        """The engine's limiter, or None when it declares no quotas."""
+        rpm = getattr(engine, "requests_per_minute", None)
+        cpm = getattr(engine, "chars_per_minute", None)
+        return cls(rpm, cpm) if rpm or cpm else None
+
+    def describe(self) -> str:
+        bits = []
+        if self.requests:
+            bits.append(f"{self.requests.rate * 60:g} requests")
+        if self.chars:
+            bits.append(f"{self.chars.rate * 60:g} characters")
+        return " and ".join(bits) + " a minute"
+
+    async def acquire(self, chars: int) -> float:
+        """Wait until one request of ``chars`` characters fits both quotas; return the seconds waited."""
+        with self._lock:
+            delay = max(
+                self.requests.delay_for(1) if self.requests else 0.0,
+                self.chars.delay_for(chars) if self.chars else 0.0,
+            )
+            if self.requests:
+                self.requests.take(1)
+            if self.chars:
+                self.chars.take(chars)
+            self.waited += delay
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
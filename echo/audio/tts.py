@@ -4,26 +4,78 @@ What changed here, beyond becoming engine-agnostic:
 
 * **Retry.** Every engine fails transiently — edge-tts's unofficial endpoint
   returns websocket 403s, cloud engines rate-limit. Each utterance gets several
-  attempts with backoff.
+  attempts with backoff, waiting in a retry queue rather than in a concurrency
+  slot. Engines classify their errors, though: a fatal one (bad credentials)
+  stops the run, a throttled one pauses every request, and a run-wide circuit
+  breaker pauses or stops when failures pile up.
 * **Resume.** Chunk files are keyed by index and kept until assembly succeeds, so
-  a re-run skips everything already on disk instead of re-synthesizing a book.
+  a re-run skips everything already on disk instead of re-synthesizing a book. A
+  manifest (:mod:`echo.audio.manifest`) records what each chunk holds, so resuming
+  needs no file parsing, and a chunk whose text changed is redone.
 * **No partial success.** ``asyncio.gather`` used to run without
   ``return_exceptions``, so one failure anywhere aborted the run; now every
   utterance is attempted and the summary names what failed, rather than a
   half-finished book being silently assembled.
+* **Bounded scheduling.** Work is fed from an iterator into a bounded window of
+  in-flight tasks, instead of one coroutine per utterance handed to ``gather``,
+  so memory stays flat however long the book is. The window's size adapts to the
+  engine (:mod:`echo.audio.throttle`), growing while requests succeed and
+  shrinking on errors, and dispatch is paced to any per-minute quotas the
+  engine declares. Both are shared with every other run on the engine in the
+  process (:mod:`echo.audio.engines.budget`).
+* **Bisect on failure.** An utterance that fails every attempt is split at the
+  sentence nearest its middle and synthesized in pieces, which are joined back
+  into its slot — most persistent failures are about length.
+* **Deadlines.** A request gets a deadline scaled to its length, and streaming
+  engines a no-audio watchdog, so a hung websocket becomes a retryable failure
+  rather than a conversion that never finishes.
+* **Cache.** Chunk files go when the book is assembled, but every synthesized
+  utterance is also kept in a content-addressed cache
+  (:mod:`echo.audio.cache`), so re-rendering or converting a second edition
+  only pays for text that is new. Within a book, an utterance repeated with the
+  same voice is synthesized once and its audio shared.
 """
 
 from __future__ import annotations
 
 import asyncio
+import contextlib
+import heapq
 import logging
+import os
+import shutil
+import sys
 import time
+import uuid
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable, Iterator
+from dataclasses import dataclass, field
 from pathlib import Path
 
 import echo.constants as ec
-from echo.audio.engines import EngineUnavailable, SpeechEngine, get_engine
-from echo.document import Script, Segment, Utterance
+from echo.audio.cache import SynthesisCache, default_cache, synthesis_key
+from echo.audio.engines import (
+    BudgetShare,
+    EngineTimeout,
+    EngineUnavailable,
+    ErrorKind,
+    SpeechEngine,
+    classify_error,
+    close_connections,
+    engine_budget,
+    get_engine,
+    open_connections,
+)
+from echo.audio.history import EngineHistory, default_history
+from echo.audio.lease import ChunkLeases, script_fingerprint
+from echo.audio.manifest import ChunkManifest
+from echo.audio.quota import QuotaLedger
+from echo.audio.throttle import AimdController, CircuitBreaker, Hedger, RateLimiter
+from echo.audio.writer import watch_loop_lag
+from echo.cancel import Cancelled, CancelToken, run_sync
+from echo.cancel import scope as cancel_scope
+from echo.document import Script, Segment, Timing, Utterance
 from echo.normalize import build_script
+from echo.progress import ProgressCallback, SynthesisProgress, default_progress
 
 log = logging.getLogger(__name__)
 
@@ -41,6 +93,47 @@ def _segment_path(chunks_dir: Path, index: int, suffix: str) -> Path:
     return chunks_dir / f"chunk_{index:05d}{suffix}"
 
 
+def _part_path(path: Path, tag: str = "part") -> Path:
+    """Where a chunk is written before it is known to be complete.
+
+    The container suffix stays last, so the engine and duration readers still
+    recognise the file. A hedged request uses its own ``tag`` so the two copies
+    never share a file.
+    """
+    return path.with_name(f"{path.stem}.{tag}{path.suffix}")
+
+
+def _share(source: Path, path: Path) -> None:
+    """Give a repeated utterance its own chunk file holding ``source``'s audio.
+
+    Hard-linked where the filesystem allows: chunk files are only ever replaced,
+    never written in place, so the two names can safely share an inode. The link
+    or copy is made under a name of its own and renamed over ``path``, so a
+    reader never finds ``path`` missing or half-copied.
+    """
+    part = _part_path(path, f"share-{uuid.uuid4().hex[:8]}")
+    try:
+        try:
+            os.link(source, part)
+        except OSError:
+            shutil.copyfile(source, part)
+        os.replace(part, path)
+    except BaseException:
+        part.unlink(missing_ok=True)
+        raise
+
+
+def _deadline_for(utterance: Utterance) -> float | None:
+    """How long one request for ``utterance`` may take, or None for no limit.
+
+    Scaled to the text: a one-line heading that takes a minute is hung, an
+    8,000-character chunk may not be.
+    """
+    if ec.CHUNK_DEADLINE_SECONDS <= 0:
+        return None
+    return ec.CHUNK_DEADLINE_SECONDS + len(utterance) * ec.CHUNK_DEADLINE_PER_CHAR
+
+
 def _usable(path: Path) -> int:
     """Duration of an existing chunk in ms, or 0 if it isn't usable."""
     from echo.audio.assemble import audio_duration_ms  # noqa: PLC0415 (avoids a cycle)
@@ -53,36 +146,336 @@ def _usable(path: Path) -> int:
         return 0
 
 
+@dataclass(slots=True)
+class RunStats:
+    """What one :func:`synthesize_script` call did, for its summary and callers."""
+
+    chunks: int = 0
+    resumed: int = 0
+    cache_hits: int = 0
+    synthesized: int = 0
+    retries: int = 0
+    failed: int = 0
+    #: Indices that needed a hedge, and how many of those the hedge won.
+    hedged: list[int] = field(default_factory=list)
+    hedges_won: int = 0
+    #: Indices that kept failing and were split into smaller requests.
+    bisected: list[int] = field(default_factory=list)
+    #: Chunks that repeat another's text and voice, so share its audio.
+    repeats: int = 0
+    #: Seconds spent waiting for per-minute quota.
+    rate_waited: float = 0.0
+    #: Seconds requests spent waiting for a slot other conversions were using.
+    budget_waited: float = 0.0
+    concurrency: str = ""
+
+    def summary(self) -> str:
+        parts = [f"{self.synthesized} synthesized"]
+        if self.resumed:
+            parts.append(f"{self.resumed} resumed")
+        if self.cache_hits:
+            parts.append(f"{self.cache_hits} from the synthesis cache")
+        if self.repeats:
+            parts.append(f"{self.repeats} repeat(s) of another chunk")
+        if self.retries:
+            parts.append(f"{self.retries} retried attempt(s)")
+        if self.hedged:
+            parts.append(f"{len(self.hedged)} hedged ({self.hedges_won} won by the hedge)")
+        if self.bisected:
+            parts.append(f"{len(self.bisected)} split into smaller requests")
+        if self.failed:
+            parts.append(f"{self.failed} failed")
+        if self.rate_waited >= 1:
+            parts.append(f"{self.rate_waited:.0f}s paced to quota")
+        if self.budget_waited >= 1:
+            parts.append(f"{self.budget_waited:.0f}s waiting for a shared engine slot")
+        concurrency = f"; {self.concurrency}" if self.concurrency else ""
+        return f"{self.chunks} chunk(s): " + ", ".join(parts) + concurrency
+
+
+@dataclass(slots=True)
+class _Run:
+    """What every attempt in one synthesis run shares."""
+
+    engine: SpeechEngine
+    speed: float
+    controller: AimdController
+    stats: RunStats
+    cache: SynthesisCache | None = None
+    hedger: Hedger | None = None
+    limiter: RateLimiter | None = None
+    ledger: QuotaLedger | None = None
+    history: EngineHistory | None = None
+    budget: BudgetShare | None = None
+
+
 async def _synthesize_one(
-    engine: SpeechEngine,
+    run: _Run,
     index: int,
     utterance: Utterance,
     voice: str,
-    speed: float,
-    path: Path,
-    attempts: int,
-    backoff: float,
+    part: Path,
+    key: str,
+    attempt: int = 1,
+    hedge: bool = False,
+    sent: asyncio.Event = None,
 ) -> Segment:
-    last_error: Exception | None = None
-    for attempt in range(1, attempts + 1):
+    """One attempt at chunk ``index``, from the cache or the engine, into ``part``.
+
+    ``sent`` is set once the request has its budget slot and quota and goes to
+    the engine; the hedger times a straggler from then.
+
+    Retrying is the scheduler's job, not this function's: a failed attempt raises
+    straight away so its concurrency slot is free while the backoff runs. The
+    caller renames ``part`` into place once it has chosen this attempt's audio, so
+    a chunk at its final path is always a complete one.
+    """
+    # Only a first attempt can hit: a retry follows an engine call that missed.
+    # The cache copies audio and writes its index, so it works off the loop.
+    if run.cache is not None and attempt == 1 and (hit := await asyncio.to_thread(run.cache.get, key, part)):
+        run.stats.cache_hits += 1
+        return Segment(index=index, path=part, duration_ms=hit.duration_ms, timings=hit.timings)
+
+    # A slot in the engine's process-wide budget, then quota: both before the
+    # clock starts, since waiting on them is not the engine being slow. A hedge
+    # takes no slot: it would wait on the very straggler it is racing.
+    budgeted = run.budget is not None and not hedge
+    async with run.budget.slot() if budgeted else contextlib.nullcontext():
+        if run.limiter is not None:
+            run.stats.rate_waited += await run.limiter.acquire(len(utterance))
+        if sent is not None:
+            sent.set()
+        started = time.perf_counter()
+        deadline = _deadline_for(utterance)
         try:
-            result = await engine.synthesize(utterance.text, utterance.voice or voice, speed, path)
-            duration = result.duration_ms or _usable(path)
+            try:
+                async with asyncio.timeout(deadline):
+                    result = await run.engine.synthesize(utterance.text, voice, run.speed, part)
+            except TimeoutError as ex:
+                if isinstance(ex, EngineTimeout):
+                    raise
+                raise EngineTimeout(f"chunk {index} got no response within {deadline:.0f}s") from ex
+            duration = result.duration_ms or _usable(part)
             if not duration:
                 raise EngineUnavailable(f"chunk {index} was written but contains no audio")
-            return Segment(index=index, path=path, duration_ms=duration, timings=result.timings)
+        except asyncio.CancelledError:
+            part.unlink(missing_ok=True)
+            raise
         except Exception as ex:
-            last_error = ex
-            path.unlink(missing_ok=True)
-            if attempt < attempts:
-                delay = backoff * (2 ** (attempt - 1))
-                log.warning(
-                    f"Chunk {index} failed on attempt {attempt}/{attempts} "
-                    f"({type(ex).__name__}: {str(ex)[:120]}); retrying in {delay:.1f}s"
+            part.unlink(missing_ok=True)
+            if run.history is not None:
+                run.history.record(
+                    run.engine.name,
+                    voice,
+                    len(utterance),
+                    None,
+                    None,
+                    attempt,
+                    f"{type(ex).__name__}: {str(ex)[:200]}",
+                    run.controller.limit,
                 )
-                await asyncio.sleep(delay)
+            run.controller.on_error()
+            raise
+        latency = time.perf_counter() - started
+
+    if run.history is not None:
+        run.history.record(
+            run.engine.name, voice, len(utterance), latency, duration, attempt, None, run.controller.limit
+        )
+    if run.history is not None and run.history.due:
+        await asyncio.to_thread(run.history.flush)
+    run.controller.on_success(latency, len(utterance))
+    if run.hedger is not None:
+        run.hedger.on_success(latency, len(utterance))
+    if run.cache is not None:
+        await asyncio.to_thread(run.cache.put, key, part, duration, result.timings)
+    if run.ledger is not None:
+        run.ledger.record(run.engine.name, run.engine.voice_class(voice), len(utterance))
+        if run.ledger.due:
+            await asyncio.to_thread(run.ledger.flush)
+    run.stats.synthesized += 1
+    return Segment(index=index, path=part, duration_ms=duration, timings=result.timings)
+
+
+#: A unit of scheduled work: ``(index,)`` for a whole chunk, or ``(index, 0, 1)``
+#: for a piece of one that was split in two, and then in two again.
+Job = tuple[int, ...]
+#: Called with a chapter's index and its segments once it is fully synthesized.
+ChapterCallback = Callable[[int, list[Segment]], None]
+#: Called with each segment, in reading order, once it and all before it are done.
+SegmentCallback = Callable[[Segment], None]
+
+
+class ReadAhead:
+    """How far synthesis may run past a consumer that takes segments in order.
 
-    raise SynthesisError(f"chunk {index} failed after {attempts} attempts: {last_error}") from last_error
+    Chunk ``i`` is not started until the consumer has taken ``i - chunks``
+    segments; :func:`synthesize_stream` advances it as each one is taken. Chunks
+    already started, and retries of them, are not held back.
+    """
+
+    def __init__(self, chunks: int):
+        self.chunks = max(1, chunks)
+        self.taken = 0
+        self.moved = asyncio.Event()
+
+    def bound(self) -> int:
+        return self.taken + self.chunks
+
+    def advance(self) -> None:
+        self.taken += 1
+        self.moved.set()
+
+
+class _Scheduler:
+    """A bounded window of in-flight tasks, fed from fresh work and a retry queue.
+
+    Tasks are created only as slots free up, so a 20,000-utterance book costs
+    ``limit()`` coroutines at a time rather than 20,000 up front. ``limit`` is
+    asked afresh before each launch, so a lowered limit takes effect as in-flight
+    work drains.
+
+    A failed attempt hands its slot straight back: its retry waits in a delay
+    queue rather than in a sleeping task, so healthy chunks keep flowing through
+    an error burst. Retries that have come due go ahead of fresh work, which is
+    taken in reading order, so chapters finish roughly front to back. Retries
+    among themselves go oldest first: ordering them by position too would spend
+    an outage's failures on whichever chunk comes first.
+
+    Fresh work at or past ``bound()`` waits until ``wake`` is set: that is how a
+    streaming consumer keeps synthesis from running too far ahead of it.
+    """
+
+    def __init__(
+        self,
+        work: Callable[[Job], Awaitable[Segment]],
+        limit: Callable[[], int],
+        hold: Callable[[], float] = lambda: 0.0,
+        bound: Callable[[], int] = lambda: sys.maxsize,
+        wake: asyncio.Event = None,
+    ):
+        self._work = work
+        self._limit = limit
+        self._hold = hold
+        self._bound = bound
+        self._retries: list[tuple[float, Job]] = []  # heap of (due, job)
+        self._ahead: Job | None = None  # the next fresh job, peeked
+        self.in_flight: dict[asyncio.Task, Job] = {}
+        self.wake = wake or asyncio.Event()
+
+    def retry_later(self, job: Job, delay: float = 0.0) -> None:
+        heapq.heappush(self._retries, (time.monotonic() + delay, job))
+
+    def _gated(self) -> bool:
+        return self._ahead is not None and self._ahead[0] >= self._bound()
+
+    def _next(self, fresh: Iterator[Job]) -> Job | None:
+        if self._retries and self._retries[0][0] <= time.monotonic():
+            return heapq.heappop(self._retries)[1]
+        if self._ahead is None or self._gated():
+            return None
+        job, self._ahead = self._ahead, next(fresh, None)
+        return job
+
+    async def run(self, jobs: Iterable[Job]) -> AsyncIterator[tuple[Job, Segment | Exception]]:
+        """Yield ``(job, segment or exception)`` as each attempt finishes.
+
+        While ``hold()`` is positive nothing new starts, though what is already in
+        flight finishes. Anything still running when the caller stops iterating is
+        cancelled.
+        """
+        fresh = iter(jobs)
+        self._ahead = next(fresh, None)
+        woken: asyncio.Task | None = None
+        try:
+            while True:
+                self.wake.clear()
+                held = self._hold()
+                while not held and len(self.in_flight) < self._limit() and (job := self._next(fresh)) is not None:
+                    self.in_flight[asyncio.create_task(self._work(job))] = job
+                if not self.in_flight and not self._retries and self._ahead is None:
+                    return
+                # While held, nothing starts however due a retry is, so wait out the
+                # hold. Otherwise a retry's due time only matters if there is a slot
+                # for it: with the window full, a retry already due would spin.
+                if held:
+                    wait = held
+                elif self._retries and len(self.in_flight) < self._limit():
+                    wait = max(0.0, self._retries[0][0] - time.monotonic())
+                else:
+                    wait = None
+                waiting_on = set(self.in_flight)
+                if not held and self._gated():
+                    woken = asyncio.create_task(self.wake.wait())
+                    waiting_on.add(woken)
+                if not waiting_on:
+                    await asyncio.sleep(wait or 0)
+                    continue
+                done, _ = await asyncio.wait(waiting_on, timeout=wait, return_when=asyncio.FIRST_COMPLETED)
+                if woken is not None:
+                    woken.cancel()
+                    woken = None
+                for task in done:
+                    if (job := self.in_flight.pop(task, None)) is not None:
+                        yield job, task.exception() or task.result()
+        finally:
+            if woken is not None:
+                woken.cancel()
+            for task in self.in_flight:
+                task.cancel()
+            if self.in_flight:
+                await asyncio.gather(*self.in_flight, return_exceptions=True)
+
+
+def _bisect_text(text: str) -> tuple[str, str] | None:
+    """Split ``text`` at the sentence boundary nearest its middle, if it has one."""
+    text = text.strip()
+    boundaries = list(ec.SENTENCES.finditer(text))
+    if not boundaries:
+        return None
+    middle = min(boundaries, key=lambda m: abs(m.start() - len(text) / 2))
+    return text[: middle.start()], text[middle.end() :]
+
+
+def _job_path(chunks_dir: Path, job: Job, suffix: str) -> Path:
+    """``chunk_00012.wav`` for a whole chunk, ``chunk_00012.b01.wav`` for a piece."""
+    path = _segment_path(chunks_dir, job[0], suffix)
+    if len(job) == 1:
+        return path
+    return path.with_name(f"{path.stem}.b{''.join(map(str, job[1:]))}{suffix}")
+
+
+class _JoinFailed(Exception):
+    """Joining the pieces of split chunk ``job`` failed; ``cause`` says why."""
+
+    def __init__(self, job: Job, cause: Exception):
+        super().__init__(str(cause))
+        self.job = job
+        self.cause = cause
+
+
+async def _join_pieces(first: Segment, second: Segment, path: Path) -> Segment:
+    """Join two halves of a split chunk into one file at ``path``.
+
+    Joined beside ``path`` and renamed over it, like any other chunk: ``path``
+    may be a hard link shared with a repeat, and a crash mid-join must not leave
+    a torn chunk for a resume to accept. The join reads and writes whole files,
+    or runs ffmpeg, so it happens off the event loop.
+    """
+    from echo.audio.assemble import join_chunks  # noqa: PLC0415
+
+    part = _part_path(path, "join")
+    try:
+        await asyncio.to_thread(join_chunks, [first.path, second.path], part)
+        os.replace(part, path)
+    except BaseException:
+        part.unlink(missing_ok=True)
+        raise
+    offset = first.duration_ms
+    timings = first.timings + [Timing(t.start_ms + offset, t.end_ms + offset, t.text) for t in second.timings]
+    first.path.unlink(missing_ok=True)
+    second.path.unlink(missing_ok=True)
+    return Segment(index=first.index, path=path, duration_ms=first.duration_ms + second.duration_ms, timings=timings)
 
 
 async def synthesize_script(
@@ -92,8 +485,54 @@ async def synthesize_script(
     speed: float = None,
     chunks_dir: Path = None,
     resume: bool = True,
+    cache: SynthesisCache = None,
+    hedge: bool = None,
+    stats: RunStats = None,
+    ledger: QuotaLedger = None,
+    cancel: CancelToken = None,
+    progress: ProgressCallback = None,
+    on_chapter: ChapterCallback = None,
+    shared: bool = False,
+    wait_for_others: bool = True,
+    on_segment: SegmentCallback = None,
+    read_ahead: ReadAhead = None,
+    history: EngineHistory = None,
 ) -> list[Segment]:
-    """Synthesize every utterance in ``script``, returning segments in order."""
+    """Synthesize every utterance in ``script``, returning segments in order.
+
+    ``cache`` is consulted before each engine request and fed after it; pass
+    :func:`~echo.audio.cache.default_cache` for the shared one, or None to go
+    straight to the engine. ``hedge`` duplicates straggling requests (default
+    ``HEDGE_REQUESTS``). Pass a :class:`RunStats` as ``stats`` to have it filled in,
+    and a :class:`~echo.audio.quota.QuotaLedger` as ``ledger`` to record the
+    characters each engine request sends. Each request is recorded in
+    ``history`` (:mod:`echo.audio.history`), whose record of earlier runs sets
+    the starting concurrency, latency baseline, hedging threshold and ETA.
+    Requests hold slots in the engine's process-wide budget
+    (:func:`~echo.audio.engines.engine_budget`), so conversions running at once
+    share its concurrency and quotas fairly instead of each taking them whole.
+    Cancelling ``cancel`` stops in-flight
+    requests and raises :class:`~echo.cancel.Cancelled`, keeping finished chunks.
+    ``progress`` is called with a :class:`~echo.progress.ProgressEvent` as each
+    chunk finishes or is retried (default: log each whole percent).
+
+    Work is dispatched in reading order, so chapters finish roughly front to
+    back; ``on_chapter`` is called with a chapter's index and its segments as
+    soon as it and every chapter before it are complete — including, at the
+    start, chapters resumed from disk — so chapter 1 can be encoded or played
+    while the rest of the book is still being synthesized. ``on_segment`` is the
+    same for single segments, and ``read_ahead`` keeps synthesis within so many
+    chunks of whoever is taking them; :func:`synthesize_stream` uses both, and
+    a chunk that fails for good stops such a run, as nothing past it could be
+    handed over.
+
+    With ``shared``, other processes may be working on the same ``chunks_dir``:
+    each chunk is claimed through a lease (:mod:`echo.audio.lease`) before it is
+    synthesized, and chunks others hold are left to them. Once its own share is
+    done, the process waits for the rest and returns the whole book — or, with
+    ``wait_for_others=False``, returns just what is finished so far. A chunk
+    whose process stops is taken over.
+    """
     engine = engine or get_engine()
     engine.check_available()
     voice = voice or engine.default_voice()
@@ -104,81 +543,508 @@ async def synthesize_script(
     chunks_dir.mkdir(parents=True, exist_ok=True)
 
     utterances = script.utterances()
-    total_chars = max(1, script.char_count)
     segments: list[Segment | None] = [None] * len(utterances)
+    stats = stats if stats is not None else RunStats()
+    stats.chunks = len(utterances)
+    hedge = ec.HEDGE_REQUESTS if hedge is None else hedge
+
+    voices = [u.voice or voice for u in utterances]
+    keys = [synthesis_key(engine, v, engine_speed, u.text) for u, v in zip(utterances, voices, strict=True)]
+    manifest = ChunkManifest(chunks_dir)
+    # Sharing is resuming: what other processes have finished is reused.
+    resume = resume or shared
+    # Chunks left by a version of echo that kept no manifest can only be checked
+    # the slow way, by reading each file's duration.
+    legacy = resume and not manifest.exists
+    if resume:
+        manifest.load()
 
     reused = 0
     todo: list[int] = []
     for i in range(len(utterances)):
         path = _segment_path(chunks_dir, i, engine.audio_suffix)
-        duration = _usable(path) if resume else 0
-        if duration:
+        if resume and (entry := manifest.lookup(i, keys[i], path)):
+            segments[i] = Segment(index=i, path=path, duration_ms=entry.duration_ms, timings=entry.timings)
+            reused += 1
+        elif legacy and (duration := _usable(path)):
             segments[i] = Segment(index=i, path=path, duration_ms=duration)
+            manifest.record(i, keys[i], path, duration)
             reused += 1
         else:
             todo.append(i)
 
+    def place(index: int, segment: Segment) -> None:
+        segments[index] = segment
+        manifest.record(index, keys[index], segment.path, segment.duration_ms, segment.timings)
+
+    def place_repeat(index: int, of: Segment) -> None:
+        path = _segment_path(chunks_dir, index, engine.audio_suffix)
+        _share(of.path, path)
+        place(index, Segment(index=index, path=path, duration_ms=of.duration_ms, timings=list(of.timings)))
+        stats.repeats += 1
+
+    # Repeated headings, refrains and boilerplate come out as identical text: each
+    # (text, voice) is synthesized once, and its repeats get a copy of the audio —
+    # at once if it is already on disk, otherwise as soon as it is.
+    done_by_key = {keys[i]: segments[i] for i in reversed(range(len(utterances))) if segments[i] is not None}
+    first_of: dict[str, int] = {}
+    repeats: dict[int, list[int]] = {}
+    unique: list[int] = []
+    for i in todo:
+        if keys[i] in done_by_key:
+            place_repeat(i, done_by_key[keys[i]])
+        elif keys[i] in first_of:
+            repeats[first_of[keys[i]]].append(i)
+        else:
+            first_of[keys[i]] = i
+            repeats[i] = []
+            unique.append(i)
+    todo = unique
+
+    stats.resumed = reused
+    prior = await asyncio.to_thread(history.prior, engine.name, voice) if history is not None else None
+    tracker = SynthesisProgress(
+        progress or default_progress(),
+        len(utterances),
+        script.char_count,
+        chapters_total=len(script.chapters),
+        prior_rate=prior.chars_per_second if prior is not None else None,
+    )
+    tracker.resumed(
+        sum(s is not None for s in segments),
+        sum(len(utterances[i]) for i in range(len(utterances)) if segments[i] is not None),
+    )
     if reused:
         log.info(f"Resuming: {reused} of {len(utterances)} chunk(s) already synthesized in {chunks_dir}")
+
+    chapter_at = [c for c, chapter in enumerate(script.chapters) for _ in chapter.utterances]
+    starts = [0]
+    for chapter in script.chapters:
+        starts.append(starts[-1] + len(chapter.utterances))
+    missing = [sum(segments[i] is None for i in range(starts[c], starts[c + 1])) for c in range(len(script.chapters))]
+    next_chapter = 0
+    next_segment = 0
+
+    def release_chapters(log_it: bool = True) -> None:
+        """Hand over, in reading order, every segment and chapter that has become complete."""
+        nonlocal next_chapter, next_segment
+        while on_segment is not None and next_segment < len(segments) and segments[next_segment] is not None:
+            on_segment(segments[next_segment])
+            next_segment += 1
+        while next_chapter < len(missing) and not missing[next_chapter]:
+            chapter_segments = segments[starts[next_chapter] : starts[next_chapter + 1]]
+            tracker.chapters_done += 1
+            if log_it:
+                log.info(f"Chapter {next_chapter + 1} of {len(missing)} is synthesized")
+            if on_chapter is not None:
+                on_chapter(next_chapter, chapter_segments)
+            next_chapter += 1
+
+    release_chapters(log_it=False)  # those resumed whole
+    tracker.emit()
     if not todo:
-        log.info("Progress Report: 100%")
         return [s for s in segments if s is not None]
+    leases = ChunkLeases(chunks_dir) if shared else None
 
+    controller = AimdController.for_engine(engine, prior)
+    if prior is not None:
+        log.debug(
+            f"History for {engine.name}: {prior.seconds_per_char * 1000:.2f} ms/char, "
+            f"clean up to {prior.concurrency or '?'} in flight, about {prior.chars_per_second:,.0f} chars/s"
+        )
     log.info(
-        f"Synthesizing {len(todo)} chunk(s) with {engine.label}, voice '{voice}', "
-        f"speed {speed}x, up to {engine.max_concurrency} at a time"
+        f"Synthesizing {len(todo)} chunk(s) with {engine.label}, voice '{voice}', speed {speed}x, "
+        + (
+            f"{controller.limit} at a time (adapting between {controller.floor} and {controller.ceiling})"
+            if controller.adaptive
+            else f"up to {controller.limit} at a time"
+        )
     )
     if not engine.supports_speed and abs(speed - 1.0) > 0.001:
         log.info(f"{engine.label} has no rate control; {speed}x will be applied when the audio is joined")
 
-    semaphore = asyncio.Semaphore(max(1, engine.max_concurrency))
-    done_chars = sum(len(utterances[i]) for i in range(len(utterances)) if segments[i] is not None)
-    progress_lock = asyncio.Lock()
-
-    async def worker(index: int) -> Segment:
-        nonlocal done_chars
-        async with semaphore:
-            segment = await _synthesize_one(
-                engine,
-                index,
-                utterances[index],
-                voice,
-                engine_speed,
-                _segment_path(chunks_dir, index, engine.audio_suffix),
-                ec.MAX_RETRIES,
-                ec.RETRY_BACKOFF_SECONDS,
-            )
-        async with progress_lock:
-            done_chars += len(utterances[index])
-            # The GUI parses this exact string into its progress bar.
-            log.info(f"Progress Report: {done_chars / total_chars:.0%}")
+    budget = engine_budget(engine).share() if ec.SHARED_ENGINE_BUDGET else None
+    if budget is not None and budget.others():
+        log.info(
+            f"Sharing {engine.label}'s {budget.budget.slots} request slot(s) "
+            f"with {budget.others()} other conversion(s) in this process"
+        )
+    limiter = budget.limiter if budget is not None else RateLimiter.for_engine(engine)
+    if limiter is not None:
+        log.info(f"Pacing requests to {limiter.describe()}")
+    run = _Run(
+        engine,
+        engine_speed,
+        controller,
+        stats,
+        cache=cache,
+        hedger=Hedger() if hedge else None,
+        limiter=limiter,
+        ledger=ledger,
+        history=history,
+        budget=budget,
+    )
+    if run.hedger is not None and prior is not None:
+        run.hedger.seed(prior.samples)
+    attempts: dict[Job, int] = {}
+    #: The breaker generation each job's latest attempt started under.
+    generations: dict[Job, int] = {}
+    #: The text of each piece of a chunk that had to be split.
+    pieces: dict[Job, Utterance] = {}
+    #: Finished pieces waiting for their other half.
+    halves: dict[Job, Segment] = {}
+    #: Seconds each chunk's latest request took, for progress events.
+    latencies: dict[int, float] = {}
+
+    def utterance_of(job: Job) -> Utterance:
+        return pieces[job] if len(job) > 1 else utterances[job[0]]
+
+    async def worker(job: Job) -> Segment:
+        index = job[0]
+        attempt = attempts[job] = attempts.get(job, 0) + 1
+        generations[job] = breaker.generation
+        utterance = utterance_of(job)
+        key = keys[index] if len(job) == 1 else synthesis_key(engine, voices[index], engine_speed, utterance.text)
+        path = _job_path(chunks_dir, job, engine.audio_suffix)
+        started = time.monotonic()
+
+        def one(tag: str, sent: asyncio.Event = None) -> Awaitable[Segment]:
+            # Numbered per attempt: a thread-backed engine abandoned at its deadline
+            # may still write its file later, and must not write into a retry's.
+            part = _part_path(path, f"{tag}{attempt}")
+            return _synthesize_one(run, index, utterance, voices[index], part, key, attempt, tag == "hedge", sent)
+
+        if run.hedger is None:
+            segment = await one("part")
+        else:
+            segment, hedged = await run.hedger.race(one, len(utterance))
+            if hedged:
+                stats.hedged.append(index)
+                stats.hedges_won += segment.path.name.endswith(f".hedge{attempt}{path.suffix}")
+        os.replace(segment.path, path)
+        segment.path = path
+        latencies[index] = time.monotonic() - started
         return segment
 
-    results = await asyncio.gather(*(worker(i) for i in todo), return_exceptions=True)
+    async def settle(job: Job, segment: Segment) -> Segment | None:
+        """Fold a finished piece into its parent once both halves are in.
 
+        A join that fails raises :class:`_JoinFailed` for the parent, which then
+        goes through :func:`on_failure` like any failed attempt.
+        """
+        while len(job) > 1:
+            halves[job] = segment
+            parent = job[:-1]
+            if parent + (0,) not in halves or parent + (1,) not in halves:
+                return None
+            try:
+                segment = await _join_pieces(
+                    halves.pop(parent + (0,)),
+                    halves.pop(parent + (1,)),
+                    _job_path(chunks_dir, parent, engine.audio_suffix),
+                )
+            except Exception as ex:
+                raise _JoinFailed(parent, ex) from ex
+            job = parent
+        if len(job) == 1 and job[0] in stats.bisected and cache is not None:
+            await asyncio.to_thread(cache.put, keys[job[0]], segment.path, segment.duration_ms, segment.timings)
+        return segment
+
+    breaker = CircuitBreaker()
+    classify = getattr(engine, "classify_error", classify_error)
+    scheduler = _Scheduler(
+        worker,
+        lambda: breaker.limit(controller.limit),
+        breaker.hold,
+        **({"bound": read_ahead.bound, "wake": read_ahead.moved} if read_ahead is not None else {}),
+    )
     failures: list[str] = []
-    for index, result in zip(todo, results, strict=True):
-        if isinstance(result, BaseException):
-            failures.append(f"chunk {index}: {result}")
+
+    def on_failure(job: Job, error: Exception) -> bool:
+        """Retry, split or give up on a failed attempt; False stops the run."""
+        index = job[0]
+        attempt = attempts[job]
+        text = utterance_of(job).text
+        what = f"Chunk {index}" + (f" (piece {''.join(map(str, job[1:]))})" if len(job) > 1 else "")
+        verdict = classify(error)
+        delay = ec.RETRY_BACKOFF_SECONDS * (2 ** (attempt - 1))
+        breaker.on_failure(verdict, error, delay, generations.get(job))
+        if breaker.abort_reason:
+            stats.failed += 1
+            failures.append(f"{what[0].lower()}{what[1:]}: {breaker.abort_reason}")
+            log.error(f"Stopping: {breaker.abort_reason}")
+            return False
+        if verdict.kind is ErrorKind.THROTTLED or breaker.state == "open":
+            # The service's trouble rather than this chunk's, so it costs no
+            # attempt; the breaker bounds how long that can go on.
+            attempts[job] -= 1
+            wait = verdict.retry_after if verdict.kind is ErrorKind.THROTTLED else None
+            scheduler.retry_later(job, max(breaker.hold(), wait if wait is not None else delay))
+            stats.retries += 1
+            tracker.retried(len(scheduler.in_flight))
+        elif attempt < ec.MAX_RETRIES:
+            log.warning(
+                f"{what} failed on attempt {attempt}/{ec.MAX_RETRIES} "
+                f"({type(error).__name__}: {str(error)[:120]}); retrying in {delay:.1f}s"
+            )
+            scheduler.retry_later(job, delay)
+            stats.retries += 1
+            tracker.retried(len(scheduler.in_flight))
+        elif len(job) <= ec.MAX_BISECT_DEPTH and job + (0,) not in pieces and (split := _bisect_text(text)):
+            # Length is the usual culprit — server timeouts, truncation, byte
+            # limits — so spend the next attempts on two smaller requests. Once
+            # per job: if it fails again with its pieces in, joining them failed.
+            log.warning(f"{what} failed {attempt} times at {len(text)} characters; splitting it in two")
+            if index not in stats.bisected:
+                stats.bisected.append(index)
+            for bit, half in enumerate(split):
+                pieces[job + (bit,)] = Utterance(half, voices[index])
+                scheduler.retry_later(job + (bit,))
+        else:
+            if leases is not None:
+                leases.release(index)  # another process may yet manage it
+            also = len(repeats.get(index, ()))
+            stats.failed += 1 + also
+            failures.append(
+                f"{what[0].lower()}{what[1:]} failed after {attempt} attempts: {error}"
+                + (f" (and so did {also} repeat(s) of its text)" if also else "")
+            )
+            if read_ahead is not None:
+                # Whoever takes segments in order would wait for this one forever.
+                return False
+        return True
+
+    def on_chunk(segment: Segment, recorded: bool = False) -> None:
+        """Take in a finished chunk: ours, or (``recorded``) another process's."""
+        index = segment.index
+        if recorded:
+            segments[index] = segment
         else:
-            segments[result.index] = result
+            place(index, segment)
+        if leases is not None:
+            leases.release(index)
+        missing[chapter_at[index]] -= 1
+        copies = repeats.pop(index, [])
+        for repeat in copies:
+            place_repeat(repeat, segment)
+            missing[chapter_at[repeat]] -= 1
+        release_chapters()
+        tracker.chunk_done(
+            len(utterances[index]) * (1 + len(copies)),
+            len(scheduler.in_flight),
+            latencies.pop(index, None),
+            chunks=1 + len(copies),
+        )
+
+    def finished_elsewhere(index: int) -> Segment | None:
+        path = _segment_path(chunks_dir, index, engine.audio_suffix)
+        if entry := manifest.lookup(index, keys[index], path):
+            return Segment(index=index, path=path, duration_ms=entry.duration_ms, timings=entry.timings)
+        return None
+
+    def claimed(indices: list[int], elsewhere: list[int]) -> Iterator[Job]:
+        """The jobs this process gets to do; chunks others hold go to ``elsewhere``."""
+        for i in indices:
+            if leases is not None:
+                if not leases.claim(i):
+                    elsewhere.append(i)
+                    continue
+                manifest.refresh()
+                if (segment := finished_elsewhere(i)) is not None:
+                    on_chunk(segment, recorded=True)
+                    continue
+            yield (i,)
+
+    async def wait_for(indices: list[int]) -> list[int]:
+        """Take in chunks as other processes finish them; return any they dropped."""
+        log.info(f"Waiting for {len(indices)} chunk(s) other processes are working on")
+        while True:
+            manifest.refresh()
+            left = []
+            for i in indices:
+                if (segment := finished_elsewhere(i)) is not None:
+                    on_chunk(segment, recorded=True)
+                elif segments[i] is None:
+                    left.append(i)
+            if not left or not all(leases.is_live(i) for i in left):
+                return left
+            indices = left
+            await asyncio.sleep(ec.LEASE_POLL_SECONDS)
+
+    async def check_script() -> None:
+        """Publish this script as the coordinator, or as a helper make sure it is the coordinator's."""
+        fingerprint = script_fingerprint(keys)
+        if wait_for_others:
+            leases.publish_script(fingerprint)
+            return
+        waited = 0.0
+        while (published := leases.published_script()) is None:
+            if waited >= leases.stale_after:
+                raise SynthesisError(
+                    f"No coordinating run has started on {chunks_dir}; start the conversion with "
+                    "sharing on before its helpers."
+                )
+            await asyncio.sleep(ec.LEASE_POLL_SECONDS)
+            waited += ec.LEASE_POLL_SECONDS
+        if published != fingerprint:
+            raise SynthesisError(
+                f"This book's script does not match the one being synthesized in {chunks_dir}. Every argument "
+                "that shapes the script (engine, voice, speed, normalizer, chunk size, fast start) has to "
+                "match the coordinating run's."
+            )
+
+    async def heartbeat() -> None:
+        while True:
+            await asyncio.sleep(leases.stale_after / 4)
+            leases.refresh()
+
+    pending = todo
+    elsewhere: list[int] = []
+    try:
+        async with cancel_scope(cancel):
+            open_connections(engine)
+            beat = asyncio.create_task(heartbeat()) if leases is not None else None
+            lag = asyncio.create_task(watch_loop_lag())
+            try:
+                if leases is not None:
+                    await check_script()
+                while pending:
+                    elsewhere = []
+                    async for job, result in scheduler.run(claimed(pending, elsewhere)):
+                        if isinstance(result, Exception):
+                            if not on_failure(job, result):
+                                break
+                            continue
+                        breaker.on_success(generations.get(job))
+                        try:
+                            segment = await settle(job, result)
+                        except _JoinFailed as ex:
+                            if not on_failure(ex.job, ex.cause):
+                                break
+                            continue
+                        if segment is not None:
+                            on_chunk(segment)
+                    if breaker.abort_reason or failures or not elsewhere or not wait_for_others:
+                        break
+                    pending = await wait_for(elsewhere)
+                    elsewhere = []
+            finally:
+                if history is not None:
+                    await asyncio.to_thread(history.flush)
+                if ledger is not None:
+                    await asyncio.to_thread(ledger.flush)
+                if budget is not None:
+                    budget.close()
+                await close_connections(engine)
+                lag.cancel()
+                if beat is not None:
+                    beat.cancel()
+                if leases is not None:
+                    leases.release_all()
+    except Cancelled:
+        log.info(
+            f"Stopped. {sum(s is not None for s in segments)} of {len(utterances)} chunk(s) are finished "
+            f"and kept in {chunks_dir}, so converting again resumes from there."
+        )
+        raise
+
+    stats.concurrency = controller.summary()
+    stats.budget_waited = budget.waited if budget is not None else 0.0
+    log.info(f"{engine.label}: {stats.summary()}")
+    if connections := getattr(engine, "connection_summary", lambda: "")():
+        log.info(f"{engine.label} connections so far: {connections}")
 
+    if breaker.abort_reason:
+        raise SynthesisError(
+            f"{engine.label} stopped after {stats.synthesized + stats.cache_hits} chunk(s) this run: "
+            f"{breaker.abort_reason}. Completed chunks are kept in {chunks_dir}, so re-running "
+            f"resumes from there once the problem is fixed."
+        )
     if failures:
         raise SynthesisError(
             f"{len(failures)} of {len(utterances)} chunk(s) could not be synthesized. "
             f"Completed chunks are kept in {chunks_dir}, so re-running resumes from there.\n  "
             + "\n  ".join(failures[:10])
         )
+    if elsewhere:
+        log.info(f"This process's share is done; {len(elsewhere)} chunk(s) are with other processes")
 
     return [s for s in segments if s is not None]
 
 
+async def synthesize_stream(
+    script: Script,
+    engine: SpeechEngine = None,
+    voice: str = None,
+    speed: float = None,
+    chunks_dir: Path = None,
+    resume: bool = True,
+    cache: SynthesisCache = None,
+    hedge: bool = None,
+    stats: RunStats = None,
+    ledger: QuotaLedger = None,
+    cancel: CancelToken = None,
+    progress: ProgressCallback = None,
+    lookahead: int = None,
+    history: EngineHistory = None,
+) -> AsyncIterator[Segment]:
+    """Yield the script's segments in reading order, each as soon as it and all before it are done.
+
+    For consumers that can start on the audio while synthesis carries on — an
+    incremental encoder, a player. Synthesis runs at most ``lookahead`` chunks
+    (default ``STREAM_LOOKAHEAD``) past the segment last taken, so a consumer
+    that falls behind holds synthesis back rather than letting finished chunks
+    pile up. Arguments are as for :func:`synthesize_script`; a chunk that fails
+    for good ends the stream with :class:`SynthesisError` after the segments
+    before it. Stopping early (``break``) cancels synthesis, keeping finished
+    chunks for a resume.
+    """
+    read_ahead = ReadAhead(ec.STREAM_LOOKAHEAD if lookahead is None else lookahead)
+    ready: asyncio.Queue[Segment | None] = asyncio.Queue()
+    run = asyncio.create_task(
+        synthesize_script(
+            script,
+            engine=engine,
+            voice=voice,
+            speed=speed,
+            chunks_dir=chunks_dir,
+            resume=resume,
+            cache=cache,
+            hedge=hedge,
+            stats=stats,
+            ledger=ledger,
+            cancel=cancel,
+            progress=progress,
+            on_segment=ready.put_nowait,
+            read_ahead=read_ahead,
+            history=history,
+        )
+    )
+    run.add_done_callback(lambda _task: ready.put_nowait(None))
+    try:
+        while (segment := await ready.get()) is not None:
+            yield segment
+            read_ahead.advance()
+        await run  # raises whatever stopped synthesis
+    finally:
+        if not run.done():
+            run.cancel()
+            await asyncio.gather(run, return_exceptions=True)
+
+
 def text_to_mp3(text: str, mp3_path: str, voice: str = None, speed: float = None, engine: str = None):
     """Convert a string straight to audio.
 
     Kept as the simple entry point for callers that have text in hand and don't
-    need document structure (notebooks, the GUI's preview, small scripts).
+    need document structure (notebooks, the GUI's preview, small scripts). From a
+    running event loop, await :func:`text_to_mp3_async` instead.
     """
+    return run_sync(text_to_mp3_async(text, mp3_path, voice=voice, speed=speed, engine=engine))
+
+
+async def text_to_mp3_async(
+    text: str, mp3_path: str, voice: str = None, speed: float = None, engine: str = None
+) -> Path:
     from echo.audio import assemble as asm  # noqa: PLC0415
 
     started = time.perf_counter()
@@ -192,17 +1058,24 @@ def text_to_mp3(text: str, mp3_path: str, voice: str = None, speed: float = None
     )
     chunks_dir = chunks_dir_for(output_path)
 
-    segments = asyncio.run(
-        synthesize_script(script, engine=resolved, voice=voice, speed=speed, chunks_dir=chunks_dir)
+    segments = await synthesize_script(
+        script,
+        engine=resolved,
+        voice=voice,
+        speed=speed,
+        chunks_dir=chunks_dir,
+        cache=default_cache(),
+        history=default_history(),
     )
     speed = ec.DEFAULT_SPEED if speed is None else speed
-    asm.assemble(
+    await asyncio.to_thread(
+        asm.assemble,
         [s.path for s in segments],
         output_path,
         fmt=output_path.suffix.lstrip(".") or "mp3",
         speed=None if resolved.supports_speed else speed,
     )
-    asm.cleanup(chunks_dir)
+    await asyncio.to_thread(asm.cleanup, chunks_dir)
     log.info(f"{output_path} created in {(time.perf_counter() - started) / 60:.2f} minutes")
     return output_path
 
@@ -0,0 +1,271 @@
+"""Chunk sizes measured per engine and voice, instead of one guess for all.
+
+``DEFAULT_CHUNK_SIZE`` is a single number for every engine, and the right size
+is not: Edge stalls on very large requests, Cloud TTS caps them at 5,000 bytes,
+and a local model's latency grows with length at its own rate. Larger chunks
+mean fewer seams in the prosody, and fewer requests to pay fixed overhead on —
+up to the point where an engine starts to slow down or fail.
+
+``--tune-chunking`` (:func:`calibrate`) finds that point. It synthesizes a
+sample passage at several sizes, measures seconds of latency per character and
+the failure rate at each, and stores the best size for that engine and voice
+in a small SQLite table beside the synthesis cache. Later scripts for the same
+engine and voice are built with it (:meth:`ChunkTuning.best`), unless a chunk
+size is given explicitly. Like the quota ledger, this is bookkeeping: a
+database error is logged, never raised into a conversion.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import sqlite3
+import tempfile
+import time
+from contextlib import closing
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import echo.constants as ec
+from echo.audio._sqlite import SqliteFile
+from echo.audio.engines import (
+    EngineUnavailable,
+    ErrorKind,
+    SpeechEngine,
+    classify_error,
+    close_connections,
+    open_connections,
+)
+from echo.audio.quota import QuotaLedger
+
+log = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS chunk_size (
+    engine TEXT NOT NULL,
+    voice TEXT NOT NULL,
+    chunk_size INTEGER NOT NULL,
+    seconds_per_char REAL NOT NULL,
+    failure_rate REAL NOT NULL,
+    measured REAL NOT NULL,
+    PRIMARY KEY (engine, voice)
+);
+"""
+
+#: Plain narrative prose, varied enough in punctuation and sentence length to
+#: be representative; passages of any size are cut from it at sentence ends.
+_SAMPLE = (
+    "The house stood at the end of a lane that nobody had bothered to name.",
+    "In spring the hedges closed over it, and the postman, who was new, "
+    "walked past twice before he found the gate.",
+    "Inside, the clocks disagreed with one another by as much as a quarter of an hour.",
+    "My grandmother said this was deliberate; a house with one opinion about the time, she said, was a dull house.",
+    "She kept bees, and ledgers, and a list of every book she had lent and never had back.",
+    "The list ran to four pages.",
+    "Some of the names on it belonged to people who had been dead for thirty years, and she did not cross them out.",
+    "“They may yet return them,” she said, and I could never tell whether she was joking.",
+    "On wet afternoons we played a game of her own invention, "
+    "which involved a map, two dice and a great deal of arguing.",
+    "The rules changed whenever she was losing.",
+    "I learned more about negotiation from that map than from anything I was later taught, including the law.",
+    "In the evenings the wireless was switched on for the news and off again, "
+    "firmly, for everything that followed it.",
+    "Then she would read aloud: novels, mostly, but also seed catalogues, "
+    "railway timetables and, once, a tax return.",
+    "She read them all in the same voice — unhurried, faintly amused, "
+    "as if the author were an old friend with bad habits.",
+    "I have tried, since, to read that way myself.",
+    "It is harder than it sounds.",
+)
+
+
+def sample_passage(chars: int, offset: int = 0) -> str:
+    """About ``chars`` characters of sample prose, whole sentences, starting at sentence ``offset``."""
+    sentences: list[str] = []
+    length = 0
+    i = offset
+    while not sentences or length + len(_SAMPLE[i % len(_SAMPLE)]) + 1 <= chars:
+        sentences.append(_SAMPLE[i % len(_SAMPLE)])
+        length += len(sentences[-1]) + 1
+        i += 1
+    return " ".join(sentences)
+
+
+@dataclass(slots=True)
+class Trial:
+    """Every request made at one chunk size."""
+
+    size: int
+    requests: int = 0
+    failures: int = 0
+    chars: int = 0
+    #: Seconds spent on requests that succeeded.
+    seconds: float = 0.0
+    errors: list[str] = field(default_factory=list)
+
+    @property
+    def failure_rate(self) -> float:
+        return self.failures / self.requests if self.requests else 1.0
+
+    @property
+    def seconds_per_char(self) -> float | None:
+        return self.seconds / self.chars if self.chars else None
+
+    @property
+    def cost(self) -> float:
+        """Expected seconds per character, counting the retries failures cost."""
+        if self.seconds_per_char is None or self.failure_rate >= 1.0:
+            return float("inf")
+        return self.seconds_per_char / (1.0 - self.failure_rate)
+
+    def __str__(self) -> str:
+        rate = f"{self.seconds_per_char * 1000:.2f} ms/char" if self.seconds_per_char is not None else "no audio"
+        return f"{self.size:>6,} chars: {rate}, {self.failures}/{self.requests} failed"
+
+
+@dataclass(slots=True)
+class Calibration:
+    engine: str
+    voice: str
+    trials: list[Trial]
+    best: int
+
+    def __str__(self) -> str:
+        lines = [f"Chunk sizes for {self.engine}, voice '{self.voice}':"]
+        lines += [f"  {trial}" + ("   <- best" if trial.size == self.best else "") for trial in self.trials]
+        return "\n".join(lines)
+
+
+def candidate_sizes(engine: SpeechEngine, sizes: list[int] = None) -> list[int]:
+    """The sizes worth trying on ``engine``: those it accepts, and its own limit."""
+    sizes = sizes or ec.TUNE_CHUNK_SIZES
+    fitting = {s for s in sizes if 0 < s <= engine.max_chars}
+    fitting.add(min(ec.CHUNK_SIZE, engine.max_chars))
+    return sorted(fitting)
+
+
+def pick_best(trials: list[Trial]) -> int:
+    """The largest size within ``TUNE_TOLERANCE`` of the cheapest.
+
+    Near-ties go to the larger size, since it means fewer seams in the prosody
+    and fewer requests.
+    """
+    cheapest = min(trial.cost for trial in trials)
+    if cheapest == float("inf"):
+        raise EngineUnavailable(
+            "Every calibration request failed: " + "; ".join(e for t in trials for e in t.errors[:1])
+        )
+    return max(t.size for t in trials if t.cost <= cheapest * (1 + ec.TUNE_TOLERANCE))
+
+
+async def calibrate(
+    engine: SpeechEngine,
+    voice: str = None,
+    speed: float = None,
+    sizes: list[int] = None,
+    requests: int = None,
+    ledger: QuotaLedger = None,
+) -> Calibration:
+    """Time ``requests`` requests of each candidate size on ``engine``, and pick the best.
+
+    Requests at one size run together, up to the engine's concurrency, so the
+    measurement sees the engine as a conversion would. Characters sent are
+    recorded in ``ledger``, like any other request. An error that no retry
+    would fix, such as a rejected key, raises :class:`EngineUnavailable`.
+    """
+    engine.check_available()
+    voice = voice or engine.default_voice()
+    speed = ec.DEFAULT_SPEED if speed is None else speed
+    speed = speed if engine.supports_speed else 1.0
+    requests = requests or ec.TUNE_REQUESTS
+    sizes = candidate_sizes(engine, sizes)
+    log.info(
+        f"Calibrating {engine.label}, voice '{voice}': {requests} request(s) at each of "
+        f"{', '.join(f'{s:,}' for s in sizes)} characters (about {requests * sum(sizes):,} characters in all)"
+    )
+    slots = asyncio.Semaphore(max(1, engine.max_concurrency))
+    trials = [Trial(size) for size in sizes]
+
+    with tempfile.TemporaryDirectory(prefix="echo-tune-") as scratch:
+
+        async def one(trial: Trial, n: int) -> None:
+            text = sample_passage(trial.size, offset=n * 3)
+            out = Path(scratch) / f"tune_{trial.size}_{n}{engine.audio_suffix}"
+            deadline = ec.CHUNK_DEADLINE_SECONDS + ec.CHUNK_DEADLINE_PER_CHAR * len(text)
+            async with slots:
+                started = time.perf_counter()
+                trial.requests += 1
+                try:
+                    async with asyncio.timeout(deadline if ec.CHUNK_DEADLINE_SECONDS > 0 else None):
+                        await engine.synthesize(text, voice, speed, out)
+                except Exception as ex:
+                    verdict = getattr(engine, "classify_error", classify_error)(ex)
+                    if verdict.kind is ErrorKind.FATAL:
+                        # A rejected key or a missing package: a setup problem
+                        # for the caller to report, not a crash.
+                        if isinstance(ex, EngineUnavailable):
+                            raise
+                        raise EngineUnavailable(f"{engine.label} refused to calibrate: {ex}") from ex
+                    trial.failures += 1
+                    trial.errors.append(f"{type(ex).__name__}: {str(ex)[:120]}")
+                    return
+                trial.seconds += time.perf_counter() - started
+                trial.chars += len(text)
+                if ledger is not None:
+                    ledger.record(engine.name, engine.voice_class(voice), len(text))
+                    if ledger.due:
+                        await asyncio.to_thread(ledger.flush)
+
+        open_connections(engine)
+        try:
+            for trial in trials:
+                await asyncio.gather(*(one(trial, n) for n in range(requests)))
+                log.info(str(trial))
+        finally:
+            if ledger is not None:
+                await asyncio.to_thread(ledger.flush)
+            await close_connections(engine)
+
+    return Calibration(engine.name, voice, trials, pick_best(trials))
+
+
+class ChunkTuning:
+    """The best chunk size found for each engine and voice."""
+
+    def __init__(self, path: Path = None):
+        self.path = Path(path) if path else Path(ec.CACHE_DIR) / "tuning.sqlite"
+        self._db = SqliteFile(self.path, _SCHEMA)
+
+    def save(self, calibration: Calibration) -> None:
+        best = next(t for t in calibration.trials if t.size == calibration.best)
+        try:
+            with closing(self._db.connect()) as conn, conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO chunk_size "
+                    "(engine, voice, chunk_size, seconds_per_char, failure_rate, measured) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        calibration.engine,
+                        calibration.voice,
+                        calibration.best,
+                        best.seconds_per_char,
+                        best.failure_rate,
+                        time.time(),
+                    ),
+                )
+        except sqlite3.Error as ex:
+            log.warning(f"Could not store the tuned chunk size: {ex}")
+
+    def best(self, engine: str, voice: str) -> int | None:
+        """The stored chunk size for ``engine`` and ``voice``, if it has been tuned."""
+        if not self.path.exists():
+            return None
+        try:
+            with closing(self._db.connect()) as conn:
+                row = conn.execute(
+                    "SELECT chunk_size FROM chunk_size WHERE engine = ? AND voice = ?", (engine, voice)
+                ).fetchone()
+        except sqlite3.Error as ex:
+            log.warning(f"Could not read the tuned chunk sizes: {ex}")
+            return None
+        return row[0] if row else None
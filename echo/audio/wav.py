@@ -8,6 +8,7 @@ something ffmpeg can read. Not worth a dependency.
 from __future__ import annotations
 
 import struct
+import wave
 from pathlib import Path
 
 
@@ -27,7 +28,11 @@ def write_pcm16_wav(pcm: bytes, path: Path, rate: int, channels: int = 1) -> Non
         width * 8,
     )
     header += b"data" + struct.pack("<I", len(pcm))
-    Path(path).write_bytes(header + pcm)
+    # Two writes rather than ``header + pcm``: a chapter of PCM is tens of MB, and
+    # concatenating would copy all of it to save one system call.
+    with open(path, "wb") as fp:
+        fp.write(header)
+        fp.write(pcm)
 
 
 def _floats_to_pcm16(samples) -> bytes:
@@ -63,3 +68,25 @@ def write_float_wav(samples, path: Path, rate: int, channels: int = 1) -> None:
     flat iterable of floats.
     """
     write_pcm16_wav(_floats_to_pcm16(samples), path, rate=rate, channels=channels)
+
+
+def join_wavs(paths: list[Path], out_path: Path) -> None:
+    """Concatenate PCM WAV files that share a format into one file."""
+    params = None
+    frames: list[bytes] = []
+    for path in paths:
+        with wave.open(str(path), "rb") as wav:
+            shape = (wav.getnchannels(), wav.getsampwidth(), wav.getframerate())
+            if params is None:
+                params = shape
+            elif shape != params:
+                raise ValueError(f"{path} is {shape}, not {params} like the files before it")
+            frames.append(wav.readframes(wav.getnframes()))
+    if params is None:
+        raise ValueError("There are no WAV files to join")
+    channels, width, rate = params
+    with wave.open(str(out_path), "wb") as out:
+        out.setnchannels(channels)
+        out.setsampwidth(width)
+        out.setframerate(rate)
+        out.writeframes(b"".join(frames))
@@ -0,0 +1,179 @@
+"""Chunk file writes, done on a background thread instead of the event loop.
+
+A streaming engine receives a chunk as a few hundred small audio frames, and
+used to write each one with a blocking ``fp.write`` inside its coroutine. One
+write is cheap on a local SSD; on a slow disk or a network mount it is not, and
+with a dozen streams open every stalled write holds up all of them, websocket
+reads included. Here frames are gathered in memory and handed to one writer
+thread in blocks of ``WRITE_BUFFER_KB``, so the loop never touches the disk; it
+waits only once a chunk is complete, for the file to be closed.
+
+A slow write now shows up where it belongs — as a chunk taking longer — rather
+than as every in-flight request stalling at once. Run with ``--debug`` to see
+how far the loop falls behind (:func:`watch_loop_lag`).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import queue
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future
+from pathlib import Path
+from typing import BinaryIO
+
+import echo.constants as ec
+
+log = logging.getLogger(__name__)
+
+
+class ChunkWriter:
+    """One thread that runs file operations queued by any event loop, in order."""
+
+    def __init__(self):
+        self._queue: queue.SimpleQueue[Callable[[], None]] = queue.SimpleQueue()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                # A daemon: whatever it still holds at exit is a chunk file that
+                # resume would redo anyway.
+                self._thread = threading.Thread(target=self._run, name="echo-chunk-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            self._queue.get()()
+
+    def submit(self, op: Callable[[], None]) -> Future:
+        """Queue ``op`` for the writer thread; the future settles when it has run."""
+        self._start()
+        done: Future = Future()
+
+        def run() -> None:
+            try:
+                op()
+            except BaseException as ex:  # handed to whoever waits on the future
+                done.set_exception(ex)
+            else:
+                done.set_result(None)
+
+        self._queue.put(run)
+        return done
+
+    def open(self, path: Path, buffer_bytes: int = None) -> ChunkFile:
+        return ChunkFile(self, Path(path), buffer_bytes)
+
+
+class ChunkFile:
+    """A file being written by the writer thread; use as ``async with``.
+
+    :meth:`write` never blocks: it buffers, and queues a block once the buffer
+    is full. Leaving the block waits for the last write and the close, and raises
+    any error the thread hit along the way.
+    """
+
+    def __init__(self, writer: ChunkWriter, path: Path, buffer_bytes: int = None):
+        self.path = path
+        self._writer = writer
+        self._limit = ec.WRITE_BUFFER_KB * 1024 if buffer_bytes is None else buffer_bytes
+        self._pending: list[bytes] = []
+        self._size = 0
+        self._fp: BinaryIO | None = None
+        self._error: BaseException | None = None
+        self.bytes_written = 0
+        writer.submit(self._open).add_done_callback(self._note_error)
+
+    def _open(self) -> None:
+        self._fp = open(self.path, "wb")
+
+    def _write(self, pieces: list[bytes]) -> None:
+        if self._fp is not None and self._error is None:
+            self._fp.write(b"".join(pieces))
+
+    def _close(self) -> None:
+        if self._fp is not None:
+            self._fp.close()
+            self._fp = None
+
+    def _note_error(self, done: Future) -> None:
+        if done.exception() is not None and self._error is None:
+            self._error = done.exception()
+
+    def write(self, data: bytes) -> None:
+        if self._error is not None:
+            raise self._error
+        self._pending.append(data)
+        self._size += len(data)
+        self.bytes_written += len(data)
+        if self._size >= self._limit:
+            self._flush()
+
+    def _flush(self) -> None:
+        if self._pending:
+            pieces, self._pending, self._size = self._pending, [], 0
+            self._writer.submit(lambda: self._write(pieces)).add_done_callback(self._note_error)
+
+    async def close(self) -> None:
+        self._flush()
+        closed = self._writer.submit(self._close)
+        # Shielded: a cancelled caller still must not unlink a file the thread
+        # has open, or carry on before the close is done.
+        await asyncio.shield(asyncio.wrap_future(closed))
+        if self._error is not None:
+            raise self._error
+
+    async def __aenter__(self) -> ChunkFile:
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            await self.close()
+            return
+        # Already failing: drop what is buffered, and keep the original error.
+        self._pending, self._size = [], 0
+        try:
+            await self.close()
+        except Exception as ex:
+            log.debug(f"Closing {self.path.name} after a failure also failed: {ex}")
+
+
+_writer: ChunkWriter | None = None
+_writer_lock = threading.Lock()
+
+
+def chunk_writer() -> ChunkWriter:
+    """The process's writer, started on first use and shared by every conversion."""
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = ChunkWriter()
+        return _writer
+
+
+async def watch_loop_lag(interval: float = 0.25, report_over: float = 0.1) -> None:
+    """Log, at DEBUG, whenever the running loop wakes later than asked.
+
+    A timer set for ``interval`` that fires late means something held the loop —
+    a blocking call in a coroutine or a slow callback. Late wake-ups beyond
+    ``report_over`` seconds are logged as they happen, and the worst one when the
+    watch is cancelled. Returns at once unless DEBUG logging is on.
+    """
+    if not log.isEnabledFor(logging.DEBUG):
+        return
+    worst = 0.0
+    try:
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(interval)
+            lag = time.perf_counter() - started - interval
+            worst = max(worst, lag)
+            if lag > report_over:
+                log.debug(f"Event loop lagged {lag * 1000:.0f} ms")
+    finally:
+        log.debug(f"Worst event loop lag: {worst * 1000:.0f} ms")
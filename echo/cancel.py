@@ -0,0 +1,158 @@
+"""Stopping a conversion part-way through.
+
+A conversion runs for hours in a worker thread, a stack of blocking calls and
+its own event loop deep, and none of that used to take a stop signal — a book
+queued by mistake held the GUI's queue until it finished. A
+:class:`CancelToken` is created by whoever may want to stop the work, and passed
+down. Each layer honours it the way it can:
+
+* between pipeline stages, :meth:`CancelToken.raise_if_cancelled`;
+* in synthesis, :func:`scope` cancels the running task, so in-flight requests
+  stop and every chunk already finished stays on disk for resume;
+* in ffmpeg, the subprocess is killed;
+* in thread-backed engines, :func:`check` between steps of a long local render.
+
+Stopping surfaces as :class:`Cancelled`, never as a failure to explain.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import threading
+from collections.abc import AsyncIterator, Callable, Coroutine
+from contextlib import asynccontextmanager
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+_current: contextvars.ContextVar[CancelToken | None] = contextvars.ContextVar("echo_cancel", default=None)
+
+
+class Cancelled(Exception):
+    """Raised when work stops because its :class:`CancelToken` was cancelled."""
+
+
+class CancelToken:
+    """A thread-safe, one-way stop flag with callbacks.
+
+    ``cancel()`` may be called from any thread — typically the GUI's — while the
+    work runs in another.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks: list[Callable[[], None]] = []
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self) -> None:
+        with self._lock:
+            if self._event.is_set():
+                return
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback()
+
+    def raise_if_cancelled(self) -> None:
+        if self.cancelled:
+            raise Cancelled("Stopped")
+
+    def wait(self, timeout: float = None) -> bool:
+        """Block until cancelled or ``timeout`` passes; True if cancelled."""
+        return self._event.wait(timeout)
+
+    def on_cancel(self, callback: Callable[[], None]) -> Callable[[], None]:
+        """Call ``callback`` once on cancellation (now, if already cancelled).
+
+        Returns a function that unregisters it.
+        """
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return lambda: self._discard(callback)
+        callback()
+        return lambda: None
+
+    def _discard(self, callback: Callable[[], None]) -> None:
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+
+def current() -> CancelToken | None:
+    """The token of the synthesis run this code is part of, if any."""
+    return _current.get()
+
+
+def check() -> None:
+    """Raise :class:`Cancelled` if the current run has been stopped.
+
+    For engines that do their work in a thread: the context, and so the token,
+    follows ``BaseEngine.run_blocking`` as it does ``asyncio.to_thread``.
+    """
+    token = _current.get()
+    if token is not None:
+        token.raise_if_cancelled()
+
+
+@asynccontextmanager
+async def scope(token: CancelToken | None) -> AsyncIterator[None]:
+    """Cancel the enclosing task when ``token`` is, and raise :class:`Cancelled`.
+
+    Task cancellation reaches every awaited request at once, which is what makes
+    stopping prompt; the code under the scope only has to clean up after
+    ``CancelledError`` as it already does.
+    """
+    if token is None:
+        yield
+        return
+    token.raise_if_cancelled()
+    task = asyncio.current_task()
+    loop = asyncio.get_running_loop()
+    active = True
+
+    def stop() -> None:
+        if active:
+            task.cancel()
+
+    unregister = token.on_cancel(lambda: loop.call_soon_threadsafe(stop))
+    reset = _current.set(token)
+    try:
+        yield
+    except asyncio.CancelledError:
+        if not token.cancelled:
+            raise
+        task.uncancel()
+        raise Cancelled("Stopped") from None
+    finally:
+        active = False
+        unregister()
+        _current.reset(reset)
+
+
+def run_sync(coroutine: Coroutine[Any, Any, T]) -> T:
+    """``asyncio.run``, without waiting on threads a cancelled run walked away from.
+
+    ``asyncio.run`` joins the default executor before returning, so a blocking
+    SDK call abandoned by a cancelled request would hold up the caller until the
+    service answered. Closing the loop instead lets those threads finish on their
+    own; their output goes to ``.part`` files that nothing reads.
+    """
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        try:
+            pending = asyncio.all_tasks(loop)
+            for task in pending:
+                task.cancel()
+            if pending:
+                loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            loop.run_until_complete(loop.shutdown_asyncgens())
+        finally:
+            loop.close()
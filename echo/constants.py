@@ -33,6 +33,16 @@ def _get_env_float(env_key: str, default_: float) -> float:
     return default_
 
 
+def _get_env_ints(env_key: str, default_: list[int]) -> list[int]:
+    """A comma-separated list of ints; the default if any item is not one."""
+    if s := os.environ.get(env_key):
+        try:
+            return [int(part) for part in s.split(",") if part.strip()]
+        except ValueError:
+            pass
+    return default_
+
+
 def _get_env_bool(env_key: str, default_: bool = False) -> bool:
     s = os.environ.get(env_key)
     if s is None:
@@ -55,12 +65,95 @@ DEFAULT_VOICE = os.environ.get("DEFAULT_VOICE", "en-GB-SoniaNeural")
 # speed up a 1.0× file, but a 1.25× file is 1.25× forever.
 DEFAULT_SPEED = _get_env_float("DEFAULT_SPEED", 1.0)
 CHUNK_SIZE = _get_env_int("DEFAULT_CHUNK_SIZE", 8000)  # characters
+#: Start each book with small utterances — FAST_START_CHARS, then doubling up to
+#: CHUNK_SIZE — so the first audio exists in seconds rather than after a whole
+#: chunk. Costs a handful of extra requests per book.
+FAST_START = _get_env_bool("FAST_START", False)
+FAST_START_CHARS = _get_env_int("FAST_START_CHARS", 250)
+#: Build scripts with the chunk size --tune-chunking found best for the engine and
+#: voice, where it has been run; DEFAULT_CHUNK_SIZE otherwise.
+TUNED_CHUNKING = _get_env_bool("TUNED_CHUNKING", True)
+#: Sizes --tune-chunking tries (those over an engine's limit are skipped), how
+#: many requests it times at each, and how close to the fastest a larger size
+#: has to be to win: larger chunks mean fewer prosody seams.
+TUNE_CHUNK_SIZES = _get_env_ints("TUNE_CHUNK_SIZES", [500, 1000, 2000, 4000, 8000])
+TUNE_REQUESTS = _get_env_int("TUNE_REQUESTS", 3)
+TUNE_TOLERANCE = _get_env_float("TUNE_TOLERANCE", 0.1)
 MAX_THREADS = _get_env_int("DEFAULT_MAX_THREADS", 4)
+#: Let each run raise and lower its in-flight limit as the engine responds: up
+#: towards the engine's peak while requests succeed quickly, halved on errors
+#: or a latency spike. Off, every run holds the engine's max_concurrency.
+ADAPTIVE_CONCURRENCY = _get_env_bool("ADAPTIVE_CONCURRENCY", True)
+#: The most concurrent edge-tts requests the adaptive controller will try.
+EDGE_PEAK_THREADS = _get_env_int("EDGE_PEAK_THREADS", 12)
 #: Attempts per chunk before a synthesis run gives up. Engines fail transiently
 #: (edge-tts websocket 403s, cloud rate limits); one bad chunk should not cost
 #: an hour of work.
 MAX_RETRIES = _get_env_int("DEFAULT_MAX_RETRIES", 3)
 RETRY_BACKOFF_SECONDS = _get_env_float("DEFAULT_RETRY_BACKOFF", 2.0)
+#: A chunk that fails every attempt is split in two at a sentence boundary, and
+#: its halves retried — up to this many times over. 0 disables splitting.
+MAX_BISECT_DEPTH = _get_env_int("MAX_BISECT_DEPTH", 3)
+#: Run-wide circuit breaker: when this share of the last BREAKER_WINDOW requests
+#: failed, pause everything for BREAKER_COOLDOWN_SECONDS (doubling each time),
+#: and give up after BREAKER_MAX_TRIPS pauses.
+BREAKER_FAILURE_RATE = _get_env_float("BREAKER_FAILURE_RATE", 0.5)
+BREAKER_WINDOW = _get_env_int("BREAKER_WINDOW", 20)
+BREAKER_COOLDOWN_SECONDS = _get_env_float("BREAKER_COOLDOWN_SECONDS", 30.0)
+BREAKER_MAX_TRIPS = _get_env_int("BREAKER_MAX_TRIPS", 3)
+#: Deadline for one engine request: a fixed allowance plus so much per character,
+#: so an 8,000-character chunk gets longer than a heading. 0 disables it.
+CHUNK_DEADLINE_SECONDS = _get_env_float("CHUNK_DEADLINE_SECONDS", 60.0)
+CHUNK_DEADLINE_PER_CHAR = _get_env_float("CHUNK_DEADLINE_PER_CHAR", 0.05)
+#: A streaming engine that sends no audio for this long is treated as hung.
+STALL_TIMEOUT_SECONDS = _get_env_float("STALL_TIMEOUT_SECONDS", 30.0)
+#: Opt in to hedging: a request running past HEDGE_PERCENTILE of this run's
+#: latency gets a duplicate, and whichever finishes first is kept.
+HEDGE_REQUESTS = _get_env_bool("HEDGE_REQUESTS", False)
+HEDGE_PERCENTILE = _get_env_float("HEDGE_PERCENTILE", 0.95)
+#: Never hedge a request sooner than this, however fast the run has been.
+HEDGE_MIN_SECONDS = _get_env_float("HEDGE_MIN_SECONDS", 5.0)
+#: Sharing one book between processes (``--worker``): a chunk lease not refreshed
+#: for this long belongs to a process that died, and is taken over.
+LEASE_SECONDS = _get_env_float("LEASE_SECONDS", 120.0)
+#: How often a process waiting on other workers' chunks looks for them.
+LEASE_POLL_SECONDS = _get_env_float("LEASE_POLL_SECONDS", 5.0)
+#: Conversions running at once share each engine's in-flight slots and quotas
+#: fairly, rather than each taking them whole. With ENGINE_BUDGET_DIR set, so
+#: does every process pointing at that directory.
+SHARED_ENGINE_BUDGET = _get_env_bool("SHARED_ENGINE_BUDGET", True)
+ENGINE_BUDGET_DIR = os.path.expanduser(os.environ.get("ENGINE_BUDGET_DIR", ""))
+#: Edge connections kept open between requests, per event loop, and how long
+#: one may sit idle before it is closed rather than reused. 0 opens a new
+#: connection for every request, as edge-tts does on its own.
+EDGE_POOL_SIZE = _get_env_int("EDGE_POOL_SIZE", 8)
+EDGE_POOL_IDLE_SECONDS = _get_env_float("EDGE_POOL_IDLE_SECONDS", 30.0)
+#: How often a request waiting on another process's slot tries again.
+ENGINE_BUDGET_POLL_SECONDS = _get_env_float("ENGINE_BUDGET_POLL_SECONDS", 0.05)
+#: synthesize_stream runs at most this many chunks ahead of its consumer.
+STREAM_LOOKAHEAD = _get_env_int("STREAM_LOOKAHEAD", 32)
+#: Streamed audio is buffered and written off the event loop in blocks this big.
+WRITE_BUFFER_KB = _get_env_int("WRITE_BUFFER_KB", 256)
+
+##### Persistent state
+#: Root for what echo keeps between runs: the synthesis cache and its ledgers.
+CACHE_DIR = os.path.expanduser(os.environ.get("ECHO_CACHE_DIR", "~/.cache/echo"))
+#: Reuse synthesized utterances across runs and books. Keyed by engine, model,
+#: voice, speed and text, so a re-render in another format costs no requests.
+SYNTH_CACHE = _get_env_bool("SYNTH_CACHE", True)
+#: Size cap for the synthesis cache; least-recently-used entries go first.
+SYNTH_CACHE_MAX_MB = _get_env_int("SYNTH_CACHE_MAX_MB", 2048)
+
+#: Record every engine request, and start runs from what earlier ones saw: the
+#: concurrency, latency and throughput of the latest HISTORY_WINDOW requests.
+ENGINE_HISTORY = _get_env_bool("ENGINE_HISTORY", True)
+HISTORY_WINDOW = _get_env_int("HISTORY_WINDOW", 2000)
+#: Requests of at least 200 characters needed before history is trusted.
+HISTORY_MIN_SAMPLES = _get_env_int("HISTORY_MIN_SAMPLES", 20)
+#: A concurrency counts as clean when at most this share of its requests failed.
+HISTORY_MAX_ERROR_RATE = _get_env_float("HISTORY_MAX_ERROR_RATE", 0.05)
+#: Older requests beyond this many are dropped.
+HISTORY_MAX_ROWS = _get_env_int("HISTORY_MAX_ROWS", 200_000)
 
 ##### Output
 #: "m4b" (chaptered audiobook) or "mp3" (plays everywhere).
@@ -94,6 +187,19 @@ RESEARCH_TIMEOUT_SECONDS = _get_env_float("RESEARCH_TIMEOUT_SECONDS", 1800.0)
 GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY") or os.environ.get("GOOGLE_API_KEY")
 GEMINI_TTS_MODEL = os.environ.get("GEMINI_TTS_MODEL", "gemini-2.5-flash-preview-tts")
 GOOGLE_CLOUD_VOICE = os.environ.get("GOOGLE_CLOUD_VOICE", "en-GB-Neural2-C")
+#: Per-minute quotas to pace requests to; 0 means unlimited. Raise them to match
+#: a paid tier, or lower them if requests come back throttled.
+GEMINI_RPM = _get_env_float("GEMINI_RPM", 10)
+GEMINI_CPM = _get_env_float("GEMINI_CPM", 0)
+GOOGLE_CLOUD_RPM = _get_env_float("GOOGLE_CLOUD_RPM", 1000)
+GOOGLE_CLOUD_CPM = _get_env_float("GOOGLE_CLOUD_CPM", 150_000)
+#: Cloud TTS's monthly free characters. WaveNet's allowance covers Neural2 too.
+GOOGLE_CLOUD_FREE_STANDARD_CHARS = _get_env_int("GOOGLE_CLOUD_FREE_STANDARD_CHARS", 4_000_000)
+GOOGLE_CLOUD_FREE_WAVENET_CHARS = _get_env_int("GOOGLE_CLOUD_FREE_WAVENET_CHARS", 1_000_000)
+#: What to do when a book would overrun an engine's monthly budget: "refuse",
+#: "warn", or "route" it to QUOTA_FALLBACK_ENGINE instead.
+QUOTA_POLICY = os.environ.get("QUOTA_POLICY", "warn")
+QUOTA_FALLBACK_ENGINE = os.environ.get("QUOTA_FALLBACK_ENGINE", "edge")
 
 ##### mlx-audio (Apple Silicon)
 MLX_TTS_MODEL = os.environ.get("MLX_TTS_MODEL", "prince-canuma/Kokoro-82M")
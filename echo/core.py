@@ -5,6 +5,9 @@
     synthesize-> Segment[]       one audio file per utterance
     assemble ->  .m4b / .mp3     one file, with chapter marks
     tag      ->  metadata + cover art
+
+Each entry point that synthesizes has an ``_async`` twin to await from a running
+event loop; the plain functions run it on a loop of their own.
 """
 
 from __future__ import annotations
@@ -24,9 +27,15 @@ import echo.audio.mp3_utils as mp3z
 import echo.audio.tts as tts
 import echo.constants as ec
 import echo.normalize as norm
-from echo.audio.engines import get_engine
+from echo.audio.cache import SynthesisCache
+from echo.audio.engines import close_connections, get_engine, open_connections
+from echo.audio.history import EngineHistory, default_history
+from echo.audio.quota import QuotaLedger, check_budget
+from echo.audio.tuning import Calibration, ChunkTuning, calibrate
+from echo.cancel import CancelToken, run_sync
 from echo.document import Document, Script
 from echo.extractors import extract
+from echo.progress import ProgressCallback, ProgressEvent, Stage, default_progress
 
 log = logging.getLogger(__name__)
 
@@ -78,7 +87,7 @@ def preview_path(voice: str, engine: str = None, output_dir: Path = None) -> Pat
     return directory / f"{resolved.name}-{slug}{resolved.audio_suffix}"
 
 
-def preview_voice(
+async def preview_voice_async(
     voice: str,
     speed: float = 1.0,
     engine: str = None,
@@ -112,11 +121,15 @@ def preview_voice(
     # reading — which produced a preview about 30% too short rather than an error.
     raw = out.with_name(f"{out.stem}.raw{resolved.audio_suffix}") if needs_ffmpeg else out
 
-    asyncio.run(resolved.synthesize(text or PREVIEW_TEXT, voice, speed if not needs_ffmpeg else 1.0, raw))
+    open_connections(resolved)
+    try:
+        await resolved.synthesize(text or PREVIEW_TEXT, voice, speed if not needs_ffmpeg else 1.0, raw)
+    finally:
+        await close_connections(resolved)
 
     if needs_ffmpeg:
         log.info(f"{resolved.label} cannot vary its rate; applying {speed}x with ffmpeg")
-        out = asm.assemble([raw], out.with_suffix(".mp3"), fmt="mp3", speed=speed)
+        out = await asyncio.to_thread(asm.assemble, [raw], out.with_suffix(".mp3"), fmt="mp3", speed=speed)
         raw.unlink(missing_ok=True)
 
     if open_after:
@@ -124,6 +137,18 @@ def preview_voice(
     return out
 
 
+def preview_voice(
+    voice: str,
+    speed: float = 1.0,
+    engine: str = None,
+    output_dir: Path = None,
+    text: str = None,
+    open_after: bool = True,
+) -> Path:
+    """:func:`preview_voice_async`, for callers without an event loop."""
+    return run_sync(preview_voice_async(voice, speed, engine, output_dir, text, open_after))
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Pipeline stages
 # ─────────────────────────────────────────────────────────────────────────────
@@ -149,15 +174,58 @@ def build_script(
     engine_name: str = None,
     normalizer: str = None,
     chunk_size: int = None,
+    fast_start: bool = None,
+    voice: str = None,
+    shared: bool = False,
 ) -> Script:
-    """Turn a Document into a chapter-aware Script sized for the engine."""
+    """Turn a Document into a chapter-aware Script sized for the engine.
+
+    Without a ``chunk_size``, utterances are the size :func:`tune_chunking` found
+    best for the engine and ``voice`` (its default voice when omitted), or
+    ``DEFAULT_CHUNK_SIZE`` if it has not been run. ``fast_start`` (default
+    ``FAST_START``) ramps the first utterances up from ``FAST_START_CHARS``, so
+    the first audio arrives quickly.
+
+    A ``shared`` script, one several processes synthesize together, never uses
+    the tuned size: that is stored per machine, and every process has to build
+    the same script.
+    """
     engine = get_engine(engine_name)
+    if chunk_size is None and ec.TUNED_CHUNKING and not shared:
+        chunk_size = ChunkTuning().best(engine.name, voice or engine.default_voice())
+        if chunk_size:
+            log.info(f"Using the tuned chunk size for {engine.name}: {chunk_size:,} characters")
     limit = min(chunk_size or ec.CHUNK_SIZE, engine.max_chars)
+    fast_start = ec.FAST_START if fast_start is None else fast_start
     resolved = norm.get_normalizer(normalizer)
     # Fail before any synthesis rather than falling back for every chunk: if LLM
     # normalization was asked for, silently not doing it is the wrong answer.
     resolved.check_available()
-    return norm.build_script(doc, chunk_size=limit, normalizer=resolved)
+    return norm.build_script(
+        doc,
+        chunk_size=limit,
+        normalizer=resolved,
+        first_chunk_chars=min(ec.FAST_START_CHARS, limit) if fast_start else None,
+    )
+
+
+def engine_stats() -> str:
+    """A summary of every engine request recorded so far (``--engine-stats``)."""
+    return EngineHistory().report()
+
+
+def tune_chunking(engine: str = None, voice: str = None, speed: float = None) -> Calibration:
+    """Find and store the best chunk size for ``engine`` and ``voice``.
+
+    Synthesizes a sample passage at each of ``TUNE_CHUNK_SIZES`` (a few dozen
+    requests, counted against any quota like others), and stores the size with
+    the lowest latency per character once failures are allowed for. Later
+    :func:`build_script` calls for the same engine and voice use it.
+    """
+    resolved = get_engine(engine)
+    calibration = run_sync(calibrate(resolved, voice, speed, ledger=QuotaLedger()))
+    ChunkTuning().save(calibration)
+    return calibration
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -165,7 +233,14 @@ def build_script(
 # ─────────────────────────────────────────────────────────────────────────────
 
 
-def file_to_audio(
+def _output_path_for(file_path: Path, output_path: str | Path | None, fmt: str) -> Path:
+    if output_path is None:
+        base = Path(ec.OUTPUT_FOLDER) / file_path.name if ec.OUTPUT_FOLDER else file_path
+        return base.with_suffix(f".{fmt}")
+    return Path(output_path).with_suffix(f".{fmt}")
+
+
+async def file_to_audio_async(
     file_path: str | Path,
     output_path: str | Path = None,
     mp3_meta: dict = None,
@@ -178,8 +253,19 @@ def file_to_audio(
     write_transcript: bool = None,
     parser_configs: dict = None,
     resume: bool = True,
+    cache: bool = None,
+    over_budget: str = None,
+    cancel: CancelToken = None,
+    progress: ProgressCallback = None,
+    on_chapter: tts.ChapterCallback = None,
+    fast_start: bool = None,
+    shared: bool = False,
 ) -> Path:
-    """Convert a text-bearing file into an audiobook.
+    """Convert a text-bearing file into an audiobook, on the running event loop.
+
+    Extraction, normalization and assembly run in worker threads, so several
+    conversions can share one loop — and the engines' connections with it.
+    :func:`file_to_audio` is the same for callers without a loop.
 
     Args:
         file_path: source ``.pdf``, ``.epub``, ``.txt`` or ``.md``.
@@ -195,6 +281,24 @@ def file_to_audio(
         parser_configs: extractor options (``first_page``, ``last_page``,
             ``force_ocr``, ``use_docling``).
         resume: reuse chunks left behind by an interrupted run.
+        cache: reuse utterances synthesized by earlier runs, from any book.
+            Defaults to ``SYNTH_CACHE``.
+        over_budget: ``refuse``, ``warn`` or ``route`` when the book would
+            overrun the engine's monthly free characters. Defaults to
+            ``QUOTA_POLICY``.
+        cancel: a :class:`~echo.cancel.CancelToken`; cancelling it stops the
+            conversion with :class:`~echo.cancel.Cancelled` within about a
+            second, keeping finished chunks so a later run resumes.
+        progress: called with a :class:`~echo.progress.ProgressEvent` at each
+            stage and as chunks finish. Defaults to logging them.
+        on_chapter: called with a chapter's index and its segments as each
+            chapter finishes synthesis, in reading order, so it can be encoded
+            or played before the whole book is done.
+        fast_start: open with short utterances that ramp up to full size, so
+            the first audio exists within seconds. Defaults to ``FAST_START``.
+        shared: let :func:`synthesize_share` processes work on this book too.
+            This process claims chunks as they do, waits for theirs, and
+            assembles the book once every chunk is present.
 
     Returns:
         Path to the finished audio file.
@@ -205,23 +309,50 @@ def file_to_audio(
     fmt = (fmt or ec.DEFAULT_FORMAT).lower().lstrip(".")
     speed = ec.DEFAULT_SPEED if speed is None else speed
     write_transcript = ec.WRITE_TRANSCRIPT if write_transcript is None else write_transcript
+    cache = ec.SYNTH_CACHE if cache is None else cache
+    progress = progress or default_progress()
 
     resolved_engine = get_engine(engine)
     resolved_engine.check_available()
     voice = voice or resolved_engine.default_voice()
 
-    if output_path is None:
-        base = Path(ec.OUTPUT_FOLDER) / file_path.name if ec.OUTPUT_FOLDER else file_path
-        output_path = base.with_suffix(f".{fmt}")
-    else:
-        output_path = Path(output_path).with_suffix(f".{fmt}")
+    output_path = _output_path_for(file_path, output_path, fmt)
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
     # 1. Extract + rules normalization
-    doc = extract_document(file_path, parser_configs)
+    progress(ProgressEvent(Stage.EXTRACT))
+    doc = await asyncio.to_thread(extract_document, file_path, parser_configs)
 
     # 2. Script: chapters and engine-sized utterances
-    script = build_script(doc, engine_name=engine, normalizer=normalizer)
+    if cancel is not None:
+        cancel.raise_if_cancelled()
+    progress(ProgressEvent(Stage.SCRIPT))
+    script = await asyncio.to_thread(
+        build_script,
+        doc,
+        engine_name=engine,
+        normalizer=normalizer,
+        fast_start=fast_start,
+        voice=voice,
+        shared=shared,
+    )
+
+    ledger = QuotaLedger()
+    if not check_budget(ledger, resolved_engine, voice, script.char_count, over_budget):
+        resolved_engine = get_engine(ec.QUOTA_FALLBACK_ENGINE)
+        resolved_engine.check_available()
+        voice = resolved_engine.default_voice()
+        # Utterances sized for the first engine may be too long for this one, or
+        # far from its tuned size: size them for the engine that will speak them.
+        script = await asyncio.to_thread(
+            build_script,
+            doc,
+            engine_name=resolved_engine.name,
+            normalizer=normalizer,
+            fast_start=fast_start,
+            voice=voice,
+            shared=shared,
+        )
 
     if write_text_file:
         text_path = output_path.with_suffix(".txt")
@@ -230,15 +361,20 @@ def file_to_audio(
 
     # 3. Synthesis
     chunks_dir = tts.chunks_dir_for(output_path)
-    segments = asyncio.run(
-        tts.synthesize_script(
-            script,
-            engine=resolved_engine,
-            voice=voice,
-            speed=speed,
-            chunks_dir=chunks_dir,
-            resume=resume,
-        )
+    segments = await tts.synthesize_script(
+        script,
+        engine=resolved_engine,
+        voice=voice,
+        speed=speed,
+        chunks_dir=chunks_dir,
+        resume=resume,
+        cache=SynthesisCache() if cache else None,
+        ledger=ledger,
+        cancel=cancel,
+        progress=progress,
+        on_chapter=on_chapter,
+        shared=shared,
+        history=default_history(),
     )
     if len(segments) != len(script.utterances()):
         raise asm.AssemblyError(
@@ -253,9 +389,11 @@ def file_to_audio(
     marks = asm.chapter_marks([c.title for c in script.chapters], durations_by_chapter)
 
     # 5. Assemble
+    progress(ProgressEvent(Stage.ASSEMBLE))
     title = mp3_meta.get("title") or script.title
     author = mp3_meta.get("author") or script.author
-    final_path = asm.assemble(
+    final_path = await asyncio.to_thread(
+        asm.assemble,
         [s.path for s in segments],
         output_path,
         fmt=fmt,
@@ -263,24 +401,27 @@ def file_to_audio(
         title=title,
         author=author,
         speed=None if resolved_engine.supports_speed else speed,
+        cancel=cancel,
     )
 
     # 6. Transcript, while the segment timings are still around
     if write_transcript:
         if any(s.timings for s in segments):
-            asm.write_srt(final_path, [(s.duration_ms, s.timings) for s in segments])
+            await asyncio.to_thread(asm.write_srt, final_path, [(s.duration_ms, s.timings) for s in segments])
         else:
             log.info(f"{resolved_engine.label} does not report word timings; no transcript written")
 
     # 7. Tags and cover art
-    mp3z.add_meta_fields(
+    await asyncio.to_thread(
+        mp3z.add_meta_fields,
         final_path,
         image_path=mp3_meta.get("image_path"),
         title=title,
         author=author,
     )
 
-    asm.cleanup(chunks_dir)
+    await asyncio.to_thread(asm.cleanup, chunks_dir)
+    progress(ProgressEvent(Stage.DONE))
     log.info(
         f"Done: {final_path} ({len(script.chapters)} chapter(s)) in "
         f"{(time.perf_counter() - started) / 60:.2f} minutes"
@@ -288,6 +429,154 @@ def file_to_audio(
     return final_path
 
 
+def file_to_audio(
+    file_path: str | Path,
+    output_path: str | Path = None,
+    mp3_meta: dict = None,
+    voice: str = None,
+    speed: float = None,
+    engine: str = None,
+    fmt: str = None,
+    normalizer: str = None,
+    write_text_file: bool = False,
+    write_transcript: bool = None,
+    parser_configs: dict = None,
+    resume: bool = True,
+    cache: bool = None,
+    over_budget: str = None,
+    cancel: CancelToken = None,
+    progress: ProgressCallback = None,
+    on_chapter: tts.ChapterCallback = None,
+    fast_start: bool = None,
+    shared: bool = False,
+) -> Path:
+    """Convert a text-bearing file into an audiobook.
+
+    Runs :func:`file_to_audio_async`, which documents the arguments, on an event
+    loop of its own; from code that already has a loop, await that instead.
+    """
+    return run_sync(
+        file_to_audio_async(
+            file_path,
+            output_path=output_path,
+            mp3_meta=mp3_meta,
+            voice=voice,
+            speed=speed,
+            engine=engine,
+            fmt=fmt,
+            normalizer=normalizer,
+            write_text_file=write_text_file,
+            write_transcript=write_transcript,
+            parser_configs=parser_configs,
+            resume=resume,
+            cache=cache,
+            over_budget=over_budget,
+            cancel=cancel,
+            progress=progress,
+            on_chapter=on_chapter,
+            fast_start=fast_start,
+            shared=shared,
+        )
+    )
+
+
+async def synthesize_share_async(
+    file_path: str | Path,
+    output_path: str | Path = None,
+    voice: str = None,
+    speed: float = None,
+    engine: str = None,
+    fmt: str = None,
+    normalizer: str = None,
+    parser_configs: dict = None,
+    cache: bool = None,
+    fast_start: bool = None,
+    cancel: CancelToken = None,
+    progress: ProgressCallback = None,
+) -> int:
+    """Help a ``file_to_audio(..., shared=True)`` run by synthesizing some of its chunks.
+
+    Claims chunks of the same book, in the same chunks directory, until none is
+    left unclaimed, then returns without assembling anything; the coordinating
+    process does that. Every argument that shapes the script — the file, output
+    path and format, engine, voice, speed, normalizer and ``fast_start`` — must
+    match the coordinator's; a helper whose script differs raises
+    :class:`~echo.audio.tts.SynthesisError` before claiming anything. The ``local``
+    and ``gemini`` normalizers can word a chunk differently each time, so leave
+    normalization off when sharing.
+
+    Returns:
+        How many chunks are finished, by this process or any other.
+    """
+    file_path = Path(file_path)
+    fmt = (fmt or ec.DEFAULT_FORMAT).lower().lstrip(".")
+    cache = ec.SYNTH_CACHE if cache is None else cache
+    resolved_engine = get_engine(engine)
+    resolved_engine.check_available()
+
+    voice = voice or resolved_engine.default_voice()
+    doc = await asyncio.to_thread(extract_document, file_path, parser_configs)
+    script = await asyncio.to_thread(
+        build_script,
+        doc,
+        engine_name=engine,
+        normalizer=normalizer,
+        fast_start=fast_start,
+        voice=voice,
+        shared=True,
+    )
+    if cancel is not None:
+        cancel.raise_if_cancelled()
+    segments = await tts.synthesize_script(
+        script,
+        engine=resolved_engine,
+        voice=voice,
+        speed=ec.DEFAULT_SPEED if speed is None else speed,
+        chunks_dir=tts.chunks_dir_for(_output_path_for(file_path, output_path, fmt)),
+        cache=SynthesisCache() if cache else None,
+        ledger=QuotaLedger(),
+        cancel=cancel,
+        progress=progress,
+        shared=True,
+        wait_for_others=False,
+        history=default_history(),
+    )
+    return len(segments)
+
+
+def synthesize_share(
+    file_path: str | Path,
+    output_path: str | Path = None,
+    voice: str = None,
+    speed: float = None,
+    engine: str = None,
+    fmt: str = None,
+    normalizer: str = None,
+    parser_configs: dict = None,
+    cache: bool = None,
+    fast_start: bool = None,
+    cancel: CancelToken = None,
+    progress: ProgressCallback = None,
+) -> int:
+    """:func:`synthesize_share_async`, for callers without an event loop."""
+    return run_sync(
+        synthesize_share_async(
+            file_path,
+            output_path=output_path,
+            voice=voice,
+            speed=speed,
+            engine=engine,
+            fmt=fmt,
+            normalizer=normalizer,
+            parser_configs=parser_configs,
+            cache=cache,
+            fast_start=fast_start,
+            cancel=cancel,
+            progress=progress,
+        )
+    )
+
+
 def file_to_mp3(
     file_path: str | Path,
     mp3_path: str | Path = None,
@@ -315,3 +604,10 @@ def file_to_mp3(
 def text_to_mp3(text: str, mp3_path: str | Path, voice: str = None, speed: float = None, engine: str = None):
     """Convert a string directly to audio."""
     return tts.text_to_mp3(text, str(mp3_path), voice=voice, speed=speed, engine=engine)
+
+
+async def text_to_mp3_async(
+    text: str, mp3_path: str | Path, voice: str = None, speed: float = None, engine: str = None
+) -> Path:
+    """:func:`text_to_mp3`, on the running event loop."""
+    return await tts.text_to_mp3_async(text, str(mp3_path), voice=voice, speed=speed, engine=engine)
@@ -176,11 +176,21 @@ def extract_markdown(path: Path) -> Document:
     )
 
 
-def to_chunks(text: str, max_chars: int = None) -> list[str]:
+def to_chunks(text: str, max_chars: int = None, first_chars: int = None) -> list[str]:
     """Split text into chunks of at most ``max_chars``, preferring paragraph then
-    sentence boundaries so chunk seams land where speech naturally pauses."""
+    sentence boundaries so chunk seams land where speech naturally pauses.
+
+    With ``first_chars``, the first chunk is held to that size and each after it
+    may be twice the one before, up to ``max_chars``: a short first request gets
+    audio out quickly, and the rest of the text still goes in large ones.
+    """
     max_chars = max_chars or ec.CHUNK_SIZE
 
+    def limit() -> int:
+        if not first_chars:
+            return max_chars
+        return min(max_chars, first_chars * 2 ** min(len(chunks), 16))
+
     # Note: re.sub returns a new string — the results have to be assigned. The
     # original code called these and discarded them, so normalization never ran.
     text = ec.EMPTY_LINES.sub("\n\n", text)
@@ -194,13 +204,13 @@ def to_chunks(text: str, max_chars: int = None) -> list[str]:
         if not para:
             continue
 
-        if len(current_chunk) + len(para) + 2 > max_chars and current_chunk:
+        if len(current_chunk) + len(para) + 2 > limit() and current_chunk:
             chunks.append(current_chunk.strip())
             current_chunk = ""
 
-        if len(para) > max_chars:
+        if len(para) > limit():
             for sentence in ec.SENTENCES.split(para):
-                if len(current_chunk) + len(sentence) + 1 > max_chars and current_chunk:
+                if len(current_chunk) + len(sentence) + 1 > limit() and current_chunk:
                     chunks.append(current_chunk.strip())
                     current_chunk = ""
                 current_chunk += sentence + " "
@@ -479,8 +479,14 @@ def build_script(
     chapter_level: int = None,
     normalizer: Normalizer = None,
     min_chapter_chars: int = None,
+    first_chunk_chars: int = None,
 ) -> Script:
-    """Group a Document into chapters, then into engine-sized utterances."""
+    """Group a Document into chapters, then into engine-sized utterances.
+
+    ``first_chunk_chars`` ramps the opening of the book: its first utterance is
+    about that long, and each after it up to twice the last, until they reach
+    ``chunk_size`` (see :func:`~echo.extractors.text.to_chunks`).
+    """
     chunk_size = chunk_size or ec.CHUNK_SIZE
     chapter_level = chapter_level or ec.CHAPTER_HEADING_LEVEL
     normalizer = normalizer or RulesNormalizer()
@@ -528,7 +534,13 @@ def build_script(
         text = "\n\n".join(p for p in parts if p.strip())
         if not text.strip():
             continue
-        pieces = [normalizer.normalize(c) for c in to_chunks(text, chunk_size)]
+        chunks = to_chunks(text, chunk_size, first_chunk_chars)
+        if first_chunk_chars:
+            # The ramp carries on into the next chapter if this one was short.
+            first_chunk_chars *= 2 ** min(len(chunks), 16)
+            if first_chunk_chars >= chunk_size:
+                first_chunk_chars = None
+        pieces = [normalizer.normalize(c) for c in chunks]
         utterances = [Utterance(text=p) for p in pieces if p.strip()]
         if utterances:
             chapters.append(Chapter(title=_chapter_title(i, title, doc.title), utterances=utterances))
@@ -0,0 +1,207 @@
+"""Typed progress for a conversion: what stage it is in, how fast, and how long to go.
+
+Progress used to reach the GUI as a log line, ``"Progress Report: 42%"``, which
+the GUI parsed back out with a regex run on every log record. That carried a
+percentage and nothing else. :func:`~echo.core.file_to_audio` and
+:func:`~echo.audio.tts.synthesize_script` now take a ``progress`` callback and
+call it with a :class:`ProgressEvent` at each stage change and each finished
+chunk; the CLI logs them, the GUI drives its progress bar and status line from
+them, and anything embedding echo can do what it likes.
+
+Callbacks run on the conversion's own thread (inside its event loop during
+synthesis), so they should be quick: hand the event to a queue or a Qt signal
+rather than doing work in it.
+"""
+
+from __future__ import annotations
+
+import enum
+import logging
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+
+log = logging.getLogger(__name__)
+
+
+class Stage(str, enum.Enum):
+    EXTRACT = "extract"
+    SCRIPT = "script"
+    SYNTHESIZE = "synthesize"
+    ASSEMBLE = "assemble"
+    DONE = "done"
+
+
+_STAGE_LABELS = {
+    Stage.EXTRACT: "Reading the document",
+    Stage.SCRIPT: "Preparing the script",
+    Stage.SYNTHESIZE: "Synthesizing",
+    Stage.ASSEMBLE: "Joining the audio",
+    Stage.DONE: "Done",
+}
+
+
+@dataclass(frozen=True, slots=True)
+class ProgressEvent:
+    """A snapshot of a conversion. Synthesis fields are zero outside that stage."""
+
+    stage: Stage
+    chunks_done: int = 0
+    chunks_total: int = 0
+    chars_done: int = 0
+    chars_total: int = 0
+    #: Recent synthesis throughput, in characters of text per second.
+    chars_per_second: float = 0.0
+    in_flight: int = 0
+    retries: int = 0
+    #: Chapters whose every chunk is synthesized, counted in reading order: the
+    #: first chapter still missing a chunk stops the count.
+    chapters_done: int = 0
+    chapters_total: int = 0
+    #: Seconds the most recent chunk took, from request to file.
+    last_latency: float | None = None
+    #: Estimated seconds left in synthesis, once there is a rate to go on.
+    eta_seconds: float | None = None
+
+    @property
+    def fraction(self) -> float:
+        """How far through synthesis, 0.0 to 1.0: the long part of any conversion."""
+        if self.stage in (Stage.ASSEMBLE, Stage.DONE):
+            return 1.0
+        if self.stage is not Stage.SYNTHESIZE or not self.chars_total:
+            return 0.0
+        return min(1.0, self.chars_done / self.chars_total)
+
+    def __str__(self) -> str:
+        label = _STAGE_LABELS[self.stage]
+        if self.stage is not Stage.SYNTHESIZE:
+            return label
+        bits = [f"{label}: {self.chunks_done}/{self.chunks_total} chunk(s) ({self.fraction:.0%})"]
+        if self.chapters_total > 1:
+            bits.append(f"{self.chapters_done}/{self.chapters_total} chapter(s) ready")
+        if self.chars_per_second:
+            bits.append(f"{self.chars_per_second:,.0f} chars/s")
+        if self.in_flight:
+            bits.append(f"{self.in_flight} in flight")
+        if self.retries:
+            bits.append(f"{self.retries} retried")
+        if self.eta_seconds is not None:
+            bits.append(f"about {format_duration(self.eta_seconds)} left")
+        return ", ".join(bits)
+
+
+ProgressCallback = Callable[[ProgressEvent], None]
+
+
+def format_duration(seconds: float) -> str:
+    seconds = max(0, round(seconds))
+    if seconds < 60:
+        return f"{seconds}s"
+    minutes, seconds = divmod(seconds, 60)
+    if minutes < 60:
+        return f"{minutes}m {seconds:02d}s"
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h {minutes:02d}m"
+
+
+def log_progress(event: ProgressEvent) -> None:
+    """The default callback: one INFO line per stage, and per percent of synthesis."""
+    log.info(str(event))
+
+
+class _PercentFilter:
+    """Passes stage changes and whole-percent steps, so a log isn't a line per chunk."""
+
+    def __init__(self, callback: ProgressCallback):
+        self._callback = callback
+        self._last: tuple[Stage, int] | None = None
+
+    def __call__(self, event: ProgressEvent) -> None:
+        key = (event.stage, int(event.fraction * 100))
+        if key != self._last:
+            self._last = key
+            self._callback(event)
+
+
+def default_progress() -> ProgressCallback:
+    return _PercentFilter(log_progress)
+
+
+class SynthesisProgress:
+    """Builds synthesis events: throughput over recent chunks, and an ETA from it."""
+
+    #: Chunks the throughput is averaged over; long enough to smooth out one slow
+    #: request, short enough to follow a change of pace.
+    WINDOW = 50
+    #: Chunks this run must finish before its own rate replaces ``prior_rate``.
+    PRIOR_UNTIL = 5
+
+    def __init__(
+        self,
+        callback: ProgressCallback,
+        chunks_total: int,
+        chars_total: int,
+        chapters_total: int = 0,
+        prior_rate: float = None,
+    ):
+        self._callback = callback
+        #: Characters per second earlier runs of this engine managed, if known:
+        #: an ETA from the start, and a steadier one over the first few chunks.
+        self.prior_rate = prior_rate
+        self.chunks_total = chunks_total
+        self.chars_total = chars_total
+        self.chapters_total = chapters_total
+        self.chunks_done = 0
+        self.chars_done = 0
+        self.chapters_done = 0
+        self.retries = 0
+        # Completions in the window, and when the window opened: the start of the
+        # run until it fills, then the time of the last completion to leave it.
+        self._recent: deque[tuple[float, int]] = deque()
+        self._since = time.monotonic()
+
+    def resumed(self, chunks: int, chars: int) -> None:
+        """Count work already on disk, which says nothing about throughput."""
+        self.chunks_done += chunks
+        self.chars_done += chars
+
+    def _rate(self) -> float:
+        if self.prior_rate and len(self._recent) < self.PRIOR_UNTIL:
+            return self.prior_rate
+        if not self._recent:
+            return 0.0
+        elapsed = time.monotonic() - self._since
+        return sum(chars for _, chars in self._recent) / elapsed if elapsed > 0 else 0.0
+
+    def emit(self, in_flight: int = 0, latency: float = None) -> None:
+        rate = self._rate()
+        remaining = self.chars_total - self.chars_done
+        self._callback(
+            ProgressEvent(
+                stage=Stage.SYNTHESIZE,
+                chunks_done=self.chunks_done,
+                chunks_total=self.chunks_total,
+                chars_done=self.chars_done,
+                chars_total=self.chars_total,
+                chars_per_second=rate,
+                in_flight=in_flight,
+                retries=self.retries,
+                chapters_done=self.chapters_done,
+                chapters_total=self.chapters_total,
+                last_latency=latency,
+                eta_seconds=remaining / rate if rate > 0 else (0.0 if remaining <= 0 else None),
+            )
+        )
+
+    def chunk_done(self, chars: int, in_flight: int = 0, latency: float = None, chunks: int = 1) -> None:
+        self.chunks_done += chunks
+        self.chars_done += chars
+        self._recent.append((time.monotonic(), chars))
+        if len(self._recent) > self.WINDOW:
+            self._since = self._recent.popleft()[0]
+        self.emit(in_flight, latency)
+
+    def retried(self, in_flight: int = 0) -> None:
+        self.retries += 1
+        self.emit(in_flight)
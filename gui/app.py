@@ -50,6 +50,7 @@ from PySide6.QtWidgets import (
 import echo.constants as ec
 from echo.audio.assemble import FORMATS
 from echo.normalize import available_normalizers
+from echo.progress import ProgressEvent, Stage, format_duration
 from gui import sources as gs
 from gui import style as gstyle
 from gui import voices as gv
@@ -791,15 +792,19 @@ class QueueDialog(QDialog):
     behind the (modal) dialog.
     """
 
-    def __init__(self, queue: ConversionQueue, parent=None):
+    def __init__(self, queue: ConversionQueue, parent=None, on_stop=None):
         super().__init__(parent)
         self.setWindowTitle("Conversion queue")
         self.setModal(True)
         self.setMinimumSize(520, 360)
         self._queue = queue
+        self._on_stop = on_stop
 
         self.current_label = QLabel()
         self.current_label.setWordWrap(True)
+        self.stop_btn = QPushButton("Stop")
+        self.stop_btn.setToolTip("Stop this conversion. Finished chunks are kept, so converting it again resumes.")
+        self.stop_btn.clicked.connect(self._stop)
 
         self.pending_list = QListWidget()
         self.pending_list.setAlternatingRowColors(True)
@@ -830,8 +835,12 @@ class QueueDialog(QDialog):
         layout = QVBoxLayout(self)
         layout.setContentsMargins(18, 18, 18, 18)
         layout.setSpacing(10)
+        now_row = QHBoxLayout()
+        now_row.addWidget(self.current_label, 1)
+        now_row.addWidget(self.stop_btn)
+
         layout.addWidget(now_heading)
-        layout.addWidget(self.current_label)
+        layout.addLayout(now_row)
         layout.addWidget(self.waiting_heading)
         layout.addWidget(self.pending_list, 1)
         layout.addLayout(buttons)
@@ -858,6 +867,13 @@ class QueueDialog(QDialog):
     def _sync_buttons(self) -> None:
         self.remove_btn.setEnabled(self.pending_list.currentRow() >= 0)
         self.clear_btn.setEnabled(len(self._queue) > 0)
+        self.stop_btn.setVisible(self._on_stop is not None)
+        self.stop_btn.setEnabled(self._queue.current is not None)
+
+    def _stop(self) -> None:
+        if self._on_stop is not None and self._queue.current is not None:
+            self.stop_btn.setEnabled(False)
+            self._on_stop()
 
     def _remove_selected(self) -> None:
         row = self.pending_list.currentRow()
@@ -1317,10 +1333,15 @@ class MainWindow(QMainWindow):
     def _append_log(self, line: str) -> None:
         self.log_view.appendPlainText(line)
 
-    def _on_progress(self, pct: int) -> None:
+    def _on_progress(self, event: ProgressEvent) -> None:
+        if event.stage is not Stage.SYNTHESIZE:
+            return  # the bar stays "busy" through extraction and assembly
         if self.progress.maximum() == 0:  # was in "busy" mode
             self.progress.setRange(0, 100)
-        self.progress.setValue(pct)
+        self.progress.setValue(int(event.fraction * 100))
+        eta = f" · {format_duration(event.eta_seconds)} left" if event.eta_seconds else ""
+        self.progress.setFormat(f"%p%{eta}")
+        self.progress.setToolTip(str(event))
 
     def _busy(self, running: bool, status: str = "") -> None:
         """Toggle UI enabled state and show the progress bar only while running.
@@ -1332,6 +1353,8 @@ class MainWindow(QMainWindow):
         self.progress.setVisible(running)
         if running:
             self.progress.setRange(0, 0)  # indeterminate until first % arrives
+            self.progress.setFormat("%p%")
+            self.progress.setToolTip("")
         if status:
             self.status.setText(status)
 
@@ -1385,7 +1408,14 @@ class MainWindow(QMainWindow):
         self.queue_btn.setToolTip(f"Conversion queue — {noun}")
 
     def _show_queue(self) -> None:
-        QueueDialog(self.queue, self).exec()
+        QueueDialog(self.queue, self, on_stop=self._stop_current).exec()
+
+    def _stop_current(self) -> None:
+        """Stop the running conversion; the queue moves on to the next job."""
+        if isinstance(self._worker, ConversionWorker):
+            self._append_log("Stopping…")
+            self.status.setText("Stopping…")
+            self._worker.cancel()
 
     def _maybe_start_next(self) -> None:
         if self._worker is not None:
@@ -1506,7 +1536,12 @@ def main() -> int:
 
     window = MainWindow()
     window.show()
-    return app.exec()
+    try:
+        return app.exec()
+    finally:
+        from echo.audio.engines import shutdown_engines
+
+        shutdown_engines()
 
 
 if __name__ == "__main__":
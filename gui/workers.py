@@ -5,24 +5,26 @@ asyncio loop), so it must run off the Qt main thread to keep the UI responsive.
 Each worker is a ``QThread`` that:
 
 * installs a temporary logging handler to forward backend log lines to the UI,
-* parses the backend's ``"Progress Report: NN%"`` log messages into a progress
-  signal (no backend changes required), and
+* forwards the pipeline's :class:`~echo.progress.ProgressEvent` objects as a
+  progress signal, and
 * reports success/failure via Qt signals, which are delivered safely to the main
   thread.
+
+A conversion can be stopped: :meth:`ConversionWorker.cancel` trips the
+:class:`~echo.cancel.CancelToken` the pipeline was handed, from the main thread.
 """
 
 from __future__ import annotations
 
 import logging
-import re
 import traceback
 from pathlib import Path
 
 from PySide6.QtCore import QThread, Signal
 
 import echo.core as core
-
-_PROGRESS_RE = re.compile(r"Progress Report:\s*(\d+)\s*%")
+from echo.cancel import Cancelled, CancelToken
+from echo.progress import ProgressEvent, default_progress
 
 # Loggers whose output we surface in the UI while a job runs.
 _CAPTURED_LOGGERS = ("echo", "__main__")
@@ -35,19 +37,14 @@ class _SignalLogHandler(logging.Handler):
     thread automatically by Qt, so this is safe.
     """
 
-    def __init__(self, on_message, on_progress, level=logging.INFO):
+    def __init__(self, on_message, level=logging.INFO):
         super().__init__(level=level)
         self._on_message = on_message
-        self._on_progress = on_progress
         self.setFormatter(logging.Formatter("%(message)s"))
 
     def emit(self, record: logging.LogRecord) -> None:
         try:
-            msg = self.format(record)
-            match = _PROGRESS_RE.search(msg)
-            if match:
-                self._on_progress(int(match.group(1)))
-            self._on_message(msg)
+            self._on_message(self.format(record))
         except Exception:  # never let logging break the job
             pass
 
@@ -55,7 +52,7 @@ class _SignalLogHandler(logging.Handler):
 class _BaseWorker(QThread):
     """Shared plumbing: log capture + uniform result signals."""
 
-    progress = Signal(int)  # 0-100
+    progress = Signal(object)  # a ProgressEvent
     message = Signal(str)  # a line of backend log output
     succeeded = Signal(str)  # path to the produced file
     failed = Signal(str)  # human-readable error text
@@ -66,7 +63,7 @@ class _BaseWorker(QThread):
     def _run_captured(self, work) -> None:
         """Run ``work()`` with backend logging piped into ``self`` signals."""
         level = self._level
-        handler = _SignalLogHandler(self.message.emit, self.progress.emit, level)
+        handler = _SignalLogHandler(self.message.emit, level)
         touched = []
         for name in _CAPTURED_LOGGERS:
             lg = logging.getLogger(name)
@@ -78,6 +75,8 @@ class _BaseWorker(QThread):
         try:
             result = work()
             self.succeeded.emit(str(result))
+        except Cancelled:
+            self.failed.emit("Stopped. Finished chunks are kept, so converting it again resumes.")
         except Exception as exc:
             self.message.emit(traceback.format_exc())
             self.failed.emit(str(exc) or exc.__class__.__name__)
@@ -123,9 +122,22 @@ class ConversionWorker(_BaseWorker):
             resume=resume,
             parser_configs=parser_configs,
         )
+        self._cancel = CancelToken()
+        self._log_progress = default_progress()
+
+    def _on_progress(self, event: ProgressEvent) -> None:
+        # Runs in this thread, inside synthesis; the signal hands it to the UI.
+        self.progress.emit(event)
+        self._log_progress(event)
 
     def run(self) -> None:
-        self._run_captured(lambda: core.file_to_audio(**self._args))
+        self._run_captured(
+            lambda: core.file_to_audio(**self._args, cancel=self._cancel, progress=self._on_progress)
+        )
+
+    def cancel(self) -> None:
+        """Stop the conversion; safe to call from the main thread."""
+        self._cancel.cancel()
 
 
 class GutenbergSearchWorker(QThread):
@@ -168,7 +180,7 @@ class GutenbergDownloadWorker(QThread):
         self._prefer = prefer
 
     def run(self) -> None:
-        handler = _SignalLogHandler(self.message.emit, lambda _pct: None, logging.INFO)
+        handler = _SignalLogHandler(self.message.emit, logging.INFO)
         logger = logging.getLogger("echo.gutenberg")
         prior = logger.level
         logger.setLevel(logging.INFO)
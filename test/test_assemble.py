@@ -61,6 +61,27 @@ class TestWavDuration:
             asm.audio_duration_ms(path)
 
 
+class TestJoinChunks:
+    def test_wav_pieces_join_into_one_file(self, tmp_path):
+        parts = [tmp_path / "a.wav", tmp_path / "b.wav"]
+        for part in parts:
+            write_pcm16_wav(b"\x00\x00" * 12_000, part, rate=24_000)
+        asm.join_chunks(parts, tmp_path / "joined.wav")
+        assert asm.audio_duration_ms(tmp_path / "joined.wav") == pytest.approx(1000, abs=2)
+
+    def test_wavs_of_different_rates_are_refused(self, tmp_path):
+        write_pcm16_wav(b"\x00\x00" * 100, tmp_path / "a.wav", rate=24_000)
+        write_pcm16_wav(b"\x00\x00" * 100, tmp_path / "b.wav", rate=16_000)
+        with pytest.raises(ValueError):
+            asm.join_chunks([tmp_path / "a.wav", tmp_path / "b.wav"], tmp_path / "joined.wav")
+
+    def test_mp3_tags_are_stripped_before_joining(self):
+        frames = b"\xff\xfb" + b"\x00" * 50
+        id3v2 = b"ID3\x04\x00\x00\x00\x00\x00\x05" + b"x" * 5
+        id3v1 = b"TAG" + b"\x00" * 125
+        assert asm.mp3_frames(id3v2 + frames + id3v1) == frames
+
+
 class TestChapterMarks:
     def test_marks_are_contiguous(self):
         marks = asm.chapter_marks(["One", "Two", "Three"], [[1000, 500], [2000], [750, 250]])
@@ -0,0 +1,73 @@
+"""The cross-run synthesis cache: keys, hits, LRU eviction and its stats."""
+
+import pytest
+
+from echo.audio.cache import SynthesisCache, synthesis_key
+from echo.audio.wav import write_pcm16_wav
+from echo.document import Timing
+
+
+class _Engine:
+    name = "fake"
+
+    def __init__(self, model=""):
+        self.model = model
+
+
+def wav(path, seconds=1):
+    write_pcm16_wav(b"\x00\x00" * 24_000 * seconds, path, rate=24_000)
+    return path
+
+
+class TestKey:
+    def test_identical_requests_share_a_key(self):
+        assert synthesis_key(_Engine(), "v", 1.0, "Hello.") == synthesis_key(_Engine(), "v", 1.0, "Hello.")
+
+    @pytest.mark.parametrize(
+        "other",
+        [
+            (_Engine(), "w", 1.0, "Hello."),
+            (_Engine(), "v", 1.25, "Hello."),
+            (_Engine(), "v", 1.0, "Hello!"),
+            (_Engine(model="other-model"), "v", 1.0, "Hello."),
+        ],
+    )
+    def test_anything_that_changes_the_audio_changes_the_key(self, other):
+        assert synthesis_key(_Engine(), "v", 1.0, "Hello.") != synthesis_key(*other)
+
+
+class TestCache:
+    def test_a_stored_utterance_is_copied_back_out(self, tmp_path):
+        cache = SynthesisCache(tmp_path / "cache")
+        cache.put("k" * 64, wav(tmp_path / "a.wav"), 1000, [Timing(0, 900, "Hello")])
+
+        hit = cache.get("k" * 64, tmp_path / "b.wav")
+        assert hit is not None
+        assert hit.duration_ms == 1000
+        assert hit.timings == [Timing(0, 900, "Hello")]
+        assert (tmp_path / "b.wav").read_bytes() == (tmp_path / "a.wav").read_bytes()
+
+    def test_a_miss_returns_none_and_is_counted(self, tmp_path):
+        cache = SynthesisCache(tmp_path / "cache")
+        assert cache.get("0" * 64, tmp_path / "b.wav") is None
+        assert cache.stats().misses == 1
+
+    def test_the_least_recently_used_entry_is_evicted_first(self, tmp_path):
+        source = wav(tmp_path / "a.wav")
+        size = source.stat().st_size
+        cache = SynthesisCache(tmp_path / "cache", max_bytes=2 * size)
+        cache.put("a" * 64, source, 1000)
+        cache.put("b" * 64, source, 1000)
+        assert cache.get("a" * 64, tmp_path / "out.wav")  # "a" is now the fresher one
+        cache.put("c" * 64, source, 1000)
+
+        assert cache.get("b" * 64, tmp_path / "out.wav") is None
+        assert cache.get("a" * 64, tmp_path / "out.wav") is not None
+        assert cache.stats().entries == 2
+
+    def test_stats_survive_a_new_instance(self, tmp_path):
+        SynthesisCache(tmp_path / "cache").put("a" * 64, wav(tmp_path / "a.wav"), 1000)
+        SynthesisCache(tmp_path / "cache").get("a" * 64, tmp_path / "out.wav")
+        stats = SynthesisCache(tmp_path / "cache").stats()
+        assert (stats.entries, stats.hits) == (1, 1)
+        assert "1 hit(s)" in str(stats)
@@ -0,0 +1,92 @@
+"""Cooperative cancellation: the token, its scope, and killing ffmpeg."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+import echo.audio.assemble as asm
+from echo.cancel import Cancelled, CancelToken, check, run_sync, scope
+
+HAVE_FFMPEG = asm.configure_ffmpeg() is not None
+
+
+def cancel_after(token: CancelToken, seconds: float) -> None:
+    threading.Timer(seconds, token.cancel).start()
+
+
+class TestToken:
+    def test_callbacks_run_once_on_cancel(self):
+        token = CancelToken()
+        calls = []
+        token.on_cancel(lambda: calls.append(1))
+        token.cancel()
+        token.cancel()
+        assert calls == [1]
+
+    def test_a_late_callback_runs_at_once(self):
+        token = CancelToken()
+        token.cancel()
+        calls = []
+        token.on_cancel(lambda: calls.append(1))
+        assert calls == [1]
+
+    def test_an_unregistered_callback_does_not_run(self):
+        token = CancelToken()
+        calls = []
+        token.on_cancel(lambda: calls.append(1))()
+        token.cancel()
+        assert calls == []
+
+    def test_check_sees_the_token_of_the_enclosing_scope(self):
+        token = CancelToken()
+
+        async def go():
+            async with scope(token):
+                token.cancel()
+                await asyncio.to_thread(check)
+
+        with pytest.raises(Cancelled):
+            asyncio.run(go())
+
+    def test_a_scope_converts_task_cancellation(self):
+        token = CancelToken()
+
+        async def go():
+            async with scope(token):
+                await asyncio.sleep(10)
+
+        cancel_after(token, 0.05)
+        with pytest.raises(Cancelled):
+            asyncio.run(go())
+
+
+class TestRunSync:
+    def test_it_does_not_wait_for_an_abandoned_thread(self):
+        """A blocking SDK call can't be interrupted, but nobody has to wait for it."""
+        token = CancelToken()
+
+        async def go():
+            async with scope(token):
+                await asyncio.to_thread(time.sleep, 3)
+
+        cancel_after(token, 0.1)
+        started = time.monotonic()
+        with pytest.raises(Cancelled):
+            run_sync(go())
+        assert time.monotonic() - started < 1
+
+
+@pytest.mark.skipif(not HAVE_FFMPEG, reason="ffmpeg not installed")
+class TestStoppingFfmpeg:
+    def test_ffmpeg_is_killed(self, tmp_path):
+        token = CancelToken()
+        cancel_after(token, 0.3)
+        started = time.monotonic()
+        # Reads an endless silent source: only a kill ends it.
+        cmd = [asm._ffmpeg(), "-hide_banner", "-nostdin", "-y", "-re", "-f", "lavfi", "-i", "anullsrc"]
+        with pytest.raises(Cancelled):
+            asm._run([*cmd, str(tmp_path / "out.wav")], token)
+        assert time.monotonic() - started < 2
+        assert not (tmp_path / "out.wav").exists()
@@ -40,6 +40,14 @@ class TestToChunks:
         for i in range(50):
             assert f"Paragraph {i}." in rejoined
 
+    def test_a_ramp_starts_small_and_doubles_up_to_the_limit(self):
+        para = " ".join(f"This is sentence number {i}." for i in range(400))
+        chunks = to_chunks(para, max_chars=1000, first_chars=100)
+        assert [len(c) <= limit for c, limit in zip(chunks, (100, 200, 400, 800, 1000, 1000))] == [True] * 6
+        assert len(chunks[0]) > 50
+        assert max(len(c) for c in chunks[6:]) > 800
+        assert " ".join(chunks) == para
+
     def test_default_limit_comes_from_constants(self):
         assert to_chunks("short text") == ["short text"]
         assert ec.CHUNK_SIZE > 0
@@ -1,18 +1,35 @@
 """The engine registry and per-engine behaviour that does not need a network."""
 
 import asyncio
+import json
+import threading
 
 import pytest
 
 import echo.constants as ec
 from echo.audio.engines import (
     EngineUnavailable,
+    EngineBudget,
     available_engines,
+    close_connections,
+    engine_budget,
     engine_names,
     get_engine,
+    open_connections,
 )
-from echo.audio.engines.base import BaseEngine, VoiceInfo
+from echo.audio.engines.base import (
+    BaseEngine,
+    EngineThrottled,
+    EngineTimeout,
+    ErrorKind,
+    VoiceInfo,
+    classify_error,
+    retry_after,
+    watch_stream,
+)
+from echo.audio.engines import edge_session
 from echo.audio.engines.edge import EdgeEngine, speed_as_rate
+from echo.audio.engines.edge_session import EdgeSessionPool, SessionStats
 from echo.audio.engines.google import GeminiEngine, GoogleCloudEngine
 from echo.audio.engines.mlx import MlxEngine
 
@@ -77,6 +94,221 @@ class TestEngineContract:
             asyncio.run(BaseEngine().synthesize("hi", "v", 1.0, "x.mp3"))
 
 
+class TestEngineThreads:
+    def test_blocking_calls_run_on_the_engines_own_named_threads(self):
+        import threading
+
+        engine = GoogleCloudEngine()
+        name = asyncio.run(engine.run_blocking(lambda: threading.current_thread().name))
+        assert name.startswith("echo-google-cloud")
+        assert engine.executor()._max_workers == 2 * engine.peak_concurrency
+        engine.shutdown()
+
+    def test_the_cancel_token_follows_into_the_thread(self):
+        from echo import cancel
+
+        token = cancel.CancelToken()
+
+        async def run():
+            async with cancel.scope(token):
+                return await engine.run_blocking(cancel.current)
+
+        engine = MlxEngine()
+        assert asyncio.run(run()) is token
+        engine.shutdown()
+
+    def test_a_shut_down_pool_is_replaced_on_next_use(self):
+        engine = GeminiEngine(api_key="")
+        first = engine.executor()
+        engine.shutdown()
+        assert engine.executor() is not first
+        assert asyncio.run(engine.run_blocking(sum, [1, 2])) == 3
+        engine.shutdown()
+
+
+class TestEngineBudget:
+    @staticmethod
+    async def _hold(share, order, tag, seconds=0.01):
+        async with share.slot():
+            order.append(tag)
+            await asyncio.sleep(seconds)
+
+    def test_one_budget_per_engine(self):
+        engine = GoogleCloudEngine()
+        assert engine_budget(engine) is engine_budget(engine)
+        assert engine_budget(engine).slots == engine.peak_concurrency
+        assert engine_budget(engine) is not engine_budget(GoogleCloudEngine())
+
+    def test_a_run_alone_has_every_slot(self):
+        budget = EngineBudget("e", 3)
+        share = budget.share()
+
+        async def go():
+            order = []
+            await asyncio.gather(*(self._hold(share, order, n, 0.05) for n in range(3)))
+            return share.waited
+
+        assert asyncio.run(go()) < 0.04
+        assert budget.in_flight == 0
+
+    def test_a_freed_slot_goes_to_the_run_holding_fewest(self):
+        budget = EngineBudget("e", 2)
+        first, second = budget.share(), budget.share()
+
+        async def go():
+            order = []
+            # ``first`` takes both slots and queues two more before ``second`` asks.
+            tasks = [asyncio.create_task(self._hold(first, order, f"a{n}")) for n in range(4)]
+            await asyncio.sleep(0)
+            tasks.append(asyncio.create_task(self._hold(second, order, "b0")))
+            await asyncio.gather(*tasks)
+            return order
+
+        assert asyncio.run(go()).index("b0") == 2
+        assert second.others() == 1
+        second.close()
+        assert first.others() == 0
+
+    def test_runs_on_different_loops_share_one_cap(self):
+        budget = EngineBudget("e", 2)
+        lock = threading.Lock()
+        seen = {"now": 0, "most": 0}
+
+        async def one(share):
+            async with share.slot():
+                with lock:
+                    seen["now"] += 1
+                    seen["most"] = max(seen["most"], seen["now"])
+                await asyncio.sleep(0.005)
+                with lock:
+                    seen["now"] -= 1
+
+        async def book():
+            share = budget.share()
+            await asyncio.gather(*(one(share) for _ in range(10)))
+
+        books = [threading.Thread(target=asyncio.run, args=(book(),)) for _ in range(3)]
+        for b in books:
+            b.start()
+        for b in books:
+            b.join()
+        assert seen["most"] == 2
+        assert budget.in_flight == 0
+
+    def test_a_cancelled_waiter_gives_its_slot_back(self):
+        budget = EngineBudget("e", 1)
+        share = budget.share()
+
+        async def go():
+            holder = asyncio.create_task(self._hold(share, [], "a", 0.02))
+            await asyncio.sleep(0)
+            waiter = asyncio.create_task(self._hold(share, [], "b"))
+            await asyncio.sleep(0)
+            waiter.cancel()
+            await asyncio.gather(holder, waiter, return_exceptions=True)
+
+        asyncio.run(go())
+        assert budget.in_flight == 0
+        assert share.held == 0
+
+    def test_a_lock_directory_caps_every_process_using_it(self, tmp_path):
+        # Two budgets on one directory stand in for two processes.
+        here, there = EngineBudget("e", 1, lock_dir=tmp_path), EngineBudget("e", 1, lock_dir=tmp_path)
+
+        async def go():
+            order = []
+            await asyncio.gather(
+                self._hold(here.share(), order, "here", 0.1),
+                self._hold(there.share(), order, "there"),
+            )
+            return order
+
+        assert asyncio.run(go()) == ["here", "there"]
+        assert (tmp_path / "e.0.lock").exists()
+
+
+class TestStallWatchdog:
+    @staticmethod
+    async def _stream(items, pause_after=None):
+        for i, item in enumerate(items):
+            if i == pause_after:
+                await asyncio.sleep(10)
+            yield item
+
+    def _collect(self, stream, stall, is_progress=lambda _item: True):
+        async def go():
+            return [item async for item in watch_stream(stream, stall, is_progress)]
+
+        return asyncio.run(go())
+
+    def test_a_healthy_stream_passes_through(self):
+        assert self._collect(self._stream([1, 2, 3]), 1.0) == [1, 2, 3]
+
+    def test_a_quiet_stream_becomes_a_timeout(self):
+        with pytest.raises(EngineTimeout, match="stalled"):
+            self._collect(self._stream([1, 2, 3], pause_after=1), 0.05)
+
+    def test_only_progress_resets_the_clock(self):
+        """Metadata trickling in does not count as audio arriving."""
+
+        async def metadata_only():
+            yield "audio"
+            while True:
+                await asyncio.sleep(0.01)
+                yield "boundary"
+
+        with pytest.raises(EngineTimeout):
+            self._collect(metadata_only(), 0.1, lambda item: item == "audio")
+
+    def test_a_timeout_is_a_timeout_error(self):
+        assert issubclass(EngineTimeout, TimeoutError)
+
+
+class _HttpError(Exception):
+    def __init__(self, status, message="", headers=None):
+        super().__init__(message or f"HTTP {status}")
+        self.status = status
+        self.headers = headers or {}
+
+
+class TestErrorClassification:
+    def test_bad_credentials_are_fatal(self):
+        assert classify_error(_HttpError(401)).kind is ErrorKind.FATAL
+
+    def test_a_429_is_throttling_with_its_retry_after(self):
+        verdict = classify_error(_HttpError(429, headers={"Retry-After": "12"}))
+        assert verdict.kind is ErrorKind.THROTTLED
+        assert verdict.retry_after == 12.0
+
+    def test_the_status_is_found_on_the_cause(self):
+        try:
+            try:
+                raise _HttpError(401)
+            except _HttpError as ex:
+                raise RuntimeError("wrapped") from ex
+        except RuntimeError as ex:
+            assert classify_error(ex).kind is ErrorKind.FATAL
+
+    @pytest.mark.parametrize("error", [RuntimeError("reset by peer"), EngineTimeout("stalled"), _HttpError(503)])
+    def test_everything_else_is_transient(self, error):
+        assert classify_error(error).kind is ErrorKind.TRANSIENT
+
+    def test_an_explicit_throttle_keeps_its_delay(self):
+        assert classify_error(EngineThrottled("slow down", retry_after=3)).retry_after == 3
+
+    def test_a_retry_delay_in_the_message_is_read(self):
+        assert retry_after(RuntimeError("429 RESOURCE_EXHAUSTED {'retryDelay': '33s'}")) == 33.0
+
+    def test_edge_treats_a_403_as_transient(self):
+        """Edge has no credentials to get wrong; its 403s are refused handshakes."""
+        assert EdgeEngine().classify_error(_HttpError(403)).kind is ErrorKind.TRANSIENT
+        assert BaseEngine().classify_error(_HttpError(403)).kind is ErrorKind.FATAL
+
+    def test_gemini_reads_an_invalid_key_as_fatal(self):
+        error = _HttpError(400, "400 INVALID_ARGUMENT. API key not valid. Please pass a valid API key.")
+        assert GeminiEngine(api_key="x").classify_error(error).kind is ErrorKind.FATAL
+
+
 class TestEdgeEngine:
     @pytest.mark.parametrize(
         "speed,expected",
@@ -101,6 +333,176 @@ class TestEdgeEngine:
     def test_needs_no_setup(self):
         assert EdgeEngine().is_available() == (True, "")
 
+    def test_streamed_audio_and_word_timings_reach_the_chunk_file(self, tmp_path, monkeypatch):
+        import edge_tts
+
+        class FakeCommunicate:
+            def __init__(self, text, voice, rate):
+                pass
+
+            async def stream(self):
+                yield {"type": "WordBoundary", "offset": 0, "duration": 5_000_000, "text": "Hello"}
+                for i in range(3):
+                    yield {"type": "audio", "data": bytes([i]) * 10}
+
+        monkeypatch.setattr(edge_tts, "Communicate", FakeCommunicate)
+        monkeypatch.setattr(ec, "EDGE_POOL_SIZE", 0)
+        out = tmp_path / "chunk.mp3"
+        result = asyncio.run(EdgeEngine().synthesize("Hello", "en-GB-SoniaNeural", 1.0, out))
+        assert out.read_bytes() == b"\x00" * 10 + b"\x01" * 10 + b"\x02" * 10
+        assert [(t.start_ms, t.end_ms, t.text) for t in result.timings] == [(0, 500, "Hello")]
+
+
+class FakeEdgeService:
+    """A local websocket speaking Edge's turns: audio, a sentence boundary, ``turn.end``."""
+
+    def __init__(self, close_after: int = None):
+        self.close_after = close_after
+        self.connections = 0
+        self.configs = 0
+        self.ssml: list[str] = []
+
+    async def handle(self, request):
+        from aiohttp import web
+
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self.connections += 1
+        turns = 0
+        async for message in ws:
+            if "Path:speech.config" in message.data:
+                self.configs += 1
+                continue
+            self.ssml.append(message.data)
+            await ws.send_str("X-RequestId:x\r\nPath:turn.start\r\n\r\n{}")
+            head = b"X-RequestId:x\r\nContent-Type:audio/mpeg\r\nPath:audio"
+            await ws.send_bytes(len(head).to_bytes(2, "big") + head + b"\xff" * 6000)
+            metadata = {
+                "Metadata": [
+                    {"Type": "SentenceBoundary", "Data": {"Offset": 0, "Duration": 5_000_000, "text": {"Text": "Hi"}}}
+                ]
+            }
+            await ws.send_str("X-RequestId:x\r\nPath:audio.metadata\r\n\r\n" + json.dumps(metadata))
+            await ws.send_str("X-RequestId:x\r\nPath:turn.end\r\n\r\n{}")
+            turns += 1
+            if turns == self.close_after:
+                await ws.close()
+        return ws
+
+    async def serve(self, body):
+        from aiohttp import web
+
+        app = web.Application()
+        app.router.add_get("/edge", self.handle)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        try:
+            return await body(f"ws://127.0.0.1:{port}/edge?TrustedClientToken=x")
+        finally:
+            await runner.cleanup()
+
+
+class TestEdgeSessions:
+    @staticmethod
+    async def _say(pool, text):
+        return [chunk async for chunk in pool.stream(text, "en-GB-SoniaNeural", "+0%")]
+
+    def test_consecutive_utterances_share_one_connection(self):
+        service = FakeEdgeService()
+        stats = SessionStats()
+
+        async def body(url):
+            pool = EdgeSessionPool(stats, size=2, url=url)
+            results = [await self._say(pool, f"Sentence {n}.") for n in range(3)]
+            await pool.close()
+            return results
+
+        results = asyncio.run(service.serve(body))
+        assert service.connections == 1 and service.configs == 1
+        assert (stats.requests, stats.handshakes, stats.reused) == (3, 1, 2)
+        assert stats.mean_handshake_ms is not None
+        assert [c["type"] for c in results[0]] == ["audio", "SentenceBoundary"]
+        assert "Sentence 2." in service.ssml[2]
+
+    def test_a_connection_the_server_dropped_is_replaced_quietly(self):
+        service = FakeEdgeService(close_after=1)
+        stats = SessionStats()
+
+        async def body(url):
+            pool = EdgeSessionPool(stats, url=url)
+            for n in range(2):
+                await self._say(pool, f"Sentence {n}.")
+            await pool.close()
+
+        asyncio.run(service.serve(body))
+        assert (stats.requests, stats.handshakes, stats.dropped) == (2, 2, 1)
+
+    def test_offsets_continue_across_the_pieces_of_a_long_utterance(self):
+        service = FakeEdgeService()
+        stats = SessionStats()
+
+        async def body(url):
+            pool = EdgeSessionPool(stats, url=url)
+            chunks = await self._say(pool, "Word " * 1000)  # 5,000 bytes: two requests
+            await pool.close()
+            return chunks
+
+        boundaries = [c["offset"] for c in asyncio.run(service.serve(body)) if c["type"] == "SentenceBoundary"]
+        assert boundaries == [0, 6000 * 8 * 10_000_000 // 48_000]
+        assert stats.handshakes == 1 and stats.reused == 1
+
+    def test_an_abandoned_stream_does_not_go_back_to_the_pool(self):
+        service = FakeEdgeService()
+        stats = SessionStats()
+
+        async def body(url):
+            pool = EdgeSessionPool(stats, url=url)
+            stream = pool.stream("Sentence.", "en-GB-SoniaNeural", "+0%")
+            await anext(stream)
+            await stream.aclose()
+            await self._say(pool, "Again.")
+            await pool.close()
+
+        asyncio.run(service.serve(body))
+        assert service.connections == 2
+        assert stats.reused == 0
+
+    def test_the_engine_reports_its_connections(self, tmp_path, monkeypatch):
+        service = FakeEdgeService()
+        engine = EdgeEngine()
+
+        async def body(url):
+            monkeypatch.setattr(edge_session, "WSS_URL", url)
+            for n in range(2):
+                await engine.synthesize(f"Sentence {n}.", "en-GB-SoniaNeural", 1.0, tmp_path / f"{n}.mp3")
+            await close_connections(engine)
+
+        asyncio.run(service.serve(body))
+        assert (tmp_path / "1.mp3").stat().st_size == 6000
+        assert engine.connection_summary().startswith("2 request(s) over 1 connection(s), 1 on a warm one")
+
+
+    def test_a_run_ending_keeps_the_pool_for_one_still_going(self, tmp_path, monkeypatch):
+        service = FakeEdgeService()
+        engine = EdgeEngine()
+
+        async def body(url):
+            monkeypatch.setattr(edge_session, "WSS_URL", url)
+            open_connections(engine)  # a long conversion
+            open_connections(engine)  # and a short one alongside it
+            await engine.synthesize("Sentence 0.", "en-GB-SoniaNeural", 1.0, tmp_path / "0.mp3")
+            await close_connections(engine)  # the short one ends
+            await engine.synthesize("Sentence 1.", "en-GB-SoniaNeural", 1.0, tmp_path / "1.mp3")
+            await close_connections(engine)
+            assert not engine._pools
+
+        asyncio.run(service.serve(body))
+        assert service.connections == 1
+        assert engine.session_stats.reused == 1
+
 
 class TestGoogleEngines:
     def test_gemini_says_what_is_missing_without_a_key(self):
@@ -143,6 +545,10 @@ class TestGoogleEngines:
         assert GoogleCloudEngine().supports_speed is True
 
 
+    def test_quotas_come_from_the_environment(self):
+        assert GeminiEngine.requests_per_minute == (ec.GEMINI_RPM or None)
+        assert GoogleCloudEngine.chars_per_minute == (ec.GOOGLE_CLOUD_CPM or None)
+
 class TestMlxEngine:
     def test_kokoro_voice_names_decode_to_language_and_gender(self):
         voices = MlxEngine(model_id="prince-canuma/Kokoro-82M").voices()
@@ -764,6 +764,20 @@ class TestQueueDialog:
         assert "alpha" in dialog.current_label.text()
         assert dialog.pending_list.count() == 1
 
+    def test_the_running_job_can_be_stopped(self, app):
+        q = self.loaded_queue()
+        q.pop_next()
+        stopped = []
+        dialog = QueueDialog(q, on_stop=lambda: stopped.append(True))
+        assert dialog.stop_btn.isEnabled()
+        dialog._stop()
+        assert stopped == [True]
+
+    def test_there_is_nothing_to_stop_when_idle(self, app):
+        dialog = QueueDialog(self.loaded_queue(), on_stop=lambda: None)
+        assert not dialog.stop_btn.isEnabled()
+        assert QueueDialog(self.loaded_queue()).stop_btn.isHidden()
+
     def test_removing_a_selected_job(self, app):
         q = self.loaded_queue()
         dialog = QueueDialog(q)
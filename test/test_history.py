@@ -0,0 +1,98 @@
+"""The engine history: what is recorded, and the starting points drawn from it."""
+
+import pytest
+
+from echo.audio import history as hist
+from echo.audio.history import EngineHistory
+from echo.audio.throttle import AimdController, Hedger
+from echo.progress import SynthesisProgress
+
+
+class Engine:
+    name = "edge"
+    max_concurrency = 4
+    peak_concurrency = 12
+    min_concurrency = 1
+
+
+def fill(history, voice="v", n=40, concurrency=4, per_char=0.001, errors=0):
+    for i in range(n):
+        failed = i < errors
+        history.record(
+            "edge",
+            voice,
+            1000,
+            None if failed else per_char * 1000,
+            None if failed else 60_000,
+            1,
+            "RuntimeError: 403" if failed else None,
+            concurrency,
+        )
+    history.flush()
+
+
+class TestPrior:
+    def test_too_little_history_gives_no_prior(self, tmp_path):
+        history = EngineHistory(tmp_path / "h.sqlite")
+        assert history.prior("edge", "v") is None
+        fill(history, n=5)
+        assert history.prior("edge", "v") is None
+
+    def test_the_median_latency_and_the_highest_clean_concurrency(self, tmp_path):
+        history = EngineHistory(tmp_path / "h.sqlite")
+        fill(history, concurrency=4, per_char=0.002)
+        fill(history, concurrency=8, per_char=0.002)
+        fill(history, concurrency=12, errors=10)  # 25% failed: not clean
+        prior = history.prior("edge", "v")
+        assert prior.seconds_per_char == pytest.approx(0.002)
+        assert prior.concurrency == 8
+        assert prior.chars_per_second == pytest.approx(8 / 0.002)
+
+    def test_a_new_voice_borrows_the_engines_record(self, tmp_path):
+        history = EngineHistory(tmp_path / "h.sqlite")
+        fill(history, voice="old")
+        assert history.prior("edge", "new") is not None
+
+    def test_old_rows_are_dropped(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(hist.ec, "HISTORY_MAX_ROWS", 30)
+        history = EngineHistory(tmp_path / "h.sqlite")
+        fill(history, n=50)
+        assert history.stats()[0].requests == 30
+
+
+class TestReport:
+    def test_it_summarises_each_engine_and_voice(self, tmp_path):
+        history = EngineHistory(tmp_path / "h.sqlite")
+        fill(history, errors=4)
+        report = history.report()
+        assert "edge" in report
+        assert "10.0% failed" in report
+        assert "1.00/1.00 ms/char p50/p90" in report
+        assert "60.0x real time" in report
+
+    def test_an_empty_history_says_so(self, tmp_path):
+        assert "No engine history yet" in EngineHistory(tmp_path / "h.sqlite").report()
+
+
+class TestSeeding:
+    def test_the_controller_starts_from_history(self, tmp_path):
+        history = EngineHistory(tmp_path / "h.sqlite")
+        fill(history, concurrency=9)
+        controller = AimdController.for_engine(Engine(), history.prior("edge", "v"))
+        assert controller.limit == 9
+        assert controller.ceiling == 12
+        assert AimdController.for_engine(Engine()).limit == 4
+
+    def test_the_hedger_has_a_threshold_from_the_first_request(self, tmp_path):
+        history = EngineHistory(tmp_path / "h.sqlite")
+        fill(history, per_char=0.01)
+        hedger = Hedger(percentile=0.9, min_delay=0)
+        assert hedger.delay_for(1000) is None
+        hedger.seed(history.prior("edge", "v").samples)
+        assert hedger.delay_for(1000) == pytest.approx(10.0)
+
+    def test_the_eta_is_known_before_any_chunk_finishes(self):
+        events = []
+        tracker = SynthesisProgress(events.append, chunks_total=10, chars_total=10_000, prior_rate=500.0)
+        tracker.emit()
+        assert events[-1].eta_seconds == pytest.approx(20.0)
@@ -0,0 +1,53 @@
+"""Chunk leases: one process per chunk, and a dead process's chunks taken over."""
+
+import os
+import time
+
+from echo.audio.lease import ChunkLeases, lease_path, script_fingerprint
+
+
+def age(path, seconds):
+    then = time.time() - seconds
+    os.utime(path, (then, then))
+
+
+class TestChunkLeases:
+    def test_only_one_process_gets_a_chunk(self, tmp_path):
+        first, second = ChunkLeases(tmp_path), ChunkLeases(tmp_path)
+        assert first.claim(3)
+        assert not second.claim(3)
+        assert second.claim(4)
+        assert first.claim(3)  # claiming again is a no-op for the holder
+
+    def test_a_lease_nobody_refreshes_is_taken_over(self, tmp_path):
+        first, second = ChunkLeases(tmp_path, stale_after=60), ChunkLeases(tmp_path, stale_after=60)
+        first.claim(0)
+        assert second.is_live(0)
+        age(lease_path(tmp_path, 0), 120)
+        assert not second.is_live(0)
+        assert second.claim(0)
+
+    def test_refreshing_keeps_a_lease_live(self, tmp_path):
+        leases = ChunkLeases(tmp_path, stale_after=60)
+        leases.claim(0)
+        age(lease_path(tmp_path, 0), 120)
+        leases.refresh()
+        assert ChunkLeases(tmp_path, stale_after=60).is_live(0)
+
+    def test_releasing_leaves_a_lease_someone_else_took_over(self, tmp_path):
+        first, second = ChunkLeases(tmp_path, stale_after=60), ChunkLeases(tmp_path, stale_after=60)
+        first.claim(0)
+        age(lease_path(tmp_path, 0), 120)
+        second.claim(0)
+        first.release(0)
+        assert lease_path(tmp_path, 0).exists()
+        second.release(0)
+        assert not lease_path(tmp_path, 0).exists()
+
+    def test_the_coordinators_script_is_there_for_helpers_to_check(self, tmp_path):
+        helper = ChunkLeases(tmp_path)
+        assert helper.published_script() is None
+        ChunkLeases(tmp_path).publish_script(script_fingerprint(["a", "b"]))
+        assert helper.published_script() == script_fingerprint(["a", "b"])
+        assert helper.published_script() != script_fingerprint(["b", "a"])
+        assert [p.name for p in tmp_path.iterdir()] == ["script.fingerprint"]
@@ -112,6 +112,17 @@ class TestBuildScript:
         with pytest.raises(IndexError):
             script.chapter_of(len(script.utterances()))
 
+    def test_a_fast_start_ramps_across_short_opening_chapters(self):
+        prose = " ".join(f"Sentence {i} is here." for i in range(300))
+        doc = self._doc()
+        doc.blocks.append(Block(BlockKind.PARAGRAPH, prose))
+        script = norm.build_script(doc, chunk_size=2000, first_chunk_chars=100)
+        sizes = [len(u) for u in script.utterances()]
+        # Front matter took the 100-character slot, chapter one the 200.
+        assert sizes[2] <= 400 and sizes[3] <= 800 and sizes[4] <= 1600
+        assert max(sizes) > 1600
+        assert len(norm.build_script(doc, chunk_size=2000).utterances()) < len(sizes)
+
     def test_deeper_headings_stay_inside_their_chapter(self):
         doc = self._doc()
         doc.blocks.append(Block(BlockKind.HEADING, "A subsection", level=4))
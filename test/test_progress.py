@@ -0,0 +1,80 @@
+"""Progress events: what they say, and the throughput and ETA behind them."""
+
+import pytest
+
+import echo.progress as progress
+from echo.progress import ProgressEvent, Stage, SynthesisProgress, format_duration
+
+
+class TestEvent:
+    def test_stages_outside_synthesis_read_as_their_label(self):
+        assert str(ProgressEvent(Stage.EXTRACT)) == "Reading the document"
+        assert ProgressEvent(Stage.EXTRACT).fraction == 0.0
+        assert ProgressEvent(Stage.ASSEMBLE).fraction == 1.0
+
+    def test_a_synthesis_event_says_how_far_how_fast_and_how_long(self):
+        event = ProgressEvent(
+            Stage.SYNTHESIZE,
+            chunks_done=3,
+            chunks_total=10,
+            chars_done=2500,
+            chars_total=10_000,
+            chars_per_second=1234.0,
+            in_flight=4,
+            retries=1,
+            eta_seconds=125,
+        )
+        assert event.fraction == 0.25
+        assert str(event) == (
+            "Synthesizing: 3/10 chunk(s) (25%), 1,234 chars/s, 4 in flight, 1 retried, about 2m 05s left"
+        )
+
+    @pytest.mark.parametrize(
+        ("seconds", "text"), [(0, "0s"), (59.4, "59s"), (61, "1m 01s"), (3600 * 2 + 60 * 5, "2h 05m")]
+    )
+    def test_durations(self, seconds, text):
+        assert format_duration(seconds) == text
+
+
+class TestSynthesisProgress:
+    def test_the_eta_follows_the_recent_rate(self, monkeypatch):
+        now = [100.0]
+        monkeypatch.setattr(progress.time, "monotonic", lambda: now[0])
+        events = []
+        tracker = SynthesisProgress(events.append, chunks_total=4, chars_total=4000)
+        for _ in range(2):
+            now[0] += 10
+            tracker.chunk_done(1000)
+        assert events[-1].chars_per_second == pytest.approx(100.0)
+        assert events[-1].eta_seconds == pytest.approx(20.0)
+
+    def test_resumed_work_counts_as_done_but_not_as_throughput(self):
+        events = []
+        tracker = SynthesisProgress(events.append, chunks_total=4, chars_total=4000)
+        tracker.resumed(2, 2000)
+        tracker.emit()
+        assert events[-1].fraction == 0.5
+        assert events[-1].chars_per_second == 0.0
+        assert events[-1].eta_seconds is None
+
+    def test_the_rate_window_forgets_old_chunks(self, monkeypatch):
+        now = [0.0]
+        monkeypatch.setattr(progress.time, "monotonic", lambda: now[0])
+        monkeypatch.setattr(SynthesisProgress, "WINDOW", 2)
+        events = []
+        tracker = SynthesisProgress(events.append, chunks_total=10, chars_total=10_000)
+        now[0] = 100.0  # a slow start...
+        tracker.chunk_done(100)
+        for _ in range(3):  # ...then a fast run
+            now[0] += 1
+            tracker.chunk_done(1000)
+        assert events[-1].chars_per_second == pytest.approx(1000.0)
+
+    def test_the_default_callback_logs_each_percent_once(self, caplog):
+        import logging
+
+        callback = progress.default_progress()
+        with caplog.at_level(logging.INFO, logger="echo.progress"):
+            for done in (0, 1, 1, 2):
+                callback(ProgressEvent(Stage.SYNTHESIZE, chars_done=done, chars_total=100))
+        assert len(caplog.messages) == 3
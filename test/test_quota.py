@@ -0,0 +1,83 @@
+"""The character-quota ledger and the pre-flight budget check."""
+
+import pytest
+
+from echo.audio.engines.google import GoogleCloudEngine
+from echo.audio.quota import QuotaExceeded, QuotaLedger, check_budget
+
+
+@pytest.fixture
+def ledger(tmp_path):
+    return QuotaLedger(tmp_path / "quota.sqlite")
+
+
+class _Metered:
+    name = "metered"
+    monthly_char_budget = {"Standard": 1000}
+
+    def voice_class(self, voice):
+        return "Standard" if "Standard" in voice else "Premium"
+
+
+class TestLedger:
+    def test_usage_accumulates_per_engine_class_and_month(self, ledger):
+        ledger.record("metered", "Standard", 300, month="2026-01")
+        ledger.record("metered", "Standard", 200, month="2026-01")
+        ledger.record("metered", "Premium", 50, month="2026-01")
+        ledger.record("metered", "Standard", 999, month="2026-02")
+        assert ledger.used("metered", "Standard", month="2026-01") == 500
+        assert ledger.used("metered", "Premium", month="2026-01") == 50
+
+    def test_requests_are_written_in_batches(self, ledger, tmp_path):
+        ledger.record("metered", "Standard", 300)
+        ledger.record("metered", "Standard", 200)
+        assert ledger.used("metered", "Standard") == 500  # counted before it is written
+        assert QuotaLedger(tmp_path / "quota.sqlite").used("metered", "Standard") == 0
+        assert not ledger.due
+        ledger.FLUSH_EVERY = 2
+        assert ledger.due
+        ledger.flush()
+        assert QuotaLedger(tmp_path / "quota.sqlite").used("metered", "Standard") == 500
+
+    def test_a_new_month_starts_from_zero(self, ledger):
+        ledger.record("metered", "Standard", 300, month="2020-01")
+        assert ledger.used("metered", "Standard") == 0
+
+    def test_only_budgeted_classes_have_a_budget(self, ledger):
+        ledger.record("metered", "Standard", 400)
+        budget = ledger.budget(_Metered(), "en-GB-Standard-A")
+        assert (budget.limit, budget.remaining) == (1000, 600)
+        assert ledger.budget(_Metered(), "en-GB-Premium-A") is None
+
+
+class TestCheckBudget:
+    def test_a_book_that_fits_goes_ahead(self, ledger):
+        assert check_budget(ledger, _Metered(), "Standard", 1000, "refuse")
+
+    def test_refuse_raises_before_anything_is_sent(self, ledger):
+        ledger.record("metered", "Standard", 900)
+        with pytest.raises(QuotaExceeded, match="only 100 are left"):
+            check_budget(ledger, _Metered(), "Standard", 500, "refuse")
+
+    def test_warn_goes_ahead(self, ledger, caplog):
+        ledger.record("metered", "Standard", 900)
+        assert check_budget(ledger, _Metered(), "Standard", 500, "warn")
+        assert "may be billed" in caplog.text
+
+    def test_route_asks_the_caller_to_switch(self, ledger):
+        ledger.record("metered", "Standard", 900)
+        assert not check_budget(ledger, _Metered(), "Standard", 500, "route")
+
+    def test_an_unknown_policy_is_an_error(self, ledger):
+        with pytest.raises(ValueError):
+            check_budget(ledger, _Metered(), "Standard", 1, "shrug")
+
+
+class TestVoiceClasses:
+    @pytest.mark.parametrize(
+        "voice, family",
+        [("en-GB-Standard-A", "Standard"), ("en-US-Wavenet-D", "WaveNet"), ("en-GB-Neural2-C", "Neural2")],
+    )
+    def test_cloud_voices_are_classed_by_family(self, voice, family):
+        assert GoogleCloudEngine().voice_class(voice) == family
+        assert family in GoogleCloudEngine.monthly_char_budget
@@ -6,16 +6,28 @@ network service's.
 
 import asyncio
 import os
+import re
 import tempfile
+import threading
+import time
 from pathlib import Path
 
 import pytest
 
 import echo.audio.tts as tts
 import echo.core as core
-from echo.audio.engines.base import BaseEngine, EngineUnavailable, SynthOutput
+from echo.audio.cache import SynthesisCache, synthesis_key
+from echo.audio.engines import engine_budget
+from echo.audio.engines.base import BaseEngine, EngineThrottled, EngineUnavailable, SynthOutput
+from echo.audio.history import EngineHistory
+from echo.audio.lease import ChunkLeases
+from echo.audio.manifest import ChunkManifest
+from echo.audio.quota import QuotaLedger
+from echo.audio.throttle import CircuitBreaker
+from echo.cancel import Cancelled, CancelToken
 from echo.audio.wav import write_pcm16_wav
 from echo.document import Chapter, Script, Timing, Utterance
+from echo.progress import Stage
 
 
 class FakeEngine(BaseEngine):
@@ -28,7 +40,13 @@ class FakeEngine(BaseEngine):
     max_chars = 1000
     supports_speed = True
 
-    def __init__(self, fail_times: int = 0, fail_always_at: set[int] = None, with_timings: bool = False):
+    def __init__(
+        self,
+        fail_times: int = 0,
+        fail_always_at: set[int] = None,
+        with_timings: bool = False,
+        fail_over_chars: int = None,
+    ):
         self.calls = 0
         self.per_index_calls: dict[int, int] = {}
         self.texts: list[str] = []
@@ -36,6 +54,7 @@ class FakeEngine(BaseEngine):
         self._fail_times = fail_times
         self._fail_always_at = fail_always_at or set()
         self._with_timings = with_timings
+        self._fail_over_chars = fail_over_chars
 
     def voices(self):
         return []
@@ -48,12 +67,14 @@ class FakeEngine(BaseEngine):
         self.texts.append(text)
         self.speeds.append(speed)
         # Chunk files are chunk_%05d; anything else (a voice preview) has no index.
-        stem = out_path.stem.split("_")[-1]
-        index = int(stem) if stem.isdigit() else -1
+        match = re.match(r"chunk_(\d+)", out_path.name)
+        index = int(match.group(1)) if match else -1
         self.per_index_calls[index] = self.per_index_calls.get(index, 0) + 1
 
         if index in self._fail_always_at:
             raise RuntimeError(f"index {index} always fails")
+        if self._fail_over_chars is not None and len(text) > self._fail_over_chars:
+            raise RuntimeError("request too long")
         if self.per_index_calls[index] <= self._fail_times:
             raise RuntimeError("transient websocket 403")
 
@@ -69,9 +90,11 @@ def script_of(n: int) -> Script:
     )
 
 
-def run(script, engine, chunks_dir, resume=True):
+def run(script, engine, chunks_dir, resume=True, **kwargs):
     return asyncio.run(
-        tts.synthesize_script(script, engine=engine, voice="v", speed=1.0, chunks_dir=chunks_dir, resume=resume)
+        tts.synthesize_script(
+            script, engine=engine, voice="v", speed=1.0, chunks_dir=chunks_dir, resume=resume, **kwargs
+        )
     )
 
 
@@ -104,6 +127,49 @@ class TestRetry:
         assert len(segments) == 3
         assert engine.calls == 6  # one failure + one success each
 
+    def test_a_backing_off_chunk_does_not_hold_its_slot(self, tmp_path, monkeypatch):
+        """With one slot, the rest of the book goes ahead while chunk 0 waits."""
+        monkeypatch.setattr(tts.ec, "RETRY_BACKOFF_SECONDS", 0.2)
+
+        class SerialEngine(FakeEngine):
+            max_concurrency = 1
+
+        engine = SerialEngine()
+        real = engine.synthesize
+
+        async def fail_chunk_zero_once(text, voice, speed, out_path):
+            if text == "Passage 0." and text not in engine.texts:
+                engine.texts.append(text)
+                raise RuntimeError("transient websocket 403")
+            return await real(text, voice, speed, out_path)
+
+        monkeypatch.setattr(engine, "synthesize", fail_chunk_zero_once)
+        assert len(run(script_of(4), engine, tmp_path / "chunks")) == 4
+        assert engine.texts == ["Passage 0.", "Passage 1.", "Passage 2.", "Passage 3.", "Passage 0."]
+
+    def test_a_hung_request_hits_its_deadline_and_is_retried(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(tts.ec, "RETRY_BACKOFF_SECONDS", 0.0)
+        monkeypatch.setattr(tts.ec, "CHUNK_DEADLINE_SECONDS", 0.1)
+        monkeypatch.setattr(tts.ec, "CHUNK_DEADLINE_PER_CHAR", 0.0)
+
+        class HangingEngine(FakeEngine):
+            async def synthesize(self, text, voice, speed, out_path):
+                if text == "Passage 1." and text not in self.texts:
+                    self.texts.append(text)
+                    await asyncio.Event().wait()  # never returns
+                return await super().synthesize(text, voice, speed, out_path)
+
+        engine = HangingEngine()
+        assert len(run(script_of(3), engine, tmp_path / "chunks")) == 3
+        assert engine.texts.count("Passage 1.") == 2
+
+    def test_the_deadline_grows_with_the_text(self, monkeypatch):
+        monkeypatch.setattr(tts.ec, "CHUNK_DEADLINE_SECONDS", 10.0)
+        monkeypatch.setattr(tts.ec, "CHUNK_DEADLINE_PER_CHAR", 0.01)
+        assert tts._deadline_for(Utterance("x" * 1000)) == 20.0
+        monkeypatch.setattr(tts.ec, "CHUNK_DEADLINE_SECONDS", 0.0)
+        assert tts._deadline_for(Utterance("x" * 1000)) is None
+
     def test_persistent_failure_names_the_chunk_and_keeps_the_others(self, tmp_path):
         chunks = tmp_path / "chunks"
         with pytest.raises(tts.SynthesisError) as excinfo:
@@ -115,6 +181,162 @@ class TestRetry:
         assert len(list(chunks.glob("*.wav"))) == 3
 
 
+class TestErrorKinds:
+    class _Unauthorized(RuntimeError):
+        status = 401
+
+    def test_a_fatal_error_stops_the_run_instead_of_retrying_every_chunk(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(tts.ec, "RETRY_BACKOFF_SECONDS", 0.0)
+
+        class BadKeyEngine(FakeEngine):
+            max_concurrency = 1
+
+            async def synthesize(self, text, voice, speed, out_path):
+                self.calls += 1
+                raise TestErrorKinds._Unauthorized("API key rejected")
+
+        engine = BadKeyEngine()
+        with pytest.raises(tts.SynthesisError, match="API key rejected"):
+            run(script_of(50), engine, tmp_path / "chunks")
+        assert engine.calls == 1
+
+    def test_throttling_costs_no_attempts(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(tts.ec, "RETRY_BACKOFF_SECONDS", 0.0)
+
+        class ThrottledEngine(FakeEngine):
+            """Says "not now" more times than a chunk has attempts."""
+
+            async def synthesize(self, text, voice, speed, out_path):
+                if self.texts.count(text) <= tts.ec.MAX_RETRIES:
+                    self.texts.append(text)
+                    raise EngineThrottled("slow down", retry_after=0.01)
+                return await super().synthesize(text, voice, speed, out_path)
+
+        assert len(run(script_of(1), ThrottledEngine(), tmp_path / "chunks")) == 1
+
+    def test_a_burst_of_failures_pauses_every_request(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(tts.ec, "RETRY_BACKOFF_SECONDS", 0.0)
+        monkeypatch.setattr(tts.ec, "BREAKER_COOLDOWN_SECONDS", 0.0)
+        monkeypatch.setattr(tts.ec, "MAX_RETRIES", 5)
+        breakers = []
+        monkeypatch.setattr(tts, "CircuitBreaker", lambda: breakers.append(CircuitBreaker()) or breakers[-1])
+
+        class OutageEngine(FakeEngine):
+            """Down for its first ten requests, then fine."""
+
+            async def synthesize(self, text, voice, speed, out_path):
+                self.calls += 1
+                if self.calls <= 10:
+                    raise RuntimeError("503 service unavailable")
+                self.calls -= 1  # counted again by FakeEngine
+                return await super().synthesize(text, voice, speed, out_path)
+
+        stats = tts.RunStats()
+        assert len(run(script_of(12), OutageEngine(), tmp_path / "chunks", stats=stats)) == 12
+        assert stats.failed == 0
+        assert breakers[0].state == "closed"
+
+
+class TestBisect:
+    SENTENCES = "One sentence here. Another one follows. A third comes along. And the last one."
+
+    def test_a_chunk_that_keeps_failing_is_split_and_joined_into_its_slot(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(tts.ec, "RETRY_BACKOFF_SECONDS", 0.0)
+        script = Script(title="T", chapters=[Chapter(title="C", utterances=[Utterance(self.SENTENCES)])])
+        engine = FakeEngine(fail_over_chars=45, with_timings=True)
+        stats = tts.RunStats()
+        chunks = tmp_path / "chunks"
+
+        (segment,) = run(script, engine, chunks, stats=stats)
+
+        assert segment.path == chunks / "chunk_00000.wav"
+        assert segment.duration_ms == 2000  # two one-second halves
+        assert [t.start_ms for t in segment.timings] == [0, 1000]
+        assert sorted(p.name for p in chunks.glob("*.wav")) == ["chunk_00000.wav"]
+        assert stats.bisected == [0]
+        assert "One sentence here. Another one follows." in engine.texts
+
+    def test_halves_that_still_fail_are_split_again(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(tts.ec, "RETRY_BACKOFF_SECONDS", 0.0)
+        script = Script(title="T", chapters=[Chapter(title="C", utterances=[Utterance(self.SENTENCES)])])
+
+        (segment,) = run(script, FakeEngine(fail_over_chars=20), tmp_path / "chunks")
+        assert segment.duration_ms == 4000
+
+    def test_an_unsplittable_chunk_still_fails(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(tts.ec, "RETRY_BACKOFF_SECONDS", 0.0)
+        script = Script(title="T", chapters=[Chapter(title="C", utterances=[Utterance("x" * 60)])])
+        with pytest.raises(tts.SynthesisError, match="chunk 0"):
+            run(script, FakeEngine(fail_over_chars=45), tmp_path / "chunks")
+
+    def test_a_join_replaces_the_chunk_rather_than_writing_into_it(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(tts.ec, "RETRY_BACKOFF_SECONDS", 0.0)
+        script = Script(title="T", chapters=[Chapter(title="C", utterances=[Utterance(self.SENTENCES)])])
+        chunks = tmp_path / "chunks"
+        chunks.mkdir()
+        # A stale chunk hard-linked to another file, as a repeat's would be.
+        other = tmp_path / "other.wav"
+        write_pcm16_wav(b"\x01\x00" * 100, other, rate=24_000)
+        os.link(other, chunks / "chunk_00000.wav")
+
+        run(script, FakeEngine(fail_over_chars=45), chunks, resume=False)
+        assert other.read_bytes()[44:] == b"\x01\x00" * 100
+        assert not list(chunks.glob("*.join.*"))
+
+    def test_a_failed_join_goes_through_the_failure_path(self, tmp_path, monkeypatch):
+        import echo.audio.assemble as asm
+
+        monkeypatch.setattr(tts.ec, "RETRY_BACKOFF_SECONDS", 0.0)
+        monkeypatch.setattr(tts.ec, "MAX_BISECT_DEPTH", 1)
+
+        def broken(parts, output_path):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(asm, "join_chunks", broken)
+        script = Script(title="T", chapters=[Chapter(title="C", utterances=[Utterance(self.SENTENCES)])])
+        with pytest.raises(tts.SynthesisError, match="disk full"):
+            run(script, FakeEngine(fail_over_chars=45), tmp_path / "chunks")
+
+    def test_the_split_lands_on_the_sentence_nearest_the_middle(self):
+        assert tts._bisect_text("A. B. Quite a long third sentence.") == ("A. B.", "Quite a long third sentence.")
+        assert tts._bisect_text("No boundary at all") is None
+
+
+class TestCancel:
+    class SlowEngine(FakeEngine):
+        """Half a second per utterance: a book far too long to wait for."""
+
+        async def synthesize(self, text, voice, speed, out_path):
+            await asyncio.sleep(0.5)
+            return await super().synthesize(text, voice, speed, out_path)
+
+    def test_a_run_stops_within_a_second_and_keeps_its_chunks(self, tmp_path):
+        token = CancelToken()
+        chunks = tmp_path / "chunks"
+        threading.Timer(1.2, token.cancel).start()
+        started = time.monotonic()
+        with pytest.raises(Cancelled):
+            run(script_of(200), self.SlowEngine(), chunks, cancel=token)
+        assert time.monotonic() - started < 2.2
+        finished = sorted(chunks.glob("chunk_*.wav"))
+        assert finished
+        assert not list(chunks.glob("*.part*"))  # nothing half-written left behind
+
+        # ...and a second run picks up where the first stopped.
+        engine = FakeEngine()
+        segments = run(script_of(200), engine, chunks)
+        assert len(segments) == 200
+        assert engine.calls == 200 - len(finished)
+
+    def test_an_already_cancelled_token_sends_nothing(self, tmp_path):
+        token = CancelToken()
+        token.cancel()
+        engine = FakeEngine()
+        with pytest.raises(Cancelled):
+            run(script_of(3), engine, tmp_path, cancel=token)
+        assert engine.calls == 0
+
+
 class TestResume:
     def test_existing_chunks_are_reused(self, tmp_path):
         chunks = tmp_path / "chunks"
@@ -147,6 +369,42 @@ class TestResume:
         run(script, second, chunks)
         assert set(second.per_index_calls) == {1}
 
+    def test_a_chunk_whose_text_changed_is_redone(self, tmp_path):
+        chunks = tmp_path / "chunks"
+        run(script_of(3), FakeEngine(), chunks)
+        edited = script_of(3)
+        edited.chapters[1].utterances[0] = Utterance("Passage one, revised.")
+
+        second = FakeEngine()
+        run(edited, second, chunks)
+        assert second.texts == ["Passage one, revised."]
+
+    def test_resuming_reads_the_manifest_not_the_audio(self, tmp_path, monkeypatch):
+        chunks = tmp_path / "chunks"
+        run(script_of(3), FakeEngine(with_timings=True), chunks)
+        monkeypatch.setattr(tts, "_usable", lambda path: pytest.fail(f"{path.name} was parsed"))
+
+        segments = run(script_of(3), FakeEngine(), chunks)
+        assert [s.duration_ms for s in segments] == [1000] * 3
+        assert all(s.timings for s in segments), "timings should survive a resume"
+
+    def test_chunks_without_a_manifest_are_still_reused(self, tmp_path):
+        """A chunks directory left by an older echo has no manifest."""
+        chunks = tmp_path / "chunks"
+        run(script_of(3), FakeEngine(), chunks)
+        (chunks / "manifest.jsonl").unlink()
+
+        second = FakeEngine()
+        run(script_of(3), second, chunks)
+        assert second.calls == 0
+
+    def test_no_part_files_are_left_behind(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(tts.ec, "RETRY_BACKOFF_SECONDS", 0.0)
+        chunks = tmp_path / "chunks"
+        with pytest.raises(tts.SynthesisError):
+            run(script_of(3), FakeEngine(fail_always_at={1}), chunks)
+        assert not list(chunks.glob("*.part*"))
+
     def test_resume_can_be_switched_off(self, tmp_path):
         chunks = tmp_path / "chunks"
         script = script_of(3)
@@ -156,6 +414,119 @@ class TestResume:
         assert second.calls == 3
 
 
+class TestHedging:
+    def test_a_straggler_is_hedged_and_the_hedge_wins(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(tts.ec, "HEDGE_MIN_SECONDS", 0.05)
+
+        class StallingEngine(FakeEngine):
+            max_concurrency = 1
+
+            async def synthesize(self, text, voice, speed, out_path):
+                if text == "Passage 12." and text not in self.texts:
+                    self.texts.append(text)
+                    await asyncio.sleep(30)  # a stream that never finishes
+                return await super().synthesize(text, voice, speed, out_path)
+
+        stats = tts.RunStats()
+        segments = run(script_of(15), StallingEngine(), tmp_path / "chunks", hedge=True, stats=stats)
+        assert len(segments) == 15
+        assert stats.hedged == [12]
+        assert stats.hedges_won == 1
+        assert segments[12].path.name == "chunk_00012.wav"
+        assert not list((tmp_path / "chunks").glob("*.hedge.*"))
+        assert not list((tmp_path / "chunks").glob("*.part.*"))
+
+    def test_a_request_queued_for_a_busy_budget_is_not_hedged(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(tts.ec, "HEDGE_MIN_SECONDS", 0.05)
+        history = EngineHistory(tmp_path / "history.sqlite")
+        for _ in range(tts.ec.HISTORY_MIN_SAMPLES):
+            history.record("fake", "v", 1000, 0.001, 1000, 1, None, 1)  # hedging has its norm from the start
+        history.flush()
+
+        class OneAtATime(FakeEngine):
+            max_concurrency = 1
+
+        engine = OneAtATime()
+        stats = tts.RunStats()
+
+        async def main():
+            other = engine_budget(engine).share()  # another conversion holds the only slot
+
+            async def busy():
+                async with other.slot():
+                    await asyncio.sleep(0.3)
+
+            holder = asyncio.create_task(busy())
+            await asyncio.sleep(0)
+            try:
+                return await tts.synthesize_script(
+                    script_of(3),
+                    engine=engine,
+                    voice="v",
+                    speed=1.0,
+                    chunks_dir=tmp_path / "chunks",
+                    hedge=True,
+                    history=history,
+                    stats=stats,
+                )
+            finally:
+                await holder
+                other.close()
+
+        assert len(asyncio.run(main())) == 3
+        assert stats.hedged == []
+        assert engine.calls == 3
+
+    def test_hedging_is_opt_in(self, tmp_path):
+        stats = tts.RunStats()
+        run(script_of(12), FakeEngine(), tmp_path / "chunks", stats=stats)
+        assert stats.hedged == []
+
+
+class TestCache:
+    def test_a_second_book_reuses_shared_utterances(self, tmp_path):
+        cache = SynthesisCache(tmp_path / "cache")
+        run(script_of(3), FakeEngine(), tmp_path / "first", cache=cache)
+
+        second = FakeEngine()
+        segments = run(script_of(4), second, tmp_path / "second", cache=cache)
+        assert len(segments) == 4
+        assert second.texts == ["Passage 3."], "only the new passage should reach the engine"
+
+    def test_a_different_voice_misses(self, tmp_path):
+        cache = SynthesisCache(tmp_path / "cache")
+        run(script_of(2), FakeEngine(), tmp_path / "first", cache=cache)
+        second = FakeEngine()
+        asyncio.run(
+            tts.synthesize_script(
+                script_of(2), engine=second, voice="w", speed=1.0, chunks_dir=tmp_path / "second", cache=cache
+            )
+        )
+        assert second.calls == 2
+
+
+    def test_the_cache_is_read_and_written_off_the_event_loop(self, tmp_path, monkeypatch):
+        cache = SynthesisCache(tmp_path / "cache")
+        threads = []
+        for name in ("get", "put"):
+            real = getattr(cache, name)
+
+            def spy(*args, real=real):
+                threads.append(threading.get_ident())
+                return real(*args)
+
+            monkeypatch.setattr(cache, name, spy)
+        run(script_of(2), FakeEngine(), tmp_path / "chunks", cache=cache)
+        assert len(threads) == 4
+        assert threading.get_ident() not in threads
+
+    def test_only_characters_sent_to_the_engine_reach_the_ledger(self, tmp_path):
+        cache = SynthesisCache(tmp_path / "cache")
+        ledger = QuotaLedger(tmp_path / "quota.sqlite")
+        run(script_of(3), FakeEngine(), tmp_path / "a", cache=cache, ledger=ledger)
+        run(script_of(3), FakeEngine(), tmp_path / "b", cache=cache, ledger=ledger)
+        assert ledger.used("fake", "") == sum(len(f"Passage {i}.") for i in range(3))
+
 class TestConcurrency:
     def test_engine_concurrency_is_respected(self, tmp_path):
         """A serial engine must never see two overlapping calls."""
@@ -181,26 +552,508 @@ class TestConcurrency:
         run(script_of(6), engine, tmp_path / "chunks")
         assert engine.max_seen == 1
 
-
-class TestProgress:
-    def test_progress_is_reported_in_the_format_the_gui_parses(self, tmp_path, caplog):
+    def test_the_limit_backs_off_when_the_engine_is_pushed_too_hard(self, tmp_path, caplog, monkeypatch):
+        """Like edge-tts: fine at a few requests, 403s past that."""
         import logging
 
+        monkeypatch.setattr(tts.ec, "RETRY_BACKOFF_SECONDS", 0.0)
+
+        class TouchyEngine(FakeEngine):
+            max_concurrency = 2
+            peak_concurrency = 16
+
+            def __init__(self):
+                super().__init__()
+                self.in_flight = 0
+                self.refused = 0
+
+            async def synthesize(self, text, voice, speed, out_path):
+                self.in_flight += 1
+                try:
+                    await asyncio.sleep(0.001)
+                    if self.in_flight > 3:
+                        self.refused += 1
+                        raise RuntimeError("websocket 403")
+                    return await super().synthesize(text, voice, speed, out_path)
+                finally:
+                    self.in_flight -= 1
+
+        engine = TouchyEngine()
         with caplog.at_level(logging.INFO, logger="echo.audio.tts"):
-            run(script_of(4), FakeEngine(), tmp_path / "chunks")
-        percentages = [m for m in caplog.messages if "Progress Report:" in m]
-        assert percentages, "no progress lines emitted"
-        assert percentages[-1].endswith("100%")
+            assert len(run(script_of(60), engine, tmp_path / "chunks")) == 60
+        assert engine.refused, "the controller never probed past the safe limit"
+        assert any("concurrency settled at" in m for m in caplog.messages)
 
-    def test_a_fully_resumed_run_still_reports_completion(self, tmp_path, caplog):
-        import logging
+    def test_tasks_are_created_only_as_slots_free_up(self, tmp_path):
+        """A long book must not become one task per utterance up front."""
 
+        class CountingEngine(FakeEngine):
+            max_concurrency = 2
+
+            def __init__(self):
+                super().__init__()
+                self.most_tasks = 0
+
+            async def synthesize(self, text, voice, speed, out_path):
+                self.most_tasks = max(self.most_tasks, len(asyncio.all_tasks()))
+                await asyncio.sleep(0)
+                return await super().synthesize(text, voice, speed, out_path)
+
+        engine = CountingEngine()
+        run(script_of(40), engine, tmp_path / "chunks")
+        assert engine.calls == 40
+        assert engine.most_tasks <= 3  # the window, plus the task running the scheduler
+
+
+    def test_dispatch_is_paced_to_the_engines_quota(self, tmp_path):
+        class MeteredEngine(FakeEngine):
+            requests_per_minute = 600  # ten a second, a bucket of ten
+
+        stats = tts.RunStats()
+        started = time.monotonic()
+        assert len(run(script_of(15), MeteredEngine(), tmp_path / "chunks", stats=stats)) == 15
+        assert time.monotonic() - started >= 0.4
+        assert stats.rate_waited > 0
+
+    def test_conversions_at_once_share_the_engines_slots(self, tmp_path):
+        """Two books on their own threads and loops, like two GUI workers."""
+        import threading
+
+        class CountedEngine(FakeEngine):
+            def __init__(self):
+                super().__init__()
+                self.lock = threading.Lock()
+                self.in_flight = 0
+                self.max_seen = 0
+
+            async def synthesize(self, text, voice, speed, out_path):
+                with self.lock:
+                    self.in_flight += 1
+                    self.max_seen = max(self.max_seen, self.in_flight)
+                try:
+                    await asyncio.sleep(0.005)
+                    return await super().synthesize(text, voice, speed, out_path)
+                finally:
+                    with self.lock:
+                        self.in_flight -= 1
+
+        engine = CountedEngine()
+        done = []
+        books = [
+            threading.Thread(target=lambda n=n: done.append(len(run(script_of(30), engine, tmp_path / f"b{n}"))))
+            for n in range(2)
+        ]
+        for book in books:
+            book.start()
+        for book in books:
+            book.join()
+        assert done == [30, 30]
+        assert engine.max_seen <= engine.max_concurrency
+
+    def test_the_budget_can_be_turned_off(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(tts.ec, "SHARED_ENGINE_BUDGET", False)
+        assert len(run(script_of(5), FakeEngine(), tmp_path / "chunks")) == 5
+
+
+class TestScheduler:
+    @staticmethod
+    async def work(job):
+        await asyncio.sleep(0.3 if job == (0,) else 0)
+        return job
+
+    def test_a_retry_due_while_the_window_is_full_does_not_spin(self):
+        calls = 0
+
+        def limit():
+            nonlocal calls
+            calls += 1
+            return 1
+
+        async def main():
+            scheduler = tts._Scheduler(self.work, limit)
+            scheduler.retry_later((1,), 0.05)  # comes due while chunk 0 holds the only slot
+            return [job async for job, _ in scheduler.run([(0,)])]
+
+        assert asyncio.run(main()) == [(0,), (1,)]
+        assert calls < 20
+
+    def test_a_cooldown_is_waited_out_rather_than_polled(self):
+        calls = 0
+
+        async def main():
+            until = time.monotonic() + 0.3
+
+            def hold():
+                nonlocal calls
+                calls += 1
+                return max(0.0, until - time.monotonic())
+
+            scheduler = tts._Scheduler(self.work, lambda: 4, hold=hold)
+            scheduler.retry_later((1,), 0.0)  # queued before the breaker opened, due at once
+            return [job async for job, _ in scheduler.run([])]
+
+        assert asyncio.run(main()) == [(1,)]
+        assert calls < 20
+
+
+class TestRepeats:
+    @staticmethod
+    def book(*texts, voices=None):
+        voices = voices or [None] * len(texts)
+        return Script(
+            title="Fake Book",
+            chapters=[Chapter(title="C", utterances=[Utterance(t, v) for t, v in zip(texts, voices)])],
+        )
+
+    def test_identical_text_is_synthesized_once_and_shared(self, tmp_path):
+        engine = FakeEngine()
+        stats = tts.RunStats()
+        book = self.book("Chapter.", "Body one.", "Chapter.", "Body two.", "Chapter.")
+        segments = run(book, engine, tmp_path, stats=stats)
+        assert sorted(engine.texts) == ["Body one.", "Body two.", "Chapter."]
+        assert [s.index for s in segments] == [0, 1, 2, 3, 4]
+        assert len({s.path for s in segments}) == 5
+        assert segments[2].duration_ms == segments[4].duration_ms == segments[0].duration_ms
+        assert segments[4].path.stat().st_ino == segments[0].path.stat().st_ino
+        assert stats.repeats == 2
+
+    def test_sharing_replaces_the_chunk_in_one_step(self, tmp_path, monkeypatch):
+        source, path = tmp_path / "0000.mp3", tmp_path / "0002.mp3"
+        source.write_bytes(b"audio")
+        os.link(source, path)  # already shared, as on a resumed run
+
+        def no_links(*args):
+            raise OSError("hard links are not supported")
+
+        monkeypatch.setattr(tts.os, "link", no_links)
+        tts._share(source, path)
+        assert path.read_bytes() == b"audio"
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["0000.mp3", "0002.mp3"]
+
+    def test_the_same_text_in_another_voice_is_not_shared(self, tmp_path):
+        engine = FakeEngine()
+        run(self.book("Chorus.", "Chorus.", voices=["alto", "bass"]), engine, tmp_path)
+        assert engine.calls == 2
+
+    def test_a_repeat_of_a_resumed_chunk_costs_no_request(self, tmp_path):
+        run(self.book("Chorus.", "Verse."), FakeEngine(), tmp_path)
+        engine = FakeEngine()
+        segments = run(self.book("Chorus.", "Verse.", "Chorus."), engine, tmp_path)
+        assert engine.calls == 0
+        assert len(segments) == 3
+
+    def test_a_failing_text_fails_its_repeats_too(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(tts.ec, "RETRY_BACKOFF_SECONDS", 0.0)
+        stats = tts.RunStats()
+        with pytest.raises(tts.SynthesisError, match="1 repeat"):
+            run(self.book("Fine.", "Broken", "Broken"), FakeEngine(fail_always_at={1}), tmp_path, stats=stats)
+        assert stats.failed == 2
+
+
+class TestSharing:
+    class SlowEngine(FakeEngine):
+        async def synthesize(self, text, voice, speed, out_path):
+            await asyncio.sleep(0.01)
+            return await super().synthesize(text, voice, speed, out_path)
+
+    @staticmethod
+    def synthesize(script, engine, chunks_dir, **kwargs):
+        return tts.synthesize_script(
+            script, engine=engine, voice="v", speed=1.0, chunks_dir=chunks_dir, shared=True, **kwargs
+        )
+
+    def test_two_processes_split_a_book_and_the_coordinator_gets_all_of_it(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(tts.ec, "LEASE_POLL_SECONDS", 0.01)
+        script = script_of(12)
+        coordinator, helper = self.SlowEngine(), self.SlowEngine()
+
+        async def main():
+            return await asyncio.gather(
+                self.synthesize(script, coordinator, tmp_path),
+                self.synthesize(script, helper, tmp_path, wait_for_others=False),
+            )
+
+        whole, share = asyncio.run(main())
+        assert [s.index for s in whole] == list(range(12))
+        assert coordinator.texts and helper.texts
+        assert sorted(coordinator.texts + helper.texts) == sorted(u.text for u in script.utterances())
+        assert len(share) <= 12
+        assert not list(tmp_path.glob("*.lease"))
+
+    def test_the_coordinator_waits_for_a_chunk_another_process_holds(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(tts.ec, "LEASE_POLL_SECONDS", 0.01)
+        script = script_of(3)
+        other = ChunkLeases(tmp_path)
+        other.claim(1)
+        engine = FakeEngine()
+
+        async def other_process_finishes():
+            await asyncio.sleep(0.1)
+            path = tmp_path / "chunk_00001.wav"
+            write_pcm16_wav(b"\x00\x00" * 24_000, path, rate=24_000)
+            key = synthesis_key(engine, "v", 1.0, "Passage 1.")
+            ChunkManifest(tmp_path).record(1, key, path, 1000)
+            other.release(1)
+
+        async def main():
+            segments, _ = await asyncio.gather(self.synthesize(script, engine, tmp_path), other_process_finishes())
+            return segments
+
+        assert len(asyncio.run(main())) == 3
+        assert engine.texts == ["Passage 0.", "Passage 2."]
+
+    def test_a_helper_with_another_script_claims_nothing(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(tts.ec, "LEASE_POLL_SECONDS", 0.01)
+        asyncio.run(self.synthesize(script_of(3), FakeEngine(), tmp_path / "other"))
+        ChunkLeases(tmp_path).publish_script(ChunkLeases(tmp_path / "other").published_script())
+        helper = FakeEngine()
+        with pytest.raises(tts.SynthesisError, match="does not match"):
+            asyncio.run(self.synthesize(script_of(4), helper, tmp_path, wait_for_others=False))
+        assert helper.calls == 0
+        assert not list(tmp_path.glob("*.lease"))
+
+    def test_a_helper_without_a_coordinator_gives_up(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(tts.ec, "LEASE_POLL_SECONDS", 0.01)
+        monkeypatch.setattr(tts.ec, "LEASE_SECONDS", 0.05)
+        with pytest.raises(tts.SynthesisError, match="No coordinating run"):
+            asyncio.run(self.synthesize(script_of(2), FakeEngine(), tmp_path, wait_for_others=False))
+
+    def test_a_chunk_whose_process_died_is_taken_over(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(tts.ec, "LEASE_POLL_SECONDS", 0.01)
+        ChunkLeases(tmp_path).claim(0)
+        stale = time.time() - 3600
+        os.utime(tmp_path / "chunk_00000.lease", (stale, stale))
+        engine = FakeEngine()
+        assert len(asyncio.run(self.synthesize(script_of(2), engine, tmp_path))) == 2
+        assert "Passage 0." in engine.texts
+
+
+class TestChapterOrder:
+    @staticmethod
+    def book(sizes):
+        n = iter(range(sum(sizes)))
+        return Script(
+            title="Fake Book",
+            chapters=[
+                Chapter(title=f"Chapter {c + 1}", utterances=[Utterance(f"Passage {next(n)}.") for _ in range(size)])
+                for c, size in enumerate(sizes)
+            ],
+        )
+
+    def test_chapters_are_handed_over_in_order_with_their_segments(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(tts.ec, "RETRY_BACKOFF_SECONDS", 0)
+        ready = []
+        engine = FakeEngine(fail_always_at={0})
+        real = engine.synthesize
+
+        async def flaky_first(text, voice, speed, out_path):
+            # Chapter 1's only chunk fails once, so chapter 2 finishes first.
+            if engine.per_index_calls.get(0, 0) == 1:
+                engine._fail_always_at.clear()
+            return await real(text, voice, speed, out_path)
+
+        engine.synthesize = flaky_first
+        run(
+            self.book([1, 2, 3]),
+            engine,
+            tmp_path / "chunks",
+            on_chapter=lambda c, segs: ready.append((c, [s.index for s in segs])),
+        )
+        assert ready == [(0, [0]), (1, [1, 2]), (2, [3, 4, 5])]
+
+    def test_resumed_chapters_are_handed_over_at_the_start(self, tmp_path):
+        chunks = tmp_path / "chunks"
+        script = self.book([2, 2])
+        run(script, FakeEngine(), chunks)
+        ready, events = [], []
+        run(script, FakeEngine(), chunks, on_chapter=lambda c, _: ready.append(c), progress=events.append)
+        assert ready == [0, 1]
+        assert (events[-1].chapters_done, events[-1].chapters_total) == (2, 2)
+
+
+class TestStream:
+    @staticmethod
+    def collect(script, engine, chunks_dir, stop_after=None, **kwargs):
+        async def go():
+            got = []
+            async for segment in tts.synthesize_stream(
+                script, engine=engine, voice="v", speed=1.0, chunks_dir=chunks_dir, **kwargs
+            ):
+                got.append((segment.index, max(engine.per_index_calls)))
+                if len(got) == stop_after:
+                    break
+            return got
+
+        return asyncio.run(go())
+
+    def test_segments_arrive_in_reading_order(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(tts.ec, "RETRY_BACKOFF_SECONDS", 0)
+        engine = FakeEngine(fail_always_at={0})
+        real = engine.synthesize
+
+        async def flaky_first(text, voice, speed, out_path):
+            # The first chunk fails once, so later ones finish before it.
+            if engine.per_index_calls.get(0, 0) == 1:
+                engine._fail_always_at.clear()
+            return await real(text, voice, speed, out_path)
+
+        engine.synthesize = flaky_first
+        got = self.collect(script_of(6), engine, tmp_path / "chunks")
+        assert [index for index, _ in got] == list(range(6))
+
+    def test_synthesis_stays_within_the_lookahead(self, tmp_path):
+        engine = FakeEngine()
+        got = self.collect(script_of(20), engine, tmp_path / "chunks", stop_after=5, lookahead=3)
+        assert [index for index, _ in got] == list(range(5))
+        # When segment i is taken, i segments have been taken before it.
+        assert all(started < index + 3 for index, started in got)
+        assert len(engine.per_index_calls) < 20
+
+    def test_a_streamed_run_is_recorded_in_the_history(self, tmp_path):
+        history = EngineHistory(tmp_path / "history.sqlite")
+        self.collect(script_of(3), FakeEngine(), tmp_path / "chunks", history=history)
+        assert history.stats()[0].requests == 3
+
+    def test_a_chunk_that_never_works_ends_the_stream_after_those_before_it(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(tts.ec, "RETRY_BACKOFF_SECONDS", 0)
+        got = []
+
+        async def go():
+            async for segment in tts.synthesize_stream(
+                script_of(8), engine=FakeEngine(fail_always_at={3}), voice="v", chunks_dir=tmp_path / "c"
+            ):
+                got.append(segment.index)
+
+        with pytest.raises(tts.SynthesisError, match="chunk 3"):
+            asyncio.run(go())
+        assert got == [0, 1, 2]
+
+
+class TestProgress:
+    def test_every_chunk_reports_an_event_ending_at_completion(self, tmp_path):
+        events = []
+        run(script_of(4), FakeEngine(), tmp_path / "chunks", progress=events.append)
+        assert all(e.stage is Stage.SYNTHESIZE for e in events)
+        assert [e.chunks_done for e in events] == [0, 1, 2, 3, 4]
+        assert events[-1].fraction == 1.0
+        assert events[-1].chars_done == events[-1].chars_total == script_of(4).char_count
+        assert events[-1].eta_seconds == 0.0
+
+    def test_finished_chunks_carry_throughput_and_latency(self, tmp_path):
+        events = []
+        run(script_of(3), FakeEngine(), tmp_path / "chunks", progress=events.append)
+        assert all(e.chars_per_second > 0 and e.last_latency is not None for e in events[1:])
+
+    def test_retries_are_counted(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(tts.ec, "RETRY_BACKOFF_SECONDS", 0)
+        events = []
+        run(script_of(2), FakeEngine(fail_times=1), tmp_path / "chunks", progress=events.append)
+        assert events[-1].retries >= 1
+        assert events[-1].fraction == 1.0
+
+    def test_a_fully_resumed_run_still_reports_completion(self, tmp_path):
         chunks = tmp_path / "chunks"
         script = script_of(2)
         run(script, FakeEngine(), chunks)
-        with caplog.at_level(logging.INFO, logger="echo.audio.tts"):
-            run(script, FakeEngine(), chunks)
-        assert any(m.endswith("100%") for m in caplog.messages)
+        events = []
+        run(script, FakeEngine(), chunks, progress=events.append)
+        assert events[-1].fraction == 1.0
+        assert events[-1].chunks_done == 2
+
+    def test_without_a_callback_progress_is_logged(self, tmp_path, caplog):
+        import logging
+
+        with caplog.at_level(logging.INFO, logger="echo.progress"):
+            run(script_of(4), FakeEngine(), tmp_path / "chunks")
+        assert caplog.messages[-1].startswith("Synthesizing: 4/4 chunk(s) (100%)")
+
+
+class TestHistory:
+    def test_every_request_is_recorded_with_its_outcome(self, tmp_path, monkeypatch):
+        import sqlite3
+
+        from echo.audio.history import EngineHistory
+
+        monkeypatch.setattr(tts.ec, "RETRY_BACKOFF_SECONDS", 0)
+        history = EngineHistory(tmp_path / "history.sqlite")
+        engine = FakeEngine(fail_always_at={1})
+        real = engine.synthesize
+
+        async def flaky_second(text, voice, speed, out_path):
+            if engine.per_index_calls.get(1, 0) == 1:
+                engine._fail_always_at.clear()
+            return await real(text, voice, speed, out_path)
+
+        engine.synthesize = flaky_second
+        run(script_of(3), engine, tmp_path / "chunks", history=history)
+        with sqlite3.connect(history.path) as conn:
+            rows = conn.execute("SELECT engine, voice, attempt, error, audio_ms FROM requests").fetchall()
+        assert len(rows) == 4
+        assert sorted(r[2] for r in rows) == [1, 1, 1, 2]
+        failed = [r for r in rows if r[3] is not None]
+        assert len(failed) == 1 and "index 1 always fails" in failed[0][3]
+        assert all(r[:2] == ("fake", "v") for r in rows)
+        assert all(r[4] == 1000 for r in rows if r[3] is None)
+
+    def test_the_history_is_read_and_written_off_the_event_loop(self, tmp_path, monkeypatch):
+        history = EngineHistory(tmp_path / "history.sqlite")
+        history.FLUSH_EVERY = 2
+        threads = []
+        for name in ("prior", "flush"):
+            real = getattr(history, name)
+
+            def spy(*args, real=real):
+                threads.append(threading.get_ident())
+                return real(*args)
+
+            monkeypatch.setattr(history, name, spy)
+        run(script_of(5), FakeEngine(), tmp_path / "chunks", history=history)
+        assert len(threads) >= 3  # the prior, a batch mid-run and the rest at the end
+        assert threading.get_ident() not in threads
+        assert history.stats()[0].requests == 5
+
+
+class TestAsyncPipeline:
+    @pytest.fixture
+    def engine(self, tmp_path, monkeypatch):
+        engine = FakeEngine()
+        monkeypatch.setattr(core, "get_engine", lambda _name=None: engine)
+        monkeypatch.setattr(tts.ec, "CACHE_DIR", str(tmp_path / "cache"))
+        monkeypatch.setattr(
+            core.asm,
+            "assemble",
+            lambda segments, output_path, **kw: (Path(output_path).write_bytes(b"joined"), Path(output_path))[1],
+        )
+        monkeypatch.setattr(core.mp3z, "add_meta_fields", lambda *a, **kw: None)
+        return engine
+
+    def test_conversions_can_share_a_running_loop(self, tmp_path, engine):
+        books = []
+        for name in ("one", "two"):
+            book = tmp_path / f"{name}.txt"
+            book.write_text(f"Book {name}.\n\nIt has two paragraphs.", encoding="utf-8")
+            books.append(book)
+
+        async def both():
+            return await asyncio.gather(
+                *(
+                    core.file_to_audio_async(book, output_path=book.with_suffix(".mp3"), fmt="mp3", cache=False)
+                    for book in books
+                )
+            )
+
+        outputs = asyncio.run(both())
+        assert [p.name for p in outputs] == ["one.mp3", "two.mp3"]
+        assert all(p.read_bytes() == b"joined" for p in outputs)
+        assert any("Book one" in text for text in engine.texts)
+        assert any("Book two" in text for text in engine.texts)
+
+    def test_a_preview_can_be_awaited(self, tmp_path, engine):
+        async def inside_a_loop():
+            return await core.preview_voice_async("v", output_dir=tmp_path, open_after=False)
+
+        assert asyncio.run(inside_a_loop()).exists()
+        assert engine.texts == [core.PREVIEW_TEXT]
 
 
 class TestVoicePreview:
@@ -0,0 +1,212 @@
+"""Flow control: the adaptive concurrency controller, hedging, the circuit breaker
+and quota pacing."""
+
+import asyncio
+import time
+
+import echo.audio.throttle as throttle
+from echo.audio.engines.base import ErrorClass, ErrorKind
+from echo.audio.throttle import AimdController, CircuitBreaker, Hedger, RateLimiter, TokenBucket
+
+
+class TestAimd:
+    def test_the_limit_climbs_by_about_one_per_window_of_successes(self):
+        controller = AimdController(2, ceiling=8)
+        controller.on_success(1.0, 50)
+        assert controller.limit == 2
+        for _ in range(2):
+            controller.on_success(1.0, 50)
+        assert controller.limit == 3
+
+    def test_it_never_passes_the_ceiling(self):
+        controller = AimdController(2, ceiling=4)
+        for _ in range(100):
+            controller.on_success(1.0, 50)
+        assert controller.limit == 4
+
+    def test_an_error_halves_the_limit(self):
+        controller = AimdController(8, ceiling=8)
+        controller.on_error()
+        assert controller.limit == 4
+
+    def test_a_burst_of_errors_cuts_only_once_per_window(self):
+        """Requests in flight when the limit was cut report the same trouble."""
+        controller = AimdController(8, ceiling=8)
+        for _ in range(3):
+            controller.on_error()
+        assert controller.limit == 4
+        assert controller.cuts == 1
+
+    def test_it_never_drops_below_the_floor(self):
+        controller = AimdController(2, floor=1, ceiling=2)
+        for _ in range(20):
+            controller.on_error()
+        assert controller.limit == 1
+
+    def test_a_latency_spike_is_a_congestion_signal(self):
+        controller = AimdController(8, ceiling=8)
+        for _ in range(6):
+            controller.on_success(1.0, 1000)
+        controller.on_success(5.0, 1000)
+        assert controller.limit == 4
+
+    def test_short_utterances_do_not_count_towards_latency(self):
+        controller = AimdController(8, ceiling=8)
+        for _ in range(6):
+            controller.on_success(0.1, 1000)
+        controller.on_success(5.0, 20)  # a heading: all overhead
+        assert controller.limit == 8
+
+
+class TestForEngine:
+    class Engine:
+        max_concurrency = 4
+        min_concurrency = 2
+        peak_concurrency = 12
+
+    def test_it_starts_at_max_concurrency_within_the_declared_bounds(self):
+        controller = AimdController.for_engine(self.Engine())
+        assert (controller.limit, controller.floor, controller.ceiling) == (4, 2, 12)
+
+    def test_no_peak_means_no_probing(self):
+        class Fixed:
+            max_concurrency = 3
+
+        assert AimdController.for_engine(Fixed()).ceiling == 3
+
+    def test_it_can_be_switched_off(self, monkeypatch):
+        monkeypatch.setattr(throttle.ec, "ADAPTIVE_CONCURRENCY", False)
+        controller = AimdController.for_engine(self.Engine())
+        assert not controller.adaptive
+        assert controller.limit == 4
+
+
+class TestHedger:
+    def test_nothing_is_hedged_before_the_run_has_a_norm(self):
+        hedger = Hedger(percentile=0.9, min_delay=0.0)
+        for _ in range(Hedger.MIN_SAMPLES - 1):
+            hedger.on_success(1.0, 100)
+        assert hedger.delay_for(100) is None
+
+    def test_the_delay_scales_with_length(self):
+        hedger = Hedger(percentile=0.9, min_delay=0.0)
+        for i in range(20):
+            hedger.on_success(0.01 * (i + 1), 1)  # 10 ms to 200 ms per character
+        assert hedger.delay_for(100) == 2 * hedger.delay_for(50)
+
+    def test_the_floor_applies_to_short_requests(self):
+        hedger = Hedger(percentile=0.9, min_delay=5.0)
+        for _ in range(20):
+            hedger.on_success(0.1, 10)
+        assert hedger.delay_for(10) == 5.0
+
+
+TRANSIENT = ErrorClass(ErrorKind.TRANSIENT)
+
+
+class TestCircuitBreaker:
+    def test_a_fatal_error_stops_the_run_at_once(self):
+        breaker = CircuitBreaker()
+        breaker.on_failure(ErrorClass(ErrorKind.FATAL), PermissionError("bad key"), 1.0)
+        assert "bad key" in breaker.abort_reason
+
+    def test_throttling_pauses_everything_for_the_requested_time(self):
+        breaker = CircuitBreaker()
+        breaker.on_failure(ErrorClass(ErrorKind.THROTTLED, retry_after=30), RuntimeError("429"), 1.0)
+        assert 29 < breaker.hold() <= 30
+        assert breaker.abort_reason is None
+
+    def test_a_high_failure_rate_opens_the_breaker(self):
+        breaker = CircuitBreaker(threshold=0.5, window=10, cooldown=60)
+        for _ in range(5):
+            breaker.on_success()
+        for _ in range(5):
+            breaker.on_failure(TRANSIENT, RuntimeError("x"), 1.0)
+        assert breaker.state == "open"
+        assert breaker.hold() > 50
+
+    def test_a_scattering_of_failures_does_not(self):
+        breaker = CircuitBreaker(threshold=0.5, window=10)
+        for i in range(20):
+            breaker.on_success()
+            if i % 4 == 0:
+                breaker.on_failure(TRANSIENT, RuntimeError("x"), 1.0)
+        assert breaker.state == "closed"
+
+    def test_after_the_cooldown_one_probe_decides(self):
+        breaker = CircuitBreaker(threshold=0.5, window=10, cooldown=0)
+        for _ in range(10):
+            breaker.on_failure(TRANSIENT, RuntimeError("x"), 1.0)
+        assert breaker.hold() == 0
+        assert breaker.state == "probing"
+        assert breaker.limit(8) == 1
+        breaker.on_success()
+        assert breaker.state == "closed"
+        assert breaker.limit(8) == 8
+
+    def test_requests_from_before_the_opening_do_not_decide_the_probe(self):
+        breaker = CircuitBreaker(threshold=0.5, window=10, cooldown=0)
+        stale = breaker.generation
+        for _ in range(10):
+            breaker.on_failure(TRANSIENT, RuntimeError("x"), 1.0, stale)
+        breaker.hold()
+        probe = breaker.generation
+        breaker.on_success(stale)
+        breaker.on_failure(TRANSIENT, RuntimeError("x"), 1.0, stale)
+        assert breaker.state == "probing"
+        assert breaker.trips == 1
+        breaker.on_success(probe)
+        assert breaker.state == "closed"
+
+    def test_it_gives_up_after_max_trips(self):
+        breaker = CircuitBreaker(threshold=0.5, window=10, cooldown=0, max_trips=2)
+        for _ in range(10):
+            breaker.on_failure(TRANSIENT, RuntimeError("x"), 1.0)
+        for _ in range(2):
+            breaker.hold()
+            breaker.on_failure(TRANSIENT, RuntimeError("x"), 1.0)
+        assert breaker.abort_reason is not None
+
+
+class TestTokenBucket:
+    def test_a_full_bucket_lets_the_first_take_through(self):
+        assert TokenBucket(60).delay_for(1) == 0
+
+    def test_takes_are_paced_at_the_rate(self):
+        bucket = TokenBucket(60)  # one a second
+        bucket.take(1)
+        assert 0.9 < bucket.delay_for(1) <= 1.0
+
+    def test_a_take_larger_than_the_bucket_leaves_it_in_debt(self):
+        bucket = TokenBucket(600)  # ten a second, holding ten
+        assert bucket.delay_for(50) == 0  # no waiting forever for 50 to fit
+        bucket.take(50)
+        assert bucket.delay_for(1) > 4
+
+
+class TestRateLimiter:
+    class _Engine:
+        requests_per_minute = 1200  # twenty a second
+        chars_per_minute = None
+
+    def test_engines_without_quotas_get_none(self):
+        assert RateLimiter.for_engine(object()) is None
+
+    def test_requests_are_spread_out(self):
+        limiter = RateLimiter.for_engine(self._Engine())
+
+        async def go():
+            started = time.monotonic()
+            await asyncio.gather(*(limiter.acquire(10) for _ in range(25)))
+            return time.monotonic() - started
+
+        # The bucket holds a second's worth, twenty; the other five are paced at
+        # one every twentieth of a second.
+        assert asyncio.run(go()) >= 0.2
+        assert limiter.waited > 0
+
+    def test_characters_are_paced_too(self):
+        limiter = RateLimiter(chars_per_minute=6000)  # a hundred a second
+        asyncio.run(limiter.acquire(100))
+        assert 0.9 < limiter.chars.delay_for(100) <= 1.0
+        assert limiter.describe() == "6000 characters a minute"
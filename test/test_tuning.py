@@ -0,0 +1,114 @@
+"""Chunk-size calibration: what it measures, what it picks, and where that is used."""
+
+import asyncio
+
+import pytest
+
+import echo.core as core
+from echo.audio import tuning
+from echo.audio.engines.base import BaseEngine, EngineUnavailable, SynthOutput
+from echo.audio.tuning import Calibration, ChunkTuning, Trial, calibrate, pick_best, sample_passage
+from echo.audio.wav import write_pcm16_wav
+from echo.document import Document
+from echo.extractors.text import blocks_from_plain_text
+
+
+class TimedEngine(BaseEngine):
+    """Pays a fixed overhead per request, and fails every request over ``breaks_over``."""
+
+    name = "timed"
+    label = "Timed"
+    audio_suffix = ".wav"
+    max_concurrency = 4
+    max_chars = 4000
+
+    def __init__(self, breaks_over: int = None, overhead: float = 0.02):
+        self.breaks_over = breaks_over
+        self.overhead = overhead
+        self.sizes: list[int] = []
+
+    def default_voice(self) -> str:
+        return "timed-voice"
+
+    async def synthesize(self, text, voice, speed, out_path):
+        self.sizes.append(len(text))
+        await asyncio.sleep(self.overhead)
+        if self.breaks_over is not None and len(text) > self.breaks_over:
+            raise RuntimeError("stream stalled")
+        write_pcm16_wav(b"\x00\x00" * 100, out_path, rate=24_000)
+        return SynthOutput(path=out_path)
+
+
+class TestSample:
+    @pytest.mark.parametrize("chars", [200, 1000, 4000])
+    def test_passages_are_whole_sentences_within_the_size(self, chars):
+        text = sample_passage(chars)
+        assert chars * 0.8 < len(text) <= chars
+        assert text.endswith((".", "”"))
+
+    def test_offsets_give_different_passages(self):
+        assert sample_passage(500) != sample_passage(500, offset=3)
+
+
+class TestPick:
+    def test_a_near_tie_goes_to_the_larger_size(self):
+        trials = [Trial(1000, 3, 0, 3000, 3.0), Trial(2000, 3, 0, 6000, 6.3)]
+        assert pick_best(trials) == 2000
+
+    def test_failures_count_against_a_size(self):
+        trials = [Trial(1000, 3, 0, 3000, 3.0), Trial(2000, 3, 2, 2000, 1.8)]
+        assert pick_best(trials) == 1000
+
+    def test_nothing_working_is_an_error(self):
+        with pytest.raises(EngineUnavailable, match="Every calibration request failed"):
+            pick_best([Trial(1000, 3, 3, errors=["RuntimeError: no"])])
+
+
+class TestCalibrate:
+    def test_it_settles_below_where_the_engine_breaks(self, monkeypatch):
+        monkeypatch.setattr(tuning.ec, "CHUNK_SIZE", 8000)
+        engine = TimedEngine(breaks_over=2000)
+        result = asyncio.run(calibrate(engine, sizes=[500, 1000, 2000, 8000], requests=2))
+        assert [t.size for t in result.trials] == [500, 1000, 2000, 4000]  # 8000 is over the limit
+        assert result.best == 2000
+        assert result.trials[-1].failure_rate == 1.0
+        assert "<- best" in str(result)
+
+
+    def test_a_rejected_key_is_reported_as_a_setup_problem(self):
+        class Unauthorized(Exception):
+            status = 401
+
+        class RejectingEngine(TimedEngine):
+            async def synthesize(self, text, voice, speed, out_path):
+                raise Unauthorized("invalid API key")
+
+        with pytest.raises(EngineUnavailable, match="invalid API key"):
+            asyncio.run(calibrate(RejectingEngine(), sizes=[500], requests=1))
+
+
+class TestStore:
+    def test_the_best_size_is_kept_per_engine_and_voice(self, tmp_path):
+        store = ChunkTuning(tmp_path / "tuning.sqlite")
+        assert store.best("timed", "a") is None
+        store.save(Calibration("timed", "a", [Trial(1000, 1, 0, 1000, 1.0)], 1000))
+        assert store.best("timed", "a") == 1000
+        assert store.best("timed", "b") is None
+
+    def test_scripts_are_built_with_the_tuned_size(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(tuning.ec, "CACHE_DIR", str(tmp_path))
+        monkeypatch.setattr(core, "get_engine", lambda _name=None: TimedEngine())
+        doc = Document(blocks=blocks_from_plain_text("\n\n".join(sample_passage(400, n) for n in range(10))))
+
+        untuned = core.build_script(doc, voice="timed-voice")
+        ChunkTuning().save(Calibration("timed", "timed-voice", [Trial(500, 1, 0, 500, 1.0)], 500))
+        tuned = core.build_script(doc, voice="timed-voice")
+        assert max(len(u) for u in tuned.utterances()) <= 500
+        assert len(tuned.utterances()) > len(untuned.utterances())
+        assert len(core.build_script(doc, voice="timed-voice", chunk_size=4000).utterances()) == len(
+            untuned.utterances()
+        )
+        # Another machine sharing the book has no tuning, or another: shared scripts ignore it.
+        assert len(core.build_script(doc, voice="timed-voice", shared=True).utterances()) == len(
+            untuned.utterances()
+        )
@@ -0,0 +1,62 @@
+"""Chunk writes off the event loop: buffered, in order, and failures surfaced."""
+
+import asyncio
+import logging
+import time
+
+import pytest
+
+from echo.audio.writer import ChunkWriter, watch_loop_lag
+
+
+class TestChunkWriter:
+    def test_frames_land_in_order_in_a_few_large_writes(self, tmp_path, monkeypatch):
+        writer = ChunkWriter()
+        path = tmp_path / "chunk.mp3"
+        frames = [bytes([i]) * 100 for i in range(50)]
+        blocks = []
+
+        async def write():
+            async with writer.open(path, buffer_bytes=1000) as fp:
+                real = fp._write
+                monkeypatch.setattr(fp, "_write", lambda pieces: (blocks.append(len(pieces)), real(pieces)))
+                for frame in frames:
+                    fp.write(frame)
+
+        asyncio.run(write())
+        assert path.read_bytes() == b"".join(frames)
+        assert blocks == [10] * 5
+
+    def test_a_failed_open_is_raised_when_the_file_closes(self, tmp_path):
+        async def write():
+            async with ChunkWriter().open(tmp_path / "missing" / "chunk.mp3") as fp:
+                fp.write(b"audio")
+
+        with pytest.raises(FileNotFoundError):
+            asyncio.run(write())
+
+    def test_a_failure_inside_the_block_is_kept(self, tmp_path):
+        async def write():
+            async with ChunkWriter().open(tmp_path / "chunk.mp3") as fp:
+                fp.write(b"audio")
+                raise ValueError("the stream broke")
+
+        with pytest.raises(ValueError, match="the stream broke"):
+            asyncio.run(write())
+        assert (tmp_path / "chunk.mp3").read_bytes() == b""
+
+
+class TestLoopLag:
+    def test_a_blocked_loop_is_reported_at_debug(self, caplog):
+        async def block_the_loop():
+            watch = asyncio.create_task(watch_loop_lag(interval=0.01, report_over=0.05))
+            await asyncio.sleep(0.02)
+            time.sleep(0.2)
+            await asyncio.sleep(0.02)
+            watch.cancel()
+            await asyncio.gather(watch, return_exceptions=True)
+
+        with caplog.at_level(logging.DEBUG, logger="echo.audio.writer"):
+            asyncio.run(block_the_loop())
+        assert any(m.startswith("Event loop lagged") for m in caplog.messages)
+        assert caplog.messages[-1].startswith("Worst event loop lag")